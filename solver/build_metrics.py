@@ -0,0 +1,115 @@
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional
+import json
+import sys
+import time
+import tracemalloc
+import pandas as pd
+from ortools.sat.python import cp_model
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def _max_rss_mb() -> Optional[float]:
+    """Process high-water resident memory in MB, or None where unsupported."""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    return max_rss / (1024 * 1024) if sys.platform == 'darwin' else max_rss / 1024
+
+
+class BuildMetricsRecorder:
+    """Records wall time, model growth and memory for each model-build step.
+
+    Each measured step becomes one row with the stage (e.g. 'core', 'constraint',
+    'optimizer', 'objective', 'cache' or 'warm_start'), the component class, wall
+    seconds, and the number of variables and constraints it added to the CpModel
+    proto. Memory is reported two ways:
+
+    - max_rss_growth_mb: growth of the process high-water RSS, which includes
+      CP-SAT's native allocations but only moves when a new peak is reached.
+    - peak_python_mb: tracemalloc peak of Python allocations during the step,
+      only collected when track_memory is True since tracing slows the build.
+    """
+
+    def __init__(self, track_memory: bool = False):
+        """Initialize the recorder.
+
+        Args:
+            track_memory: Whether to trace Python allocations with tracemalloc
+        """
+        self.track_memory = track_memory
+        self.rows: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def measure(self, model: cp_model.CpModel, stage: str, component: str):
+        """Measure the model-build work done inside the with block.
+
+        Args:
+            model: The model being built
+            stage: Build stage label (e.g. 'core', 'constraint' or 'optimizer')
+            component: Name of the component doing the work
+        """
+        proto = model.Proto()
+        variables_before = len(proto.variables)
+        constraints_before = len(proto.constraints)
+        rss_before = _max_rss_mb()
+        started_tracing = False
+        if self.track_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+            traced_before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall_seconds = time.perf_counter() - start
+            peak_python_mb = None
+            if self.track_memory:
+                peak_python_mb = (tracemalloc.get_traced_memory()[1] - traced_before) / (1024 * 1024)
+                if started_tracing:
+                    tracemalloc.stop()
+            rss_after = _max_rss_mb()
+            proto = model.Proto()
+            self.rows.append({
+                'stage': stage,
+                'component': component,
+                'wall_seconds': wall_seconds,
+                'variables_added': len(proto.variables) - variables_before,
+                'constraints_added': len(proto.constraints) - constraints_before,
+                'max_rss_growth_mb': rss_after - rss_before if rss_before is not None else None,
+                'peak_python_mb': peak_python_mb,
+            })
+
+
+def build_metrics_to_dataframe(rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Turn recorded build metric rows into a DataFrame with a share-of-time column.
+
+    Args:
+        rows: Rows recorded by BuildMetricsRecorder
+
+    Returns:
+        pd.DataFrame: One row per build step, in build order
+    """
+    df = pd.DataFrame(rows, columns=['stage', 'component', 'wall_seconds', 'variables_added',
+                                     'constraints_added', 'max_rss_growth_mb', 'peak_python_mb'])
+    total_seconds = df['wall_seconds'].sum()
+    df['time_share'] = df['wall_seconds'] / total_seconds if total_seconds > 0 else 0.0
+    return df
+
+
+def write_build_metrics_json(rows: List[Dict[str, Any]], path: str):
+    """Write recorded build metric rows to a JSON file.
+
+    Args:
+        rows: Rows recorded by BuildMetricsRecorder
+        path: Output file path
+    """
+    with open(path, 'w') as f:
+        json.dump(rows, f, indent=2)
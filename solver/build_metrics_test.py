@@ -0,0 +1,80 @@
+import json
+import pytest
+from ortools.sat.python import cp_model
+from solver import build_metrics
+from solver.build_metrics import BuildMetricsRecorder, write_build_metrics_json
+from solver.schedule_creator import ScheduleCreator
+from solver.components.total_play import TotalPlayConstraint
+from solver.components.time_variety_optimization import TimeVarietyOptimization
+
+
+def test_measure_records_each_steps_model_growth():
+    model = cp_model.CpModel()
+    recorder = BuildMetricsRecorder()
+
+    with recorder.measure(model, 'core', 'Variables'):
+        xs = [model.NewBoolVar(f'x{i}') for i in range(3)]
+    with recorder.measure(model, 'constraint', 'Pairs'):
+        model.Add(xs[0] + xs[1] <= 1)
+        model.Add(xs[1] + xs[2] <= 1)
+    with recorder.measure(model, 'optimizer', 'Penalty'):
+        penalty = model.NewIntVar(0, 3, 'penalty')
+        model.Add(penalty == sum(xs))
+
+    assert [(row['stage'], row['component'], row['variables_added'], row['constraints_added'])
+            for row in recorder.rows] == [('core', 'Variables', 3, 0),
+                                          ('constraint', 'Pairs', 0, 2),
+                                          ('optimizer', 'Penalty', 1, 1)]
+    assert all(row['wall_seconds'] >= 0 for row in recorder.rows)
+    assert all(row['peak_python_mb'] is None for row in recorder.rows)
+
+
+def test_measure_records_a_step_that_raises():
+    model = cp_model.CpModel()
+    recorder = BuildMetricsRecorder()
+
+    with pytest.raises(RuntimeError):
+        with recorder.measure(model, 'constraint', 'Broken'):
+            model.NewBoolVar('x')
+            raise RuntimeError('component failed')
+
+    assert recorder.rows[0]['variables_added'] == 1
+
+
+def test_memory_is_reported_in_megabytes(monkeypatch):
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    class Usage:
+        ru_maxrss = 2 * 1024 * 1024
+
+    monkeypatch.setattr(build_metrics.resource, 'getrusage', lambda who: Usage)
+    monkeypatch.setattr(build_metrics.sys, 'platform', 'linux')
+    assert build_metrics._max_rss_mb() == 2048
+    monkeypatch.setattr(build_metrics.sys, 'platform', 'darwin')
+    assert build_metrics._max_rss_mb() == 2
+
+
+def test_track_memory_reports_python_peak():
+    model = cp_model.CpModel()
+    recorder = BuildMetricsRecorder(track_memory=True)
+
+    with recorder.measure(model, 'core', 'Allocation'):
+        allocation = [0] * 1_000_000
+
+    assert len(allocation) == 1_000_000
+    assert recorder.rows[0]['peak_python_mb'] > 1
+    assert recorder.rows[0]['max_rss_growth_mb'] >= 0
+
+
+def test_build_schedule_records_every_component(small_facilities, tmp_path):
+    creator = ScheduleCreator(small_facilities(), components=[TotalPlayConstraint(), TimeVarietyOptimization()])
+
+    schedule = creator.build_schedule()
+
+    report = schedule.get_build_metrics_report()
+    assert list(report['component'])[:3] == ['Schedule', 'TotalPlayConstraint', 'TimeVarietyOptimization']
+    assert report['time_share'].sum() == pytest.approx(1.0)
+    assert report['variables_added'].sum() == len(schedule.model.Proto().variables)
+    assert report['constraints_added'].sum() == len(schedule.model.Proto().constraints)
+    path = tmp_path / 'build_metrics.json'
+    write_build_metrics_json(schedule.build_metrics, str(path))
+    assert json.loads(path.read_text()) == schedule.build_metrics
@@ -0,0 +1,205 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from ortools.graph.python import max_flow
+from .facilities.facility import Facilities
+from .schedule_component import SchedulerComponent
+from .components.total_play import TotalPlayConstraint
+from .components.vs_play_balance import VsPlayBalanceConstraint
+from .components.balance_reffing import BalanceReffingConstraint
+from .components.play_near_ref import PlayNearRefConstraint
+from .components.ref_same_division import RefSameDivisionConstraint
+from .components.one_thing_at_a_time import OneThingAtATimeConstraint
+from .components.no_three_hours_days import NoThreeHoursDays
+
+
+def _time_name(facilities: Facilities, w_idx: int, ti_idx: int) -> str:
+    """Format a weekend's time slot for messages, e.g. '12:00'."""
+    return facilities.matches_by_weekend_time[w_idx, ti_idx][0].time.strftime('%H:%M')
+
+
+def _slot_name(facilities: Facilities, w_idx: int, ti_idx: Optional[int] = None) -> str:
+    """Describe a weekend (and time) for messages, e.g. 'weekend 4 (8/3/2025) at 12:00'."""
+    name = f"weekend {w_idx} ({facilities.matches_by_weekend[w_idx][0].date})"
+    if ti_idx is not None:
+        name += f" at {_time_name(facilities, w_idx, ti_idx)}"
+    return name
+
+
+def check_capacity(facilities: Facilities, components: Iterable[SchedulerComponent]) -> List[str]:
+    """Check counting and flow conditions the components need before any model is built.
+
+    Every match of the facilities is played, so the checks compare match counts
+    with what the components allow. Each check runs only when the components it
+    follows from are present:
+
+    - Whole matches per division, and exactly team_counts × games_per_season / 2
+      matches in the season (TotalPlayConstraint)
+    - Season refs per team add up to the matches, per division with
+      RefSameDivisionConstraint (BalanceReffingConstraint)
+    - Three distinct teams per match at one time (OneThingAtATimeConstraint), and
+      per weekend at most max_hours busy times per team (NoThreeHoursDays) and
+      max_weekend_games per team (BalanceReffingConstraint)
+    - Refs play in the time before or after their match (PlayNearRefConstraint):
+      a max flow per weekend from each time's matches to the players at the
+      adjacent times, two per match, each reffing at most once
+    - A max flow of each division's matches into the slots (TotalPlayConstraint
+      and VsPlayBalanceConstraint), with per-slot and per-weekend division limits
+      from the rules above
+
+    These are necessary conditions only: passing them does not prove a schedule exists.
+
+    Args:
+        facilities: The (possibly partial horizon) facilities
+        components: The components the schedule will be built with
+
+    Returns:
+        List[str]: One message per violated condition, empty if all hold
+    """
+    components = list(components)
+    present = {type(component) for component in components}
+    balance_reffing = next((component for component in components
+                            if isinstance(component, BalanceReffingConstraint)), None)
+    ref_same_division = RefSameDivisionConstraint in present
+    one_thing = OneThingAtATimeConstraint in present
+    no_three_hours = next((component for component in components
+                           if isinstance(component, NoThreeHoursDays)), None)
+    problems = []
+    # Season totals also cover a partial horizon's carried-over matches
+    total_matches = len(facilities.matches) + len(facilities.carry_over)
+    total_teams = sum(facilities.team_counts)
+    team_div = [div_idx for div_idx, team_count in enumerate(facilities.team_counts) for _ in range(team_count)]
+    carried_matches = [0] * len(facilities.team_counts)
+    for home, _, _ in facilities.carry_over.values():
+        carried_matches[team_div[home]] += 1
+
+    # Matches per division: exact for a full season, prorated for a partial horizon
+    division_matches: List[Tuple[int, int]] = []
+    for div_idx, team_count in enumerate(facilities.team_counts):
+        if team_count * facilities.games_per_season % 2:
+            problems.append(f"Division {div_idx} has {team_count} teams playing {facilities.games_per_season} "
+                            f"games each, which is not a whole number of matches")
+        min_games, max_games = facilities.season_range(facilities.games_per_season)
+        division_matches.append((team_count * min_games // 2, team_count * max_games // 2))
+    if TotalPlayConstraint in present:
+        needed_min = sum(low for low, _ in division_matches)
+        needed_max = sum(high for _, high in division_matches)
+        if not needed_min <= total_matches <= needed_max:
+            needed = str(needed_min) if needed_min == needed_max else f"{needed_min}-{needed_max}"
+            problems.append(f"The facilities have {total_matches} matches, but team_counts {facilities.team_counts} "
+                            f"× games_per_season {facilities.games_per_season} / 2 needs {needed}; every match "
+                            f"is played, so these must agree")
+
+    if balance_reffing is not None:
+        min_refs, max_refs = balance_reffing.season_ref_range(facilities)
+        if ref_same_division and TotalPlayConstraint in present:
+            for div_idx, (team_count, (low, high)) in enumerate(zip(facilities.team_counts, division_matches)):
+                if team_count * max_refs < low or team_count * min_refs > high:
+                    problems.append(f"Division {div_idx} plays {low if low == high else f'{low}-{high}'} matches, "
+                                    f"but its {team_count} teams ref {min_refs}-{max_refs} times each "
+                                    f"({team_count * min_refs}-{team_count * max_refs} refs)")
+        elif not total_teams * min_refs <= total_matches <= total_teams * max_refs:
+            problems.append(f"The facilities have {total_matches} matches, but {total_teams} teams ref "
+                            f"{min_refs}-{max_refs} times each ({total_teams * min_refs}-{total_teams * max_refs} refs)")
+
+    # Busy teams per time and weekend: home, away and ref are three distinct teams
+    for (w_idx, ti_idx), matches in facilities.matches_by_weekend_time.items():
+        if one_thing and 3 * len(matches) > total_teams:
+            problems.append(f"{_slot_name(facilities, w_idx, ti_idx)} has {len(matches)} matches, which need "
+                            f"{3 * len(matches)} distinct teams, but there are {total_teams}")
+    for w_idx, matches in facilities.matches_by_weekend.items():
+        if no_three_hours is not None and 3 * len(matches) > no_three_hours.max_hours * total_teams:
+            problems.append(f"{_slot_name(facilities, w_idx)} has {len(matches)} matches, which need "
+                            f"{3 * len(matches)} busy team slots, but {total_teams} teams are busy at most "
+                            f"{no_three_hours.max_hours} times")
+        if balance_reffing is not None:
+            weekend_games = sum(team_count * balance_reffing.max_weekend_games // 2
+                                for team_count in facilities.team_counts)
+            if len(matches) > weekend_games:
+                problems.append(f"{_slot_name(facilities, w_idx)} has {len(matches)} matches, but teams play at "
+                                f"most {balance_reffing.max_weekend_games} games a weekend ({weekend_games} matches)")
+
+    if PlayNearRefConstraint in present:
+        problems.extend(_check_ref_supply(facilities))
+    if TotalPlayConstraint in present and VsPlayBalanceConstraint in present:
+        problems.extend(_check_division_flow(facilities, [max(0, high - carried) for (_, high), carried
+                                                          in zip(division_matches, carried_matches)],
+                                             ref_same_division, one_thing, no_three_hours, balance_reffing))
+    return problems
+
+
+def _check_ref_supply(facilities: Facilities) -> List[str]:
+    """Check per weekend that every match can get a ref playing at an adjacent time."""
+    problems = []
+    for w_idx in facilities.weekend_idxs:
+        times = {ti_idx: len(facilities.matches_by_weekend_time[w_idx, ti_idx])
+                 for (w, ti_idx) in facilities.matches_by_weekend_time if w == w_idx}
+        flow = max_flow.SimpleMaxFlow()
+        source, sink = 0, 1
+        need_nodes = {ti_idx: 2 + i for i, ti_idx in enumerate(times)}
+        play_nodes = {ti_idx: 2 + len(times) + i for i, ti_idx in enumerate(times)}
+        demand_arcs = {}
+        for ti_idx, count in times.items():
+            demand_arcs[ti_idx] = flow.add_arc_with_capacity(source, need_nodes[ti_idx], count)
+            flow.add_arc_with_capacity(play_nodes[ti_idx], sink, 2 * count)
+            for adjacent in (ti_idx - 1, ti_idx + 1):
+                if adjacent in times:
+                    flow.add_arc_with_capacity(need_nodes[ti_idx], play_nodes[adjacent], count)
+        flow.solve(source, sink)
+        if flow.optimal_flow() < sum(times.values()):
+            short = [ti_idx for ti_idx, arc in demand_arcs.items() if flow.flow(arc) < times[ti_idx]]
+            problems.append(f"{_slot_name(facilities, w_idx)}: refs must play in the time before or after their "
+                            f"match, but only {flow.optimal_flow()} of {sum(times.values())} matches can get one "
+                            f"(short at {', '.join(_time_name(facilities, w_idx, ti_idx) for ti_idx in short)})")
+    return problems
+
+
+def _check_division_flow(facilities: Facilities, division_matches: List[int], ref_same_division: bool,
+                         one_thing: bool, no_three_hours: Optional[NoThreeHoursDays],
+                         balance_reffing: Optional[BalanceReffingConstraint]) -> List[str]:
+    """Check with a max flow that every slot can be filled by the divisions' matches."""
+    roles = 3 if ref_same_division else 2
+    flow = max_flow.SimpleMaxFlow()
+    source, sink = 0, 1
+    nodes: Dict[object, int] = {}
+
+    def node(key) -> int:
+        return nodes.setdefault(key, 2 + len(nodes))
+
+    slots = facilities.matches_by_weekend_time
+    for div_idx, team_count in enumerate(facilities.team_counts):
+        flow.add_arc_with_capacity(source, node(('div', div_idx)), division_matches[div_idx])
+        for w_idx in facilities.weekend_idxs:
+            weekend_cap = len(facilities.matches_by_weekend[w_idx])
+            if no_three_hours is not None:
+                weekend_cap = min(weekend_cap, no_three_hours.max_hours * team_count // roles)
+            if balance_reffing is not None:
+                weekend_cap = min(weekend_cap, team_count * balance_reffing.max_weekend_games // 2)
+            flow.add_arc_with_capacity(node(('div', div_idx)), node(('div', div_idx, w_idx)), weekend_cap)
+            for (w, ti_idx), matches in slots.items():
+                if w == w_idx:
+                    slot_cap = team_count // roles if one_thing else len(matches)
+                    flow.add_arc_with_capacity(node(('div', div_idx, w_idx)), node(('slot', w, ti_idx)), slot_cap)
+    slot_arcs = {slot: flow.add_arc_with_capacity(node(('slot',) + slot), sink, len(matches))
+                 for slot, matches in slots.items()}
+    flow.solve(source, sink)
+    if flow.optimal_flow() == len(facilities.matches):
+        return []
+    unfilled = [slot for slot, arc in slot_arcs.items() if flow.flow(arc) < len(slots[slot])]
+    return [f"Only {flow.optimal_flow()} of {len(facilities.matches)} matches can be given to a division "
+            f"(per-time and per-weekend division limits); unfilled: " +
+            ", ".join(_slot_name(facilities, *slot) for slot in unfilled[:5]) +
+            (f" and {len(unfilled) - 5} more" if len(unfilled) > 5 else "")]
+
+
+def assert_capacity(facilities: Facilities, components: Iterable[SchedulerComponent]):
+    """Raise if check_capacity finds a problem.
+
+    Args:
+        facilities: The facilities to check
+        components: The components the schedule will be built with
+
+    Raises:
+        ValueError: Listing every violated condition
+    """
+    problems = check_capacity(facilities, components)
+    if problems:
+        raise ValueError("The facilities cannot hold this season:\n" + "\n".join(f"  - {p}" for p in problems))
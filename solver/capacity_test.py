@@ -0,0 +1,16 @@
+from solver.capacity import check_capacity
+from solver.component_sets.sand_volleyball_template import get_sand_volleyball_template
+
+
+TIME_SLOTS = {'13:00': [1, 1, 0], '14:00': [1, 1, 1], '15:00': [1, 0, 0]}
+
+
+def test_capacity_check_accepts_consistent_season(small_facilities):
+    facilities = small_facilities(team_counts=[6, 6], games_per_season=2, time_slots=TIME_SLOTS)
+    assert check_capacity(facilities, get_sand_volleyball_template()) == []
+
+
+def test_capacity_check_reports_too_few_matches(small_facilities):
+    facilities = small_facilities(team_counts=[8, 6], games_per_season=2, time_slots=TIME_SLOTS)
+    problems = check_capacity(facilities, get_sand_volleyball_template())
+    assert any("12 matches" in problem and "needs 14" in problem for problem in problems)
@@ -1,23 +1,46 @@
+from typing import Tuple
 from ..schedule_component import SchedulerComponent, ModelActor, DebugReporter
 from ..schedule import Schedule
+from ..facilities.facility import Facilities
 
 
 class BalanceReffingConstraint(SchedulerComponent):
     """A component that balances referee assignments across teams and weekends.
     
     Ensures:
-    - Each team plays exactly 1 game per weekend  
+    - Each team plays at most max_weekend_games (2) games per weekend
     - Each team refs 0-1 games per weekend
-    - Each team refs exactly total_weeks // 2 games per season
+    - Each team refs total_weeks // 2 games per season, give or take season_ref_slack
     """
     
-    def __init__(self):
-        """Initialize the component."""
+    def __init__(self, max_weekend_games: int = 2, season_ref_slack: int = 0):
+        """Initialize the component.
+
+        Args:
+            max_weekend_games: Most games a team plays in one weekend
+            season_ref_slack: How far a team's season refs may be from total_weeks // 2
+                (0 = exactly). Raised by relaxation.find_relaxation for infeasible configurations.
+        """
         super().__init__()
+        self.max_weekend_games = max_weekend_games
+        self.season_ref_slack = season_ref_slack
         self.add_constraint(self._get_balance_reffing_constraint())
         self.add_validator(self._get_balance_reffing_validator())
         self.add_debug_report(self._get_balance_reffing_debug_report())
 
+    def season_ref_range(self, facilities: Facilities) -> Tuple[int, int]:
+        """Get the (min, max) refs per team over the facilities' weekends.
+
+        Args:
+            facilities: The (possibly partial horizon) facilities
+
+        Returns:
+            Tuple of the min and max refs per team
+        """
+        # A partial horizon (rolling horizon window) only needs its share of the season
+        min_refs, max_refs = facilities.season_range(len(facilities.full_season.weekend_idxs) // 2)
+        return max(0, min_refs - self.season_ref_slack), max_refs + self.season_ref_slack
+
     def _get_balance_reffing_constraint(self):
         """Create a constraint function for the OR-Tools model.
         
@@ -31,30 +54,30 @@ class BalanceReffingConstraint(SchedulerComponent):
                 schedule: The schedule model to add the constraint to
             """
             # Get weekend indices from matches
-            weekend_idxs = sorted(list(set(m.weekend_idx for m in schedule.matches)))
+            weekend_idxs = schedule.facilities.weekend_idxs
             total_weeks = len(weekend_idxs)
             games_per_day = schedule.facilities.games_per_season // total_weeks  # Should be 1 for volleyball
             
-            # Weekend play targets - each team plays 0-2 games per weekend
+            # Weekend play targets - each team plays 0-max_weekend_games (2) games per weekend
             # This allows for double headers and byes to balance out over the season
             for w in weekend_idxs:
                 for t_idx in schedule.teams:
-                    weekend_playing_vars = [schedule.is_playing[m, t_idx] for m in schedule.matches if m.weekend_idx == w]
-                    schedule.model.Add(sum(weekend_playing_vars) <= 2)  # Allow up to 2 games per weekend
-                    schedule.model.Add(sum(weekend_playing_vars) >= 0)  # Allow byes
+                    # 0 is allowed (byes)
+                    schedule.model.Add(schedule.count('playing', t_idx, w) <= self.max_weekend_games)
             
             # Weekend ref targets - each team refs 0-1 games per weekend
             for w in weekend_idxs:
                 for t_idx in schedule.teams:
-                    weekend_reffing_vars = [schedule.is_ref[m, t_idx] for m in schedule.matches if m.weekend_idx == w]
-                    schedule.model.Add(sum(weekend_reffing_vars) <= 1)
-                    schedule.model.Add(sum(weekend_reffing_vars) >= 0)
+                    schedule.model.Add(schedule.count('ref', t_idx, w) <= 1)
             
-            # Total ref in a season - each team refs exactly total_weeks // 2
-            season_ref_target = total_weeks // 2
+            # Total ref in a season - each team refs total_weeks // 2 (give or take season_ref_slack)
+            min_refs, max_refs = self.season_ref_range(schedule.facilities)
             for t_idx in schedule.teams:
-                season_reffing_vars = [schedule.is_ref[m, t_idx] for m in schedule.matches]
-                schedule.model.Add(sum(season_reffing_vars) == season_ref_target)
+                season_refs = schedule.count('ref', t_idx)
+                if min_refs == max_refs:
+                    schedule.model.Add(season_refs == min_refs)
+                else:
+                    schedule.model.AddLinearConstraint(season_refs, min_refs, max_refs)
         
         return ModelActor(enforce_balance_reffing)
 
@@ -81,7 +104,7 @@ class BalanceReffingConstraint(SchedulerComponent):
             weekend_idxs = sorted(game_report['weekend_idx'].unique())
             total_weeks = len(weekend_idxs)
             games_per_day = schedule.facilities.games_per_season // total_weeks
-            season_ref_target = total_weeks // 2
+            min_refs, max_refs = self.season_ref_range(schedule.facilities)
             
             # Check weekend play targets
             for w in weekend_idxs:
@@ -89,10 +112,10 @@ class BalanceReffingConstraint(SchedulerComponent):
                 for t_idx in schedule.teams:
                     # Count how many games this team played this weekend
                     games_played = len(week_games[(week_games['team1'] == t_idx) | (week_games['team2'] == t_idx)])
-                    if games_played > 2 or games_played < 0:  # Allow 0-2 games per weekend
+                    if games_played > self.max_weekend_games or games_played < 0:
                         raise ValueError(
                             f"Team {t_idx} played {games_played} games in weekend {w}, "
-                            f"but should play between 0 and 2 games"
+                            f"but should play between 0 and {self.max_weekend_games} games"
                         )
             
             # Check weekend ref targets (0-1 games per weekend)
@@ -110,10 +133,11 @@ class BalanceReffingConstraint(SchedulerComponent):
             # Check season ref totals
             for t_idx in schedule.teams:
                 total_refs = team_report.loc[t_idx, 'total_ref']
-                if total_refs != season_ref_target:
+                if not min_refs <= total_refs <= max_refs:
+                    expected = f"exactly {min_refs}" if min_refs == max_refs else f"between {min_refs} and {max_refs}"
                     raise ValueError(
                         f"Team {t_idx} reffed {total_refs} games in the season, "
-                        f"but should ref exactly {season_ref_target} games"
+                        f"but should ref {expected} games"
                     )
         
         return validate_balance_reffing
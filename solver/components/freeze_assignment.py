@@ -0,0 +1,88 @@
+from typing import Dict, Tuple
+from ..schedule_component import SchedulerComponent, ModelActor, DebugReporter
+from ..schedule import Schedule
+from ..facilities.facility import Match
+
+
+class FreezeAssignmentConstraint(SchedulerComponent):
+    """A component that fixes matches to a given (home, away, ref) assignment.
+
+    Used to keep already-played games unchanged when re-solving a season after
+    mid-season changes (see repair.repair_schedule).
+    """
+
+    def __init__(self, frozen: Dict[Match, Tuple[int, int, int]]):
+        """Initialize the component.
+
+        Args:
+            frozen: Dict mapping the matches to fix to (home, away, ref) team indices
+        """
+        super().__init__()
+        self.frozen = dict(frozen)
+        self.add_constraint(self._get_freeze_constraint())
+        self.add_validator(self._get_freeze_validator())
+        self.add_debug_report(self._get_freeze_debug_report())
+
+    def _get_freeze_constraint(self):
+        """Create a constraint function for the OR-Tools model.
+
+        Returns:
+            ModelActor: A constraint that fixes the frozen matches' role literals
+        """
+        def enforce_freeze(schedule: Schedule):
+            """Fix each frozen match's home, away and ref team.
+
+            Args:
+                schedule: The schedule model to add the constraint to
+            """
+            for match, (home, away, ref) in self.frozen.items():
+                schedule.model.AddBoolAnd([schedule.is_home[match, home], schedule.is_away[match, away],
+                                           schedule.is_ref[match, ref]])
+        return ModelActor(enforce_freeze)
+
+    def _get_freeze_validator(self):
+        """Create a validator function to verify frozen matches kept their teams.
+
+        Returns:
+            ModelActor: A validator that compares the solution to the frozen assignment
+        """
+        def validate_freeze(schedule: Schedule):
+            """Verify every frozen match kept its assignment.
+
+            Args:
+                schedule: The solved schedule to validate
+
+            Raises:
+                ValueError: If a frozen match was reassigned
+            """
+            assignment = schedule.get_assignment()
+            for match, teams in self.frozen.items():
+                if assignment[match] != teams:
+                    raise ValueError(f"Frozen match {match} changed from {teams} to {assignment[match]}")
+        return ModelActor(validate_freeze)
+
+    def _get_freeze_debug_report(self):
+        """Create a debug report function listing the frozen matches.
+
+        Returns:
+            DebugReporter: A debug reporter for the frozen assignment
+        """
+        def generate_freeze_report(schedule: Schedule):
+            """Generate a debug report of frozen matches per weekend.
+
+            Args:
+                schedule: The solved schedule to report on
+
+            Returns:
+                str: Debug report string
+            """
+            lines = []
+            lines.append("FROZEN ASSIGNMENT DEBUG REPORT")
+            lines.append("=" * 40)
+            lines.append(f"Frozen matches: {len(self.frozen)}")
+            for w_idx in sorted({match.weekend_idx for match in self.frozen}):
+                count = sum(1 for match in self.frozen if match.weekend_idx == w_idx)
+                lines.append(f"  Weekend {w_idx}: {count} matches")
+            return "\n".join(lines)
+
+        return DebugReporter(generate_freeze_report, "FreezeAssignment")
@@ -0,0 +1,76 @@
+from typing import Dict, Tuple
+from ..schedule_component import SchedulerComponent, ModelActor, DebugReporter
+from ..schedule import Schedule
+from ..facilities.facility import Match
+
+
+class MinimalChangeOptimization(SchedulerComponent):
+    """A component that penalizes changes from a previous assignment.
+
+    Every (match, role) whose team differs from the previous assignment costs
+    weight, so a re-solve only moves the games it has to.
+    """
+
+    def __init__(self, previous: Dict[Match, Tuple[int, int, int]], weight=100.0):
+        """Initialize the component.
+
+        Args:
+            previous: Dict mapping matches to their previous (home, away, ref) team indices
+            weight: The penalty per changed role compared to other optimizations
+        """
+        super().__init__()
+        self.previous = dict(previous)
+        self.weight = weight
+        self.add_optimizer(self._get_minimal_change_optimizer())
+        self.add_debug_report(self._get_minimal_change_debug_report())
+
+    def _get_minimal_change_optimizer(self):
+        """Create an optimizer function penalizing changed roles.
+
+        Returns:
+            ModelActor: An optimizer that minimizes changes from the previous assignment
+        """
+        def optimize_minimal_change(schedule: Schedule):
+            """Add one penalty term per (match, role) that no longer has its previous team.
+
+            Args:
+                schedule: The schedule model to add the optimization to
+            """
+            kept_roles = []
+            for match, teams in self.previous.items():
+                for role_literals, t_idx in zip((schedule.is_home, schedule.is_away, schedule.is_ref), teams):
+                    kept_roles.append(role_literals[match, t_idx])
+
+            schedule.objective.add(self.__class__.__name__, [1 - kept for kept in kept_roles], self.weight)
+
+        return ModelActor(optimize_minimal_change)
+
+    def _get_minimal_change_debug_report(self):
+        """Create a debug report function listing changed matches.
+
+        Returns:
+            DebugReporter: A debug reporter for changes from the previous assignment
+        """
+        def generate_minimal_change_report(schedule: Schedule):
+            """Generate a debug report of the matches that changed.
+
+            Args:
+                schedule: The solved schedule to report on
+
+            Returns:
+                str: Debug report string
+            """
+            assignment = schedule.get_assignment()
+            changed = [(match, teams, assignment[match]) for match, teams in self.previous.items()
+                       if assignment[match] != teams]
+
+            lines = []
+            lines.append("MINIMAL CHANGE DEBUG REPORT")
+            lines.append("=" * 40)
+            lines.append(f"Changed matches: {len(changed)}/{len(self.previous)}")
+            for match, before, after in sorted(changed, key=lambda c: (c[0].weekend_idx, c[0].time_idx,
+                                                                       c[0].location)):
+                lines.append(f"  {match}: {before} -> {after}")
+            return "\n".join(lines)
+
+        return DebugReporter(generate_minimal_change_report, "MinimalChange")
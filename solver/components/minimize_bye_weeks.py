@@ -36,25 +36,17 @@ class MinimizeByeWeeks(SchedulerComponent):
                 schedule: The schedule model to add the optimization to
             """
             # Get unique weekend indices
-            weekend_idxs = sorted(list(set(m.weekend_idx for m in schedule.matches)))
+            weekend_idxs = schedule.facilities.weekend_idxs
             
             # Create variables to track bye weeks
             bye_week_vars = {}
             for w_idx in weekend_idxs:
                 for t_idx in schedule.teams:
-                    key = (w_idx, t_idx)
-                    # Create a boolean variable that is true if team has a bye this weekend
-                    bye_week_vars[key] = schedule.model.NewBoolVar(f"bye_week_{w_idx}_{t_idx}")
-                    # Link to games_per_weekend: bye = (games == 0)
-                    schedule.model.Add(schedule.games_per_weekend[key] == 0).OnlyEnforceIf(bye_week_vars[key])
-                    schedule.model.Add(schedule.games_per_weekend[key] > 0).OnlyEnforceIf(bye_week_vars[key].Not())
+                    # True if team has a bye this weekend, shared with other bye components
+                    bye_week_vars[w_idx, t_idx] = schedule.is_bye(w_idx, t_idx)
             
-            # Store the optimization terms in the shared list
-            if not hasattr(schedule, 'things_to_minimize'):
-                schedule.things_to_minimize = []
-            
-            # Add the bye week terms with their weight
-            schedule.things_to_minimize.extend([d * self.weight for d in bye_week_vars.values()])
+            # Register the bye week terms with their weight
+            schedule.objective.add(self.__class__.__name__, bye_week_vars.values(), self.weight)
         
         return ModelActor(optimize_bye_weeks)
 
@@ -1,54 +1,76 @@
 from ..schedule_component import SchedulerComponent, ModelActor, DebugReporter
 from ..schedule import Schedule
+import bisect
 
 
 class NoThreeHoursDays(SchedulerComponent):
     """A component that constrains teams to not be busy for 3+ hours in a day.
     
     This component provides:
-    1. A constraint that prevents teams from being busy at time X and times X-2, X+2, X+3
+    1. A constraint that keeps each team's busy times within a window of
+       max_hours one-hour time slots per weekend (by default times X and X+1)
     2. A debug report showing busy time distribution
     """
-    def __init__(self):
-        """Initialize the component."""
+    def __init__(self, max_hours: int = 2):
+        """Initialize the component.
+
+        Args:
+            max_hours: Most hours from a team's first busy time slot to the end of
+                its last one on a weekend. Leagues with longer days can raise it.
+
+        Raises:
+            ValueError: If max_hours is less than 1
+        """
         super().__init__()
+        if max_hours < 1:
+            raise ValueError(f"max_hours must be at least 1, got {max_hours}")
+        self.max_hours = max_hours
         self.add_constraint(self._get_no_three_hours_constraint())
         self.add_validator(self._get_no_three_hours_validator())
         self.add_debug_report(self._get_no_three_hours_debug_report())
     
     def _get_no_three_hours_constraint(self) -> ModelActor:
-        """Get the constraint that prevents 3+ hour busy periods."""
+        """Get the constraint that prevents busy periods longer than max_hours."""
         def add_no_three_hours_constraint(schedule: Schedule):
             # Get all weekend and time indices
-            weekend_idxs = sorted(list(set(m.weekend_idx for m in schedule.matches)))
-            time_indices = sorted(list(set(m.time_idx for m in schedule.matches)))
+            weekend_idxs = schedule.facilities.weekend_idxs
+            time_indices = schedule.facilities.time_idxs
             
             # For each team and weekend
             for w_idx in weekend_idxs:
                 for t_idx in range(schedule.total_teams):
-                    # For each pair of time slots
-                    for time_idx in time_indices:
-                        for other_time_idx in time_indices:
-                            # If time slots are not consecutive (gap > 1), they can't both be busy
-                            if abs(time_idx - other_time_idx) > 1:
-                                busy_key = (w_idx, time_idx, t_idx)
-                                other_key = (w_idx, other_time_idx, t_idx)
-                                
-                                if busy_key in schedule.busy_at_time and other_key in schedule.busy_at_time:
-                                    # If busy at time_idx, then not busy at other_time_idx
-                                    schedule.model.AddImplication(
-                                        schedule.busy_at_time[busy_key],
-                                        schedule.busy_at_time[other_key].Not()
-                                    )
+                    busy_times = [(time_idx, schedule.busy_at_time[w_idx, time_idx, t_idx]) for time_idx in time_indices
+                                  if (w_idx, time_idx, t_idx) in schedule.busy_at_time]
+                    # busy_before[time_idx] is forced true once the team is busy at or
+                    # before time_idx, so being busy at a time only has to rule out the
+                    # one literal max_hours slots earlier: linear in the number of times
+                    busy_before = {}
+                    previous = None
+                    for time_idx, busy in busy_times:
+                        if busy_times[-1][0] - time_idx < self.max_hours:
+                            break  # No later time is max_hours or more after this one
+                        started = schedule.model.NewBoolVar(f"busy_by_{w_idx}_{time_idx}_{t_idx}")
+                        schedule.model.AddImplication(busy, started)
+                        if previous is not None:
+                            schedule.model.AddImplication(previous, started)
+                        busy_before[time_idx] = started
+                        previous = started
+                    
+                    started_times = list(busy_before)
+                    for time_idx, busy in busy_times:
+                        # Latest earlier time that is too far from time_idx to share the day
+                        position = bisect.bisect_right(started_times, time_idx - self.max_hours)
+                        if position:
+                            schedule.model.AddImplication(busy, busy_before[started_times[position - 1]].Not())
         
         return ModelActor(add_no_three_hours_constraint)
     
     def _get_no_three_hours_validator(self) -> ModelActor:
-        """Get the validator that checks no team is at field for 3+ hours."""
+        """Get the validator that checks no team is at field for more than max_hours."""
         def validate_no_three_hours(schedule: Schedule):
-            """Validate that no team is at the field for 3 or more hours."""
-            weekend_idxs = sorted(list(set(m.weekend_idx for m in schedule.matches)))
-            time_indices = sorted(list(set(m.time_idx for m in schedule.matches)))
+            """Validate that no team is at the field for more than max_hours hours."""
+            weekend_idxs = schedule.facilities.weekend_idxs
+            time_indices = schedule.facilities.time_idxs
             
             violations = []
             
@@ -67,7 +89,7 @@ class NoThreeHoursDays(SchedulerComponent):
                         latest_time = max(busy_times)
                         total_hours = latest_time - earliest_time + 1
                         
-                        if total_hours >= 3:
+                        if total_hours > self.max_hours:
                             violations.append(f"Team {t_idx}, Weekend {w_idx}: at field for {total_hours} hours (times {earliest_time}-{latest_time})")
             
             if violations:
@@ -88,8 +110,8 @@ class NoThreeHoursDays(SchedulerComponent):
             if not hasattr(schedule, '_last_solve_status'):
                 return "NoThreeHoursDays: No solution found."
 
-            weekend_idxs = sorted(list(set(m.weekend_idx for m in schedule.matches)))
-            time_indices = sorted(list(set(m.time_idx for m in schedule.matches)))
+            weekend_idxs = schedule.facilities.weekend_idxs
+            time_indices = schedule.facilities.time_idxs
             
             # Create table header
             header = "Team |"
@@ -122,7 +144,7 @@ class NoThreeHoursDays(SchedulerComponent):
                         total_hours = latest_time - earliest_time + 1
                     
                     # Mark violations with ✗
-                    if total_hours >= 3:
+                    if total_hours > self.max_hours:
                         row += f"  {total_hours}✗ |"
                         violations_found = True
                     else:
@@ -133,9 +155,9 @@ class NoThreeHoursDays(SchedulerComponent):
             # Add summary
             lines.append("")
             if violations_found:
-                lines.append("✗ VIOLATIONS FOUND: Teams marked with ✗ are at field for 3+ hours")
+                lines.append(f"✗ VIOLATIONS FOUND: Teams marked with ✗ are at field for {self.max_hours + 1}+ hours")
             else:
-                lines.append("✓ PASS: No teams at field for 3+ hours")
+                lines.append(f"✓ PASS: No teams at field for {self.max_hours + 1}+ hours")
             
             return "\n".join(lines)
         
@@ -0,0 +1,46 @@
+import itertools
+import pytest
+from types import SimpleNamespace
+from ortools.sat.python import cp_model
+from solver.components.no_three_hours_days import NoThreeHoursDays
+
+
+def add_pairwise_rule(schedule, max_hours):
+    """The previous formulation: no team is busy at two times max_hours or more apart."""
+    for (w_idx, time_idx, t_idx), busy in schedule.busy_at_time.items():
+        for other_time_idx in schedule.facilities.time_idxs:
+            other_key = (w_idx, other_time_idx, t_idx)
+            if abs(time_idx - other_time_idx) >= max_hours and other_key in schedule.busy_at_time:
+                schedule.model.AddImplication(busy, schedule.busy_at_time[other_key].Not())
+
+
+def is_feasible(time_idxs, pattern, add_rule):
+    """Check whether one team may be busy at exactly the pattern's times of a single weekend."""
+    model = cp_model.CpModel()
+    busy_at_time = {(0, time_idx, 0): model.NewBoolVar(f"busy_{time_idx}") for time_idx in time_idxs}
+    for time_idx, busy in zip(time_idxs, pattern):
+        model.Add(busy_at_time[0, time_idx, 0] == busy)
+    # Only the parts of a Schedule the constraint reads
+    schedule = SimpleNamespace(model=model, busy_at_time=busy_at_time, total_teams=1,
+                               facilities=SimpleNamespace(weekend_idxs=(0,), time_idxs=tuple(time_idxs)))
+    add_rule(schedule)
+    return cp_model.CpSolver().Solve(model) in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+
+
+# Consecutive time slots, and weekends missing some of the season's time slots
+TIME_IDXS = [(0,), (0, 1), (0, 1, 2), (0, 1, 2, 3), (0, 1, 2, 3, 4), (0, 2, 3), (0, 1, 3, 4)]
+
+
+@pytest.mark.parametrize('max_hours', [1, 2, 3])
+def test_chain_allows_the_same_busy_patterns_as_the_pairwise_rule(max_hours):
+    component = NoThreeHoursDays(max_hours)
+    for time_idxs in TIME_IDXS:
+        for pattern in itertools.product([0, 1], repeat=len(time_idxs)):
+            chain = is_feasible(time_idxs, pattern, component._constraints[0])
+            pairwise = is_feasible(time_idxs, pattern, lambda schedule: add_pairwise_rule(schedule, max_hours))
+            assert chain == pairwise, (time_idxs, pattern)
+
+
+def test_max_hours_must_be_positive():
+    with pytest.raises(ValueError):
+        NoThreeHoursDays(0)
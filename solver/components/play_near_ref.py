@@ -28,13 +28,13 @@ class PlayNearRefConstraint(SchedulerComponent):
             Args:
                 schedule: The schedule model to add the constraint to
             """
-            # Get weekend indices and max time index from matches
-            weekend_idxs = sorted(list(set(m.weekend_idx for m in schedule.matches)))
-            max_time_idx = max(m.time_idx for m in schedule.matches) + 1
+            # Get weekend and time indices from the facilities
+            weekend_idxs = schedule.facilities.weekend_idxs
+            time_idxs = schedule.facilities.time_idxs
             
             # Teams can only ref if playing around that time
             for weekend_idx in weekend_idxs:
-                for time_idx in range(max_time_idx):
+                for time_idx in time_idxs:
                     for t_idx in schedule.teams:
                         # Implication: if reffing at time, must be playing around that time
                         schedule.model.AddImplication(
@@ -34,28 +34,20 @@ class RecInLowCourtsProcessor(SchedulerComponent):
             if not hasattr(schedule, '_team_reassignments'):
                 schedule._team_reassignments = {}
             
-            # Group matches by weekend and time
-            matches_by_time = {}
-            for match in schedule.matches:
-                key = (match.weekend_idx, match.time_idx)
-                if key not in matches_by_time:
-                    matches_by_time[key] = []
-                matches_by_time[key].append(match)
+            assignment = schedule.get_assignment()
             
             # Process each time frame
-            for (weekend_idx, time_idx), time_matches in matches_by_time.items():
-                if len(time_matches) <= 1:
+            for (weekend_idx, time_idx), slot_matches in schedule.facilities.matches_by_weekend_time.items():
+                if len(slot_matches) <= 1:
                     continue  # No need to sort single game
                 
                 # Sort matches by location (court) to get current order
-                time_matches.sort(key=lambda m: m.location)
+                time_matches = sorted(slot_matches, key=lambda m: m.location)
                 
                 # Get current team assignments and their divisions
                 game_assignments = []
                 for match in time_matches:
-                    home_team = schedule.solver.Value(schedule.home_team[match])
-                    away_team = schedule.solver.Value(schedule.away_team[match])
-                    ref_team = schedule.solver.Value(schedule.ref[match])
+                    home_team, away_team, ref_team = assignment[match]
                     division = schedule.team_div[home_team]
                     
                     game_assignments.append((division, home_team, away_team, ref_team, match))
@@ -0,0 +1,104 @@
+from typing import Dict, Optional, Tuple
+from ..schedule_component import SchedulerComponent, ModelActor
+from ..schedule import Schedule
+
+
+class RefAvailabilityConstraint(SchedulerComponent):
+    """Keeps a play-only schedule reffable without per-match ref variables.
+
+    Under the sand volleyball template a team can ref at time X of a weekend
+    only if it plays exactly one game that weekend, at time X-1 or X+1, in the
+    match's division (PlayNearRef, NoThreeHoursDays, OneThingAtATime and
+    RefSameDivision together), and refs at most once a weekend.
+
+    Instead of deciding which team refs which match, this component only decides
+    which teams ref in each weekend (ref_weekend), as many per division as the
+    division has matches. A slot at time X draws on teams playing at X-1 and
+    X+1, so same-parity times form chains and Hall's condition reduces to runs of
+    consecutive same-parity times: the division's matches in a run may not exceed
+    its reffing teams playing around the run. A perfect match-to-ref assignment
+    then exists for every weekend on its own (see play_first.assign_weekend_refs).
+    """
+
+    def __init__(self, season_refs: Optional[Tuple[int, int]] = None, max_weekend_games: Optional[int] = None):
+        """Initialize the component.
+
+        Args:
+            season_refs: Optional (min, max) refs per team over the season
+            max_weekend_games: Optional cap on games per team per weekend
+        """
+        super().__init__()
+        self.season_refs = season_refs
+        self.max_weekend_games = max_weekend_games
+        self.ref_weekend: Dict[Tuple[int, int], object] = {}  # (weekend_idx, team_idx) -> bool, set on build
+        self.add_constraint(self._get_ref_availability_constraint())
+
+    def _get_ref_availability_constraint(self):
+        """Create a constraint function for the OR-Tools model.
+
+        Returns:
+            ModelActor: A constraint that picks each weekend's refs and keeps them next to their slots
+        """
+        def enforce_ref_availability(schedule: Schedule):
+            """Add the ref availability constraints to the OR-Tools model.
+
+            Args:
+                schedule: The schedule model to add the constraint to
+            """
+            facilities = schedule.facilities
+            self.ref_weekend = {}
+            for w_idx in facilities.weekend_idxs:
+                for t_idx in schedule.teams:
+                    ref_weekend = schedule.model.NewBoolVar(f"ref_weekend_{w_idx}_{t_idx}")
+                    self.ref_weekend[w_idx, t_idx] = ref_weekend
+                    schedule.model.Add(schedule.games_per_weekend[w_idx, t_idx] == 1).OnlyEnforceIf(ref_weekend)
+                    if self.max_weekend_games is not None:
+                        schedule.model.Add(schedule.games_per_weekend[w_idx, t_idx] <= self.max_weekend_games)
+
+                times = sorted(ti_idx for (w, ti_idx) in facilities.matches_by_weekend_time if w == w_idx)
+                for div_teams in schedule.division_teams:
+                    matches_at = {ti_idx: sum(schedule.is_home[m, t_idx]
+                                              for m in facilities.matches_by_weekend_time[w_idx, ti_idx]
+                                              for t_idx in div_teams)
+                                  for ti_idx in times}
+                    schedule.model.Add(sum(self.ref_weekend[w_idx, t_idx] for t_idx in div_teams) ==
+                                       sum(matches_at.values()))
+
+                    # ref_at[ti_idx, t_idx]: the team refs this weekend and its only game is at ti_idx
+                    ref_at = {}
+                    for t_idx in div_teams:
+                        for ti_idx in times:
+                            ref_at[ti_idx, t_idx] = schedule.model.NewBoolVar(f"ref_from_{w_idx}_{ti_idx}_{t_idx}")
+                            schedule.model.AddImplication(ref_at[ti_idx, t_idx], schedule.playing_at_time[w_idx, ti_idx, t_idx])
+                        schedule.model.Add(sum(ref_at[ti_idx, t_idx] for ti_idx in times) ==
+                                           self.ref_weekend[w_idx, t_idx])
+
+                    for start in times:
+                        run = [start]
+                        self._add_hall_condition(schedule, run, matches_at, ref_at, div_teams)
+                        while run[-1] + 2 in matches_at:
+                            run.append(run[-1] + 2)
+                            self._add_hall_condition(schedule, run, matches_at, ref_at, div_teams)
+
+            if self.season_refs is not None:
+                for t_idx in schedule.teams:
+                    schedule.model.AddLinearConstraint(
+                        sum(self.ref_weekend[w_idx, t_idx] for w_idx in facilities.weekend_idxs), *self.season_refs)
+
+        return ModelActor(enforce_ref_availability)
+
+    def get_build_state(self) -> Dict[Tuple[int, int], int]:
+        """Get the proto index of every ref_weekend literal."""
+        return {key: literal.Index() for key, literal in self.ref_weekend.items()}
+
+    def restore_build_state(self, schedule: Schedule, state: Dict[Tuple[int, int], int]):
+        """Reattach ref_weekend to a schedule loaded from a model cache."""
+        self.ref_weekend = {key: schedule.model.GetIntVarFromProtoIndex(index) for key, index in state.items()}
+
+    @staticmethod
+    def _add_hall_condition(schedule: Schedule, run, matches_at, ref_at, div_teams):
+        """Require a run of same-parity times to have as many refs playing around it as matches."""
+        around = {ti_idx + offset for ti_idx in run for offset in (-1, 1)}
+        schedule.model.Add(sum(matches_at[ti_idx] for ti_idx in run) <=
+                           sum(ref_at[ti_idx, t_idx] for ti_idx in around if ti_idx in matches_at
+                               for t_idx in div_teams))
@@ -28,6 +28,10 @@ class RefSameDivisionConstraint(SchedulerComponent):
             Args:
                 schedule: The schedule model to add the constraint to
             """
+            # In division-aware mode home_div and ref_div are the same match division
+            if schedule.division_aware:
+                return
+
             # For each match, referee division must equal home team division
             for m in schedule.matches:
                 schedule.model.Add(schedule.home_div[m] == schedule.ref_div[m])
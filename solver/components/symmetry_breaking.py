@@ -0,0 +1,174 @@
+from typing import Dict, List, Tuple
+from ..schedule_component import SchedulerComponent, ModelActor, DebugReporter
+from ..schedule import Schedule
+
+
+class SymmetryBreakingConstraint(SchedulerComponent):
+    """An opt-in component that removes interchangeable-solution symmetry.
+
+    The template components treat teams within a division, courts within a time
+    slot and weekends with the same layout as interchangeable, so every schedule
+    has many relabelled twins with the same objective. This component adds
+    ordering constraints that keep one representative of each group:
+
+    - Teams: within a division, team t's first playing slot is no later than
+      team t+1's first playing slot.
+    - Courts: within a (weekend, date, time) slot, home teams are non-decreasing
+      by court.
+    - Weekends: weekends with identical court/time layouts are ordered by a
+      team-label-independent key (division-weighted play per time slot).
+
+    Only use this when nothing else in the model distinguishes individual teams,
+    courts or weekends (e.g. fixed assignments or team-specific requests). Team
+    ordering is skipped on facilities with a carry-over, whose earlier games
+    already tell the teams apart.
+    """
+
+    def __init__(self, teams: bool = True, courts: bool = True, weekends: bool = True):
+        """Initialize the component.
+
+        Args:
+            teams: Order teams within each division by first playing slot
+            courts: Order home teams across courts within each time slot
+            weekends: Order weekends that share the same layout
+        """
+        super().__init__()
+        self.teams = teams
+        self.courts = courts
+        self.weekends = weekends
+        self._added_counts: Dict[str, int] = {}
+        self.add_constraint(self._get_symmetry_breaking_constraint())
+        self.add_debug_report(self._get_symmetry_breaking_debug_report())
+
+    def get_build_state(self) -> Dict[str, int]:
+        """Get the number of ordering constraints added per group."""
+        return dict(self._added_counts)
+
+    def restore_build_state(self, schedule: Schedule, state: Dict[str, int]):
+        """Restore the ordering constraint counts of a model loaded from a model cache."""
+        self._added_counts = dict(state)
+
+    @staticmethod
+    def _slot_ranks(schedule: Schedule) -> Dict[Tuple[int, str, int], int]:
+        """Rank every (weekend, date, time) slot in chronological order."""
+        slots = sorted({(m.weekend_idx, m.date, m.time_idx) for m in schedule.matches})
+        return {slot: rank for rank, slot in enumerate(slots)}
+
+    @staticmethod
+    def _weekend_layout(schedule: Schedule, w_idx: int) -> Tuple:
+        """Describe a weekend's courts and times independently of its dates."""
+        weekend_matches = schedule.facilities.matches_by_weekend[w_idx]
+        dates = sorted({m.date for m in weekend_matches})
+        return tuple(sorted((dates.index(m.date), m.time_idx, m.location) for m in weekend_matches))
+
+    def _get_symmetry_breaking_constraint(self):
+        """Create a constraint function for the OR-Tools model.
+
+        Returns:
+            ModelActor: A constraint that adds the enabled ordering constraints
+        """
+        def enforce_symmetry_breaking(schedule: Schedule):
+            """Add symmetry-breaking ordering constraints to the OR-Tools model.
+
+            Args:
+                schedule: The schedule model to add the constraint to
+            """
+            self._added_counts = {}
+            slot_ranks = self._slot_ranks(schedule)
+
+            if self.teams and not schedule.facilities.carry_over:
+                self._added_counts['teams'] = self._order_teams(schedule, slot_ranks)
+            if self.courts:
+                self._added_counts['courts'] = self._order_courts(schedule)
+            if self.weekends:
+                self._added_counts['weekends'] = self._order_weekends(schedule)
+
+        return ModelActor(enforce_symmetry_breaking)
+
+    @staticmethod
+    def _order_teams(schedule: Schedule, slot_ranks: Dict[Tuple[int, str, int], int]) -> int:
+        """Require non-decreasing first playing slot for consecutive teams in a division."""
+        num_slots = len(slot_ranks)
+        lead = {}
+        for t_idx in schedule.teams:
+            # lead = num_slots - first playing slot rank (0 if the team never plays),
+            # written as a max over scaled literals rather than a min over offsets
+            lead[t_idx] = schedule.model.NewIntVar(0, num_slots, f"first_slot_lead_{t_idx}")
+            schedule.model.AddMaxEquality(lead[t_idx], [
+                (num_slots - slot_ranks[m.weekend_idx, m.date, m.time_idx]) * schedule.is_playing[m, t_idx]
+                for m in schedule.matches
+            ])
+
+        added = 0
+        for div_teams in schedule.division_teams:
+            for t1, t2 in zip(div_teams, div_teams[1:]):
+                schedule.model.Add(lead[t1] >= lead[t2])
+                added += 1
+        return added
+
+    @staticmethod
+    def _order_courts(schedule: Schedule) -> int:
+        """Require non-decreasing home team by court within each time slot."""
+        slots: Dict[Tuple[int, str, int], List] = {}
+        for m in schedule.matches:
+            slots.setdefault((m.weekend_idx, m.date, m.time_idx), []).append(m)
+
+        added = 0
+        for slot_matches in slots.values():
+            slot_matches = sorted(slot_matches, key=lambda m: m.location)
+            for m1, m2 in zip(slot_matches, slot_matches[1:]):
+                schedule.model.Add(schedule.home_team[m1] <= schedule.home_team[m2])
+                added += 1
+        return added
+
+    def _order_weekends(self, schedule: Schedule) -> int:
+        """Order weekends that share a layout by a team-label-independent key."""
+        time_idxs = schedule.facilities.time_idxs
+        layouts: Dict[Tuple, List[int]] = {}
+        for w_idx in schedule.facilities.weekend_idxs:
+            layouts.setdefault(self._weekend_layout(schedule, w_idx), []).append(w_idx)
+
+        def weekend_key(w_idx):
+            # Sums over all teams, so relabelling teams within a division or
+            # permuting courts leaves the key unchanged
+            return sum((schedule.team_div[t_idx] + 1) * (ti_pos + 1) * schedule.playing_at_time[w_idx, ti_idx, t_idx]
+                       for ti_pos, ti_idx in enumerate(time_idxs)
+                       for t_idx in schedule.teams)
+
+        added = 0
+        for weekend_group in layouts.values():
+            for w1, w2 in zip(weekend_group, weekend_group[1:]):
+                schedule.model.Add(weekend_key(w1) <= weekend_key(w2))
+                added += 1
+        return added
+
+    def _get_symmetry_breaking_debug_report(self):
+        """Create a debug report function listing the ordering constraints added.
+
+        Returns:
+            DebugReporter: A debug reporter summarizing the symmetry groups
+        """
+        def generate_symmetry_breaking_report(schedule):
+            """Generate a debug report of the symmetry-breaking constraints.
+
+            Args:
+                schedule: The solved schedule to report on
+
+            Returns:
+                str: Debug report string
+            """
+            lines = []
+            lines.append("SYMMETRY BREAKING DEBUG REPORT")
+            lines.append("=" * 50)
+            for group in ('teams', 'courts', 'weekends'):
+                if group in self._added_counts:
+                    lines.append(f"{group:10s}: {self._added_counts[group]} ordering constraints")
+                else:
+                    lines.append(f"{group:10s}: disabled")
+
+            first_solution_time = schedule.get_time_to_objective()
+            if first_solution_time is not None:
+                lines.append(f"First solution after {first_solution_time:.2f}s")
+            return "\n".join(lines)
+
+        return DebugReporter(generate_symmetry_breaking_report, "SymmetryBreakingConstraint")
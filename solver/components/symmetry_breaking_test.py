@@ -0,0 +1,39 @@
+import pytest
+from solver.schedule_creator import ScheduleCreator
+from solver.solver_profiles import SolverProfile
+from solver.component_sets.sand_volleyball_template import get_sand_volleyball_template
+from solver.components.symmetry_breaking import SymmetryBreakingConstraint
+
+PROFILE = SolverProfile(name='exact', max_time_in_seconds=60.0, num_workers=1, random_seed=0)
+
+FACILITIES = {
+    'one_division': dict(team_counts=[6], games_per_season=2),
+    'four_weekends': dict(team_counts=[6], games_per_season=4, num_dates=4),
+    'two_full_slots': dict(team_counts=[8], games_per_season=2, time_slots={'13:00': [1, 1], '14:00': [1, 1]}),
+    # Fits the capacity check, but the template's constraints leave no valid schedule
+    'infeasible': dict(team_counts=[3, 3], games_per_season=4, num_dates=4),
+}
+
+
+def solve(facilities, extra_components):
+    creator = ScheduleCreator(facilities, components=get_sand_volleyball_template() + extra_components,
+                              solver_profile=PROFILE)
+    schedule = creator.build_schedule()
+    schedule.solve(PROFILE)
+    if schedule.stop_reason != 'optimal':
+        return schedule.stop_reason, None
+    creator.finalize_schedule(schedule)
+    return schedule.stop_reason, schedule.solver.ObjectiveValue()
+
+
+@pytest.mark.parametrize('facilities_name', list(FACILITIES))
+@pytest.mark.parametrize('orderings', [
+    dict(teams=True, courts=False, weekends=False),
+    dict(teams=False, courts=True, weekends=False),
+    dict(teams=False, courts=False, weekends=True),
+    dict(teams=True, courts=True, weekends=True),
+])
+def test_symmetry_breaking_keeps_feasibility_and_the_optimum(small_facilities, facilities_name, orderings):
+    facilities = small_facilities(**FACILITIES[facilities_name])
+
+    assert solve(facilities, [SymmetryBreakingConstraint(**orderings)]) == solve(facilities, [])
@@ -38,9 +38,8 @@ class TimeVarietyOptimization(SchedulerComponent):
             Args:
                 schedule: The schedule model to add the optimization to
             """
-            # Get unique weekend and time combinations
-            weekend_idxs = sorted(list(set(m.weekend_idx for m in schedule.matches)))
-            time_idxs = sorted(list(set(m.time_idx for m in schedule.matches)))
+            # Get unique time slots
+            time_idxs = schedule.facilities.time_idxs
             
             # Calculate target plays per team for each time slot dynamically from facilities
             # For each time slot: target = (games_at_that_time * 2) / total_teams
@@ -48,41 +47,19 @@ class TimeVarietyOptimization(SchedulerComponent):
             total_teams = len(schedule.teams)
             
             for time_idx in time_idxs:
-                # Count games at this time slot across all weekends
-                games_at_this_time = sum(1 for m in schedule.matches if m.time_idx == time_idx)
+                # Count games at this time slot across all weekends, carried-over ones included
+                games_at_this_time = len(schedule.facilities.matches_by_time[time_idx]) + sum(
+                    1 for m in schedule.facilities.carry_over if m.time_idx == time_idx)
                 # Each game involves 2 teams, so total team-slots = games * 2
                 target_plays = (games_at_this_time * 2) / total_teams
                 time_slot_targets[time_idx] = target_plays
                 print(f"Time slot {time_idx}: {games_at_this_time} games, target {target_plays:.2f} plays per team")
             
-            # Create variables to count how many times each team plays at each time slot
+            # Count how many times each team plays at each time slot across all weekends
             team_time_counts = {}
-            max_possible_games = len(weekend_idxs)  # Maximum games any team could play at one time slot
             for t_idx in schedule.teams:
                 for time_idx in time_idxs:
-                    var_name = f'team_{t_idx}_time_{time_idx}_count'
-                    team_time_counts[t_idx, time_idx] = schedule.model.NewIntVar(
-                        0, max_possible_games, var_name
-                    )
-            
-            # Link the counting variables to actual game assignments
-            # Sum all playing_at_time variables for each team-time combination
-            for t_idx in schedule.teams:
-                for time_idx in time_idxs:
-                    # Collect all playing_at_time variables for this team and time across all weekends
-                    playing_vars = []
-                    for weekend_idx in weekend_idxs:
-                        # Check if this combination exists in the schedule
-                        key = (weekend_idx, time_idx, t_idx)
-                        if key in schedule.playing_at_time:
-                            playing_vars.append(schedule.playing_at_time[key])
-                    
-                    # Link count to sum of playing variables
-                    if playing_vars:
-                        schedule.model.Add(team_time_counts[t_idx, time_idx] == sum(playing_vars))
-                    else:
-                        # No games possible at this time for this team
-                        schedule.model.Add(team_time_counts[t_idx, time_idx] == 0)
+                    team_time_counts[t_idx, time_idx] = schedule.count('playing', t_idx, time=time_idx)
             
             # Create absolute deviation variables for each team-time combination
             # For each team-time: |actual_plays - target_plays|
@@ -93,7 +70,9 @@ class TimeVarietyOptimization(SchedulerComponent):
                     
                     # Since OR-Tools works with integers, multiply target by 100 for precision
                     target_times_100 = int(target * 100)
-                    max_deviation_times_100 = max_possible_games * 100
+                    # The count ranges over 0..max_count, so the deviation is furthest at one end
+                    max_count = team_time_counts[t_idx, time_idx].Proto().domain[-1]
+                    max_deviation_times_100 = max(target_times_100, max_count * 100 - target_times_100)
                     
                     # Create variable for the absolute deviation (scaled by 100)
                     abs_dev_var_name = f'abs_dev_team_{t_idx}_time_{time_idx}'
@@ -115,17 +94,8 @@ class TimeVarietyOptimization(SchedulerComponent):
                     schedule.model.Add(absolute_deviations[t_idx, time_idx] >= signed_deviation)
                     schedule.model.Add(absolute_deviations[t_idx, time_idx] >= -signed_deviation)
             
-            # Calculate total absolute deviation across all teams and time slots
-            total_absolute_deviation = sum(absolute_deviations[t_idx, time_idx] 
-                                         for t_idx in schedule.teams 
-                                         for time_idx in time_idxs)
-            
-            # Store the optimization terms in the shared list
-            if not hasattr(schedule, 'things_to_minimize'):
-                schedule.things_to_minimize = []
-            
-            # Add the time variety terms with their weight
-            schedule.things_to_minimize.extend([d * self.weight for d in absolute_deviations.values()])
+            # Register the time variety terms with their weight (deviations are in hundredths of a game)
+            schedule.objective.add(self.__class__.__name__, absolute_deviations.values(), self.weight)
         
         return ModelActor(optimize_time_variety)
 
@@ -35,9 +35,14 @@ class TotalPlayConstraint(SchedulerComponent):
                 schedule: The schedule model to add the constraint to
             """
             total_games = schedule.facilities.games_per_season
+            # A partial horizon (rolling horizon window) only needs its share of the season
+            min_games, max_games = schedule.facilities.season_range(total_games)
             for team in schedule.teams:
-                games_played = sum(schedule.is_playing[m, team] for m in schedule.matches)
-                schedule.model.Add(games_played == total_games)
+                games_played = schedule.count('playing', team)
+                if min_games == max_games:
+                    schedule.model.Add(games_played == total_games)
+                else:
+                    schedule.model.AddLinearConstraint(games_played, min_games, max_games)
         return ModelActor(enforce_total_play)
 
     def _get_total_play_validator(self):
@@ -1,5 +1,6 @@
 from ..schedule_component import SchedulerComponent, ModelActor, DebugReporter
 from ..schedule import Schedule
+import itertools
 import math
 
 
@@ -33,58 +34,22 @@ class VsPlayBalanceConstraint(SchedulerComponent):
             """
             games_per_season = schedule.facilities.games_per_season
 
-            # For each team pair, determine min/max games
-            for t1 in schedule.teams:
-                for t2 in schedule.teams:
-                    if t1 >= t2:  # Only process each pair once
-                        continue
-                    
-                    t1_div = schedule.team_div[t1]
-                    t2_div = schedule.team_div[t2]
-                    
-                    if t1_div != t2_div:
-                        # Different divisions - should not play each other
-                        min_games = 0
-                        max_games = 0
-                    else:
-                        # Same division - calculate min/max based on division size
-                        teams_in_division = schedule.facilities.team_counts[t1_div]
-                        min_games = games_per_season // teams_in_division
-                        max_games = math.ceil(games_per_season / teams_in_division)
-                    
-                    # Create boolean flags for when these teams play each other
-                    vs_match_flags = []
-                    
-                    for m in schedule.matches:
-                        # Create variables for both possible matchups (t1 vs t2, t2 vs t1)
-                        both_1 = schedule.model.NewBoolVar(f"vs_{t1}_home_{t2}_away_in_{m}")
-                        schedule.model.AddBoolAnd([
-                            schedule.is_home[m, t1], 
-                            schedule.is_away[m, t2]
-                        ]).OnlyEnforceIf(both_1)
-                        schedule.model.AddBoolOr([
-                            schedule.is_home[m, t1].Not(), 
-                            schedule.is_away[m, t2].Not()
-                        ]).OnlyEnforceIf(both_1.Not())
-
-                        both_2 = schedule.model.NewBoolVar(f"vs_{t2}_home_{t1}_away_in_{m}")
-                        schedule.model.AddBoolAnd([
-                            schedule.is_home[m, t2], 
-                            schedule.is_away[m, t1]
-                        ]).OnlyEnforceIf(both_2)
-                        schedule.model.AddBoolOr([
-                            schedule.is_home[m, t2].Not(), 
-                            schedule.is_away[m, t1].Not()
-                        ]).OnlyEnforceIf(both_2.Not())
+            # Different divisions - should not play each other
+            schedule.forbid_cross_division_play()
 
-                        either = schedule.model.NewBoolVar(f"vs_match_{t1}_{t2}_{m}")
-                        schedule.model.AddBoolOr([both_1, both_2]).OnlyEnforceIf(either)
-                        schedule.model.AddBoolAnd([both_1.Not(), both_2.Not()]).OnlyEnforceIf(either.Not())
+            # Same division - calculate min/max based on division size
+            for div_idx, div_teams in enumerate(schedule.division_teams):
+                teams_in_division = schedule.facilities.team_counts[div_idx]
+                if teams_in_division < 2:
+                    continue
+                min_games = games_per_season // teams_in_division
+                max_games = math.ceil(games_per_season / teams_in_division)
+                if schedule.facilities.season_fraction < 1:
+                    # A partial horizon may not have reached the pair's minimum yet
+                    min_games = 0
 
-                        vs_match_flags.append(either)
-                    
-                    # Add min/max constraints
-                    total_vs_games = sum(vs_match_flags)
+                for t1, t2 in itertools.combinations(div_teams, 2):
+                    total_vs_games = schedule.get_pair_count(t1, t2)
                     schedule.model.Add(total_vs_games >= min_games)
                     schedule.model.Add(total_vs_games <= max_games)
         
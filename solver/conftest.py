@@ -0,0 +1,37 @@
+import datetime
+import itertools
+import pytest
+from solver.facilities.facility import Facilities
+
+FIRST_DATE = datetime.date(2025, 6, 22)
+
+
+@pytest.fixture
+def small_facilities(tmp_path):
+    """Factory for tiny Facilities written as YAML config files to tmp_path.
+
+    Defaults to one division of 4 teams playing 3 games each, with two courts at
+    13:00 and one at 14:00 on two weekly dates, which holds exactly the season's 6 matches.
+
+    Returns:
+        Function taking team_counts, games_per_season, games_per_day, time_slots
+        (time -> court flags) and num_dates, and returning the loaded Facilities
+    """
+    file_idxs = itertools.count()
+
+    def load(team_counts=(4,), games_per_season=3, games_per_day=1, time_slots=None, num_dates=2):
+        time_slots = time_slots if time_slots is not None else {'13:00': [1, 1], '14:00': [1, 0]}
+        dates = [FIRST_DATE + datetime.timedelta(weeks=week) for week in range(num_dates)]
+        lines = [f"team_counts: {list(team_counts)}",
+                 f"games_per_season: {games_per_season}",
+                 f"games_per_day: {games_per_day}",
+                 "time_slots:"]
+        for time, courts in time_slots.items():
+            lines += [f'  - time: "{time}"', f"    courts: {list(courts)}"]
+        lines.append("dates:")
+        lines += [f'  - "{date.month}/{date.day}/{date.year}"' for date in dates]
+        config_path = tmp_path / f"facilities_{next(file_idxs)}.yaml"
+        config_path.write_text("\n".join(lines) + "\n")
+        return Facilities.from_yaml(str(config_path))
+
+    return load
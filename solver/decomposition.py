@@ -0,0 +1,307 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import dataclasses
+import os
+from ortools.sat.python import cp_model
+from .facilities.facility import Facilities, Match
+from .schedule import Schedule, INTVAR_ENCODING
+from .schedule_creator import ScheduleCreator
+from .solver_profiles import SolverProfile, get_solver_profile
+from .warm_start import solve_with_fixed_assignment
+from .portfolio import ComponentFactory
+from .schedule_component import SchedulerComponent
+from .components.one_thing_at_a_time import OneThingAtATimeConstraint
+from .components.no_three_hours_days import NoThreeHoursDays
+from .components.balance_reffing import BalanceReffingConstraint
+from .components.play_near_ref import PlayNearRefConstraint
+from .components.ref_same_division import RefSameDivisionConstraint
+from .components.vs_play_balance import VsPlayBalanceConstraint
+
+# (weekend_idx, time_idx, div_idx) -> number of matches the division plays in that slot
+SlotAllocation = Dict[Tuple[int, int, int], int]
+
+
+def check_decomposable(components: Iterable[SchedulerComponent]):
+    """Check that the components keep every team's play and refs within its division.
+
+    Only then are the divisions independent once their slots are allocated.
+
+    Args:
+        components: The components the schedule will be built with
+
+    Raises:
+        ValueError: If VsPlayBalanceConstraint or RefSameDivisionConstraint is missing
+    """
+    present = {type(component) for component in components}
+    missing = [required.__name__ for required in (VsPlayBalanceConstraint, RefSameDivisionConstraint)
+               if required not in present]
+    if missing:
+        raise ValueError(f"Divisions can only be scheduled separately when teams play and ref within their "
+                         f"division; missing {', '.join(missing)}")
+
+
+def allocate_division_slots(facilities: Facilities, components: Iterable[SchedulerComponent],
+                            forbidden: Optional[Dict[int, List[Dict[Tuple[int, int], int]]]] = None,
+                            time_limit: float = 30.0, weekend_spread: Optional[int] = 1) -> SlotAllocation:
+    """Decide how many matches of each (weekend, time) slot each division plays.
+
+    A small master model over slot counts only. Courts within a slot are
+    interchangeable (RecInLowCourtsProcessor orders them by division afterwards).
+    Every match is played, and a division plays team_count * games_per_season / 2
+    matches. The other limits follow from the components, each only when they
+    are present; as the ref of a match is from its division
+    (RefSameDivisionConstraint, required by check_decomposable), a match takes
+    three of the division's teams:
+
+    - At most team_count // 3 matches per slot (OneThingAtATimeConstraint)
+    - At most max_hours * team_count // 3 matches per weekend (NoThreeHoursDays
+      with OneThingAtATimeConstraint), team_count * max_weekend_games // 2 and
+      team_count, one ref each (BalanceReffingConstraint)
+    - With max_hours == 2, each team is busy in one slot or two consecutive
+      slots a weekend, so the 3 busy teams per match must fit in team_count
+      such windows, and with PlayNearRefConstraint every ref plays in an
+      adjacent slot: each slot's refs are drawn from the two-slot windows
+      reaching the slot before or after it, and no slot supplies more refs than
+      it has players
+
+    Every division plays at least one match each weekend, so each division's
+    Facilities keeps all of the season's weekends and its weekend-based season
+    targets (such as BalanceReffingConstraint's refs per team) match the merged
+    season's. As a heuristic the division is also kept within weekend_spread
+    matches of its even spread over the weekends, and spread over the time slots
+    in proportion to its size.
+
+    Args:
+        facilities: The season facilities
+        components: The components the division schedules will be built with
+        forbidden: Per division, slot count allocations whose division solve failed
+        time_limit: Solver time limit in seconds
+        weekend_spread: Most matches a division's weekend may be off its even
+            spread, or None for no limit
+
+    Returns:
+        SlotAllocation: Matches per (weekend, time, division)
+
+    Raises:
+        ValueError: If the components are not decomposable (check_decomposable), a
+            division's games do not split into whole matches, or no allocation exists
+    """
+    components = list(components)
+    check_decomposable(components)
+    one_thing = any(isinstance(component, OneThingAtATimeConstraint) for component in components)
+    play_near_ref = any(isinstance(component, PlayNearRefConstraint) for component in components)
+    no_three_hours = next((component for component in components if isinstance(component, NoThreeHoursDays)), None)
+    balance_reffing = next((component for component in components
+                            if isinstance(component, BalanceReffingConstraint)), None)
+    busy_windows = one_thing and no_three_hours is not None and no_three_hours.max_hours == 2
+
+    model = cp_model.CpModel()
+    slots = sorted(facilities.matches_by_weekend_time)
+    capacity = {slot: len(facilities.matches_by_weekend_time[slot]) for slot in slots}
+    total_matches = len(facilities.matches)
+    counts = {}
+    deviations = []
+    for div_idx, team_count in enumerate(facilities.team_counts):
+        if team_count * facilities.games_per_season % 2:
+            raise ValueError(f"Division {div_idx} has {team_count} teams playing {facilities.games_per_season} "
+                             f"games each, which is not a whole number of matches")
+        for slot in slots:
+            slot_max = min(capacity[slot], team_count // 3) if one_thing else capacity[slot]
+            counts[slot + (div_idx,)] = model.NewIntVar(0, slot_max, f"slots_{slot[0]}_{slot[1]}_{div_idx}")
+        division_matches = team_count * facilities.games_per_season // 2
+        model.Add(sum(counts[w_idx, ti_idx, div_idx] for (w_idx, ti_idx) in slots) == division_matches)
+
+        num_weekends = len(facilities.weekend_idxs)
+        # A division without matches in a weekend would lose it from its Facilities, and with it
+        # the full-season weekend count its season targets (e.g. refs per team) are taken from
+        weekend_min, weekend_max = 1, division_matches
+        if one_thing and no_three_hours is not None:
+            weekend_max = min(weekend_max, no_three_hours.max_hours * team_count // 3)
+        if balance_reffing is not None:
+            weekend_max = min(weekend_max, team_count * balance_reffing.max_weekend_games // 2, team_count)
+        if weekend_spread is not None:
+            weekend_min = max(weekend_min, division_matches // num_weekends - weekend_spread)
+            weekend_max = min(weekend_max, -(-division_matches // num_weekends) + weekend_spread)
+        for w_idx in facilities.weekend_idxs:
+            weekend_counts = [counts[w_idx, ti_idx, div_idx] for (w, ti_idx) in slots if w == w_idx]
+            model.AddLinearConstraint(sum(weekend_counts), weekend_min, weekend_max)
+            if not busy_windows:
+                continue
+            # single[t]: teams busy only at slot t; pair[t]: teams busy at slots t and t + 1
+            weekend_times = [ti_idx for (w, ti_idx) in slots if w == w_idx]
+            single = {ti_idx: model.NewIntVar(0, team_count, f"single_{w_idx}_{ti_idx}_{div_idx}")
+                      for ti_idx in weekend_times}
+            pair = {ti_idx: model.NewIntVar(0, team_count, f"pair_{w_idx}_{ti_idx}_{div_idx}")
+                    for ti_idx in weekend_times if ti_idx + 1 in single}
+            model.Add(sum(single.values()) + sum(pair.values()) <= team_count)
+            for ti_idx in weekend_times:
+                model.Add(3 * counts[w_idx, ti_idx, div_idx] ==
+                          single[ti_idx] + pair.get(ti_idx, 0) + pair.get(ti_idx - 1, 0))
+            if not play_near_ref:
+                continue
+
+            # refs_from[t, offset]: refs of slot t who play in slot t + offset
+            refs_from = {}
+            for ti_idx in weekend_times:
+                for offset in (-1, 1):
+                    if (w_idx, ti_idx + offset) in capacity:
+                        refs_from[ti_idx, offset] = model.NewIntVar(0, team_count // 3,
+                                                                    f"refs_{w_idx}_{ti_idx}_{offset}_{div_idx}")
+                        model.Add(refs_from[ti_idx, offset] <= pair[min(ti_idx, ti_idx + offset)])
+                model.Add(counts[w_idx, ti_idx, div_idx] ==
+                          sum(refs_from.get((ti_idx, offset), 0) for offset in (-1, 1)))
+            for ti_idx in weekend_times:
+                supplied = sum(refs_from.get((ti_idx - offset, offset), 0) for offset in (-1, 1))
+                model.Add(supplied <= 2 * counts[w_idx, ti_idx, div_idx])
+
+        # |total_matches * division slots at a time - division_matches * slots at that time|
+        for ti_idx in facilities.time_idxs:
+            time_slots = [(w, t) for (w, t) in slots if t == ti_idx]
+            time_capacity = sum(capacity[slot] for slot in time_slots)
+            deviation = model.NewIntVar(0, total_matches * time_capacity, f"time_share_dev_{ti_idx}_{div_idx}")
+            signed = total_matches * sum(counts[w, t, div_idx] for (w, t) in time_slots) - division_matches * time_capacity
+            model.Add(deviation >= signed)
+            model.Add(deviation >= -signed)
+            deviations.append(deviation)
+
+        for failed in (forbidden or {}).get(div_idx, []):
+            model.AddForbiddenAssignments([counts[w, t, div_idx] for (w, t) in slots],
+                                          [tuple(failed.get(slot, 0) for slot in slots)])
+
+    for slot in slots:
+        model.Add(sum(counts[slot + (div_idx,)] for div_idx in range(len(facilities.team_counts))) == capacity[slot])
+    model.Minimize(sum(deviations))
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit
+    status = solver.Solve(model)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        raise ValueError(f"No division slot allocation exists ({solver.StatusName(status)})")
+    return {key: solver.Value(var) for key, var in counts.items()}
+
+
+def division_facilities(facilities: Facilities, allocation: SlotAllocation) -> List[Facilities]:
+    """Split the season facilities into one single-division Facilities per division.
+
+    Within a slot, lower divisions get the lower courts. Matches keep their
+    weekend and time indexes, so assignments map straight back to the season.
+
+    Args:
+        facilities: The season facilities
+        allocation: Slot counts from allocate_division_slots
+
+    Returns:
+        List of Facilities, one per division
+    """
+    num_divisions = len(facilities.team_counts)
+    division_matches: List[List[Match]] = [[] for _ in range(num_divisions)]
+    for (w_idx, ti_idx), slot_matches in facilities.matches_by_weekend_time.items():
+        courts = iter(sorted(slot_matches, key=lambda m: m.location))
+        for div_idx in range(num_divisions):
+            division_matches[div_idx].extend(next(courts) for _ in range(allocation[w_idx, ti_idx, div_idx]))
+
+    split = []
+    for div_idx, matches in enumerate(division_matches):
+        matches.sort(key=facilities.match_positions.__getitem__)
+        match_dates = {m.date for m in matches}
+        split.append(Facilities(team_counts=[facilities.team_counts[div_idx]],
+                                games_per_season=facilities.games_per_season,
+                                games_per_day=facilities.games_per_day, times=facilities.times,
+                                dates=[d for d in facilities.dates if d in match_dates],
+                                locations=facilities.locations, matches=matches))
+    return split
+
+
+def _solve_division(div_idx: int, facilities: Facilities, component_factory: ComponentFactory,
+                    profile: SolverProfile, encoding: str) -> Tuple[int, str, Optional[Tuple[Tuple[int, int, int], ...]]]:
+    """Solve one division's schedule in a worker process."""
+    creator = ScheduleCreator(facilities, components=component_factory(), encoding=encoding,
+                              solver_profile=profile)
+    schedule = creator.build_schedule()
+    schedule.solve(profile)
+    status = schedule.solver.StatusName(schedule._last_solve_status)
+    if status not in ('OPTIMAL', 'FEASIBLE'):
+        return div_idx, status, None
+    return div_idx, status, tuple(schedule.get_assignment()[match] for match in schedule.matches)
+
+
+def solve_by_division(facilities: Facilities, component_factory: ComponentFactory,
+                      solver_profile: Union[str, SolverProfile, None] = None,
+                      encoding: str = INTVAR_ENCODING, division_aware: bool = False,
+                      max_parallel: Optional[int] = None,
+                      max_allocations: int = 5) -> Tuple[Schedule, ScheduleCreator]:
+    """Solve a season by allocating slots to divisions, then solving each division separately.
+
+    Teams never play or ref across divisions with VsPlayBalanceConstraint and
+    RefSameDivisionConstraint, so after allocate_division_slots fixes each division's share of every slot,
+    the divisions are independent single-division problems, solved in parallel
+    processes. If a division has no solution, its allocation is forbidden and
+    the master model re-run. The division assignments are then merged into one
+    season Schedule, solved with those assignments fixed so every component's
+    variables, objective and validators apply as usual.
+
+    Args:
+        facilities: The season facilities
+        component_factory: Module-level function returning the components, called per division
+        solver_profile: Solver profile or preset name for the division solves
+        encoding: Core model encoding ('intvar' or 'boolean')
+        division_aware: Division-aware setting for the merged season schedule, whose
+            matches are then limited to their allocated division
+        max_parallel: Maximum concurrent division solves. Defaults to the core count.
+        max_allocations: How many slot allocations to try before giving up
+
+    Returns:
+        Tuple[Schedule, ScheduleCreator]: The merged, validated season schedule and its creator
+
+    Raises:
+        ValueError: If the components are not decomposable, no allocation gives every
+            division a solution, or the merged assignment does not solve as a full season
+    """
+    profile = get_solver_profile(solver_profile)
+    num_divisions = len(facilities.team_counts)
+    cpu_count = os.cpu_count() or 1
+    max_parallel = min(max_parallel or cpu_count, num_divisions)
+    division_profile = dataclasses.replace(profile, num_workers=max(1, cpu_count // max_parallel))
+    team_offsets = [sum(facilities.team_counts[:div_idx]) for div_idx in range(num_divisions)]
+
+    components = component_factory()
+    forbidden: Dict[int, List[Dict[Tuple[int, int], int]]] = {}
+    for attempt in range(max_allocations):
+        allocation = allocate_division_slots(facilities, components, forbidden)
+        split = division_facilities(facilities, allocation)
+        print(f"Division allocation {attempt + 1}: solving {num_divisions} divisions, {max_parallel} at a time")
+        with ProcessPoolExecutor(max_workers=max_parallel) as executor:
+            results = list(executor.map(_solve_division, range(num_divisions), split,
+                                        [component_factory] * num_divisions, [division_profile] * num_divisions,
+                                        [encoding] * num_divisions))
+
+        failed = [div_idx for div_idx, status, assignment in results if assignment is None]
+        for div_idx, status, _ in results:
+            print(f"  Division {div_idx}: {status}")
+        if not failed:
+            break
+        for div_idx in failed:
+            forbidden.setdefault(div_idx, []).append({(w, t): count for (w, t, d), count in allocation.items()
+                                                      if d == div_idx})
+    else:
+        raise ValueError(f"No division slot allocation gave every division a solution in {max_allocations} attempts")
+
+    assignment = {}
+    for div_idx, _, division_assignment in results:
+        offset = team_offsets[div_idx]
+        for match, teams in zip(split[div_idx].matches, division_assignment):
+            assignment[match] = tuple(t_idx + offset for t_idx in teams)
+
+    if division_aware:
+        # Every match's division is decided, so it only needs that division's role literals
+        facilities = facilities.with_match_divisions({match: (div_idx,) for div_idx, division in enumerate(split)
+                                                      for match in division.matches})
+    creator = ScheduleCreator(facilities, components=components, encoding=encoding,
+                              division_aware=division_aware, solver_profile=profile)
+    schedule = creator.build_schedule()
+    status = solve_with_fixed_assignment(schedule, assignment, profile)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        raise ValueError(f"The merged division schedules do not solve as a full season "
+                         f"({schedule.solver.StatusName(status)})")
+    creator.finalize_schedule(schedule)
+    return schedule, creator
@@ -0,0 +1,61 @@
+import pytest
+from ortools.sat.python import cp_model
+from solver import decomposition
+from solver.decomposition import allocate_division_slots, solve_by_division
+from solver.components.total_play import TotalPlayConstraint
+from solver.components.one_thing_at_a_time import OneThingAtATimeConstraint
+from solver.components.vs_play_balance import VsPlayBalanceConstraint
+from solver.components.ref_same_division import RefSameDivisionConstraint
+from solver.components.time_variety_optimization import TimeVarietyOptimization
+
+
+def make_components():
+    return [TotalPlayConstraint(), OneThingAtATimeConstraint(), VsPlayBalanceConstraint(),
+            RefSameDivisionConstraint(), TimeVarietyOptimization()]
+
+
+@pytest.mark.parametrize('division_aware', [False, True])
+def test_merged_division_schedules_form_a_valid_season(small_facilities, division_aware):
+    facilities = small_facilities(team_counts=[3, 3], games_per_season=2, games_per_day=2)
+
+    schedule, _ = solve_by_division(facilities, make_components, solver_profile='ci-smoke',
+                                    division_aware=division_aware, max_parallel=1)
+
+    assignment = schedule.get_assignment()
+    assert set(assignment) == set(facilities.matches)
+    games = {t_idx: 0 for t_idx in schedule.teams}
+    for home, away, ref in assignment.values():
+        assert len({home, away, ref}) == 3
+        assert schedule.team_div[home] == schedule.team_div[away] == schedule.team_div[ref]
+        games[home] += 1
+        games[away] += 1
+    assert set(games.values()) == {facilities.games_per_season}
+    for match in facilities.matches:
+        busy = [t_idx for other in facilities.matches_by_weekend_time[match.weekend_idx, match.time_idx]
+                for t_idx in assignment[other]]
+        assert len(busy) == len(set(busy))
+
+
+def test_every_division_plays_every_weekend(small_facilities):
+    facilities = small_facilities(team_counts=[3, 3], games_per_season=2, games_per_day=2,
+                                  time_slots={'13:00': [1, 1]}, num_dates=3)
+
+    allocation = allocate_division_slots(facilities, [TotalPlayConstraint(), VsPlayBalanceConstraint(),
+                                                      RefSameDivisionConstraint()])
+
+    for div_idx in range(len(facilities.team_counts)):
+        for w_idx in facilities.weekend_idxs:
+            assert sum(count for (w, _, d), count in allocation.items() if (w, d) == (w_idx, div_idx)) >= 1
+
+
+def test_unsolved_merge_raises(small_facilities, monkeypatch):
+    facilities = small_facilities(team_counts=[3, 3], games_per_season=2, games_per_day=2)
+    solve_fixed = decomposition.solve_with_fixed_assignment
+
+    def solve_infeasible(schedule, assignment, profile):
+        solve_fixed(schedule, assignment, profile)
+        return cp_model.INFEASIBLE
+
+    monkeypatch.setattr(decomposition, 'solve_with_fixed_assignment', solve_infeasible)
+    with pytest.raises(ValueError, match='INFEASIBLE'):
+        solve_by_division(facilities, make_components, solver_profile='ci-smoke', max_parallel=1)
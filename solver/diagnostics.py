@@ -0,0 +1,276 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Union, TYPE_CHECKING
+import itertools
+import pandas as pd
+from ortools.sat.python import cp_model
+from .facilities.facility import Match
+from .schedule import Schedule
+from .solver_profiles import SolverProfile, get_solver_profile
+
+if TYPE_CHECKING:
+    from .schedule_creator import ScheduleCreator
+
+# Constraint types CP-SAT accepts enforcement literals on; at_most_one and
+# exactly_one are rewritten as linear constraints to be guarded too
+GUARDABLE_CONSTRAINTS = ('bool_or', 'bool_and', 'linear')
+
+
+@dataclass(frozen=True)
+class GuardScope:
+    """What a guard literal switches on: one component's constraints, narrowed where possible.
+
+    Attributes:
+        component: Component class name
+        weekend_idx: The single weekend the constraints touch, or None for several/none
+        team_idx: The single team the constraints touch, or None for several/none
+    """
+    component: str
+    weekend_idx: Optional[int] = None
+    team_idx: Optional[int] = None
+
+    def __str__(self) -> str:
+        parts = [self.component]
+        if self.weekend_idx is not None:
+            parts.append(f"weekend {self.weekend_idx}")
+        if self.team_idx is not None:
+            parts.append(f"team {self.team_idx}")
+        return ", ".join(parts)
+
+
+@dataclass
+class InfeasibilityReport:
+    """Result of diagnose_infeasibility.
+
+    Attributes:
+        status: Solver status name of the guarded solve ('INFEASIBLE' when a core was found)
+        core: Guard scopes that are infeasible together; empty with status
+            'INFEASIBLE' means the core model (or unguarded constraints) alone is infeasible
+        constraint_counts: Number of guarded constraints per scope in the core
+        unguarded: Constraints per component that could not be guarded and are always on
+    """
+    status: str
+    core: List[GuardScope] = field(default_factory=list)
+    constraint_counts: Dict[GuardScope, int] = field(default_factory=dict)
+    unguarded: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def components(self) -> List[str]:
+        """Component class names in the core."""
+        return sorted({scope.component for scope in self.core})
+
+    def get_report(self) -> pd.DataFrame:
+        """Get the core as a DataFrame.
+
+        Returns:
+            pd.DataFrame: One row per core scope with component, weekend_idx, team_idx and constraints
+        """
+        return pd.DataFrame(
+            [{'component': scope.component, 'weekend_idx': scope.weekend_idx, 'team_idx': scope.team_idx,
+              'constraints': self.constraint_counts.get(scope, 0)} for scope in self.core],
+            columns=['component', 'weekend_idx', 'team_idx', 'constraints']).astype(
+            {'weekend_idx': 'Int64', 'team_idx': 'Int64'})
+
+    def __str__(self) -> str:
+        if self.status != 'INFEASIBLE':
+            return f"No infeasibility core (status {self.status})"
+        if not self.core:
+            return "Infeasible without any component constraints: check the facilities (team_counts, time slots, dates)"
+        lines = [f"Infeasible together ({len(self.core)} scopes, components: {', '.join(self.components)}):"]
+        lines.extend(f"  - {scope} ({self.constraint_counts.get(scope, 0)} constraints)" for scope in self.core)
+        if self.unguarded:
+            lines.append("Always on (not guardable): " + ", ".join(
+                f"{name} ({count})" for name, count in sorted(self.unguarded.items())))
+        return "\n".join(lines)
+
+
+class _VariableScopes:
+    """Map core variable proto indexes to the (weekend, team) they belong to, None where unknown.
+
+    Variable dictionaries only grow while components are added, so update()
+    reads just the entries added since the last call, and nothing at all when
+    the proto has no new variables.
+    """
+
+    def __init__(self, schedule: Schedule):
+        self._schedule = schedule
+        self.scopes: Dict[int, Tuple[Optional[int], Optional[int]]] = {}
+        self._seen = {name: 0 for name in Schedule.VAR_DICT_NAMES}
+        self._num_variables = -1
+        self.update()
+
+    def update(self):
+        """Scope the variables added to the model since the last update."""
+        num_variables = len(self._schedule.model.Proto().variables)
+        if num_variables == self._num_variables:
+            return
+        self._num_variables = num_variables
+        for name, seen in self._seen.items():
+            variables = getattr(self._schedule, name)
+            if len(variables) == seen:
+                continue
+            for key, var in itertools.islice(variables.items(), seen, None):
+                self._add(name, key, var.Index())
+            self._seen[name] = len(variables)
+
+    def _add(self, name: str, key, index: int):
+        weekend_idx, team_idx = None, None
+        if name == 'counts':
+            # (role, team, weekend, time)
+            weekend_idx, team_idx = key[2], key[1]
+        elif isinstance(key, Match):
+            weekend_idx = key.weekend_idx
+        elif isinstance(key, tuple) and isinstance(key[0], Match):
+            weekend_idx = key[0].weekend_idx
+            team_idx = key[1] if name not in ('in_division', 'pair_in_match') else None
+        elif isinstance(key, tuple):
+            weekend_idx, team_idx = key[0], key[-1]
+        # Shared variables (e.g. cached constants) keep only what all their keys agree on
+        previous = self.scopes.setdefault(index, (weekend_idx, team_idx))
+        self.scopes[index] = (weekend_idx if previous[0] == weekend_idx else None,
+                              team_idx if previous[1] == team_idx else None)
+
+
+def _constraint_scope(constraint, component: str,
+                      var_scopes: Dict[int, Tuple[Optional[int], Optional[int]]]) -> GuardScope:
+    """Narrow a component's constraint to the single weekend and team its core variables share."""
+    kind = constraint.WhichOneof('constraint')
+    refs = list(constraint.enforcement_literal)
+    refs.extend(constraint.linear.vars if kind == 'linear' else getattr(constraint, kind).literals)
+    weekends, teams = set(), set()
+    for ref in refs:
+        weekend_idx, team_idx = var_scopes.get(ref if ref >= 0 else -ref - 1, (None, None))
+        weekends.add(weekend_idx)
+        teams.add(team_idx)
+    weekends.discard(None)
+    teams.discard(None)
+    return GuardScope(component,
+                      weekends.pop() if len(weekends) == 1 else None,
+                      teams.pop() if len(teams) == 1 else None)
+
+
+def _as_linear(constraint, kind: str):
+    """Rewrite an at_most_one or exactly_one constraint as the equivalent linear constraint."""
+    literals = list(getattr(constraint, kind).literals)
+    constraint.ClearField(kind)
+    negated = 0
+    for ref in literals:
+        if ref >= 0:
+            constraint.linear.vars.append(ref)
+            constraint.linear.coeffs.append(1)
+        else:
+            # not(x) == 1 - x
+            constraint.linear.vars.append(-ref - 1)
+            constraint.linear.coeffs.append(-1)
+            negated += 1
+    lower = 1 if kind == 'exactly_one' else 0
+    constraint.linear.domain.extend([lower - negated, 1 - negated])
+
+
+def make_guardable(constraint) -> bool:
+    """Prepare a proto constraint for an enforcement literal.
+
+    Args:
+        constraint: A ConstraintProto; at_most_one and exactly_one are rewritten as linear
+
+    Returns:
+        bool: Whether the constraint now accepts an enforcement literal
+    """
+    kind = constraint.WhichOneof('constraint')
+    if kind in ('at_most_one', 'exactly_one'):
+        _as_linear(constraint, kind)
+        kind = 'linear'
+    return kind in GUARDABLE_CONSTRAINTS
+
+
+def build_guarded_schedule(creator: 'ScheduleCreator') -> Tuple[Schedule, Dict[GuardScope, object],
+                                                                  Dict[GuardScope, int], Dict[str, int]]:
+    """Build the creator's core model and component constraints, each guarded by a literal.
+
+    Every constraint a component adds, except those defining shared variables
+    (Schedule.definition_constraints), gets the enforcement literal of its
+    GuardScope: the component, narrowed to a weekend and/or team when all the
+    core variables it uses belong to one. Optimizers are skipped, since only
+    constraints can make a model infeasible, and so are the model cache and
+    warm start.
+
+    Args:
+        creator: The creator to take facilities, components and settings from
+
+    Returns:
+        Tuple of the schedule, guard literal per scope, guarded constraints per
+        scope and unguardable constraints per component
+    """
+    schedule = creator.schedule_class(creator.facilities, cp_model.CpModel(), encoding=creator.encoding,
+                                      division_aware=creator.division_aware)
+    proto = schedule.model.Proto()
+    guards: Dict[GuardScope, object] = {}
+    counts: Dict[GuardScope, int] = {}
+    unguarded: Dict[str, int] = {}
+    var_scopes = _VariableScopes(schedule)
+    for component in creator.components:
+        name = component.__class__.__name__
+        for constraint in component._constraints:
+            first = len(proto.constraints)
+            constraint(schedule)
+            var_scopes.update()
+            for c_idx in range(first, len(proto.constraints)):
+                if c_idx in schedule.definition_constraints:
+                    continue
+                proto_constraint = proto.constraints[c_idx]
+                if not make_guardable(proto_constraint):
+                    unguarded[name] = unguarded.get(name, 0) + 1
+                    continue
+                scope = _constraint_scope(proto_constraint, name, var_scopes.scopes)
+                if scope not in guards:
+                    guards[scope] = schedule.model.NewBoolVar(f"guard_{len(guards)}")
+                proto_constraint.enforcement_literal.append(guards[scope].Index())
+                counts[scope] = counts.get(scope, 0) + 1
+    return schedule, guards, counts, unguarded
+
+
+def diagnose_infeasibility(creator: 'ScheduleCreator', profile: Union[str, SolverProfile, None] = None,
+                           minimize_core: bool = False, check_seconds: float = 10.0) -> InfeasibilityReport:
+    """Find which components (and weekends/teams) make a configuration infeasible.
+
+    Solves the guarded model of build_guarded_schedule with every guard as an
+    assumption. When it is infeasible, CP-SAT's sufficient assumptions give a
+    set of guard scopes that cannot all hold. That set need not be minimal; with
+    minimize_core each scope is dropped in turn and kept out if the rest stays
+    infeasible within check_seconds.
+
+    Args:
+        creator: The creator whose facilities and components to diagnose
+        profile: Solver profile or preset name for the guarded solve. Defaults to 'diagnose'.
+        minimize_core: Whether to shrink the core by deletion
+        check_seconds: Time limit of each deletion check
+
+    Returns:
+        InfeasibilityReport: The core, or an empty report if the model is feasible or undecided
+    """
+    profile = get_solver_profile(profile if profile is not None else 'diagnose')
+    schedule, guards, counts, unguarded = build_guarded_schedule(creator)
+    literal_scopes = {literal.Index(): scope for scope, literal in guards.items()}
+
+    def solve_with(scopes: List[GuardScope], max_time: float) -> Tuple[int, cp_model.CpSolver]:
+        schedule.model.ClearAssumptions()
+        schedule.model.AddAssumptions([guards[scope] for scope in scopes])
+        solver = cp_model.CpSolver()
+        profile.apply(solver)
+        solver.parameters.max_time_in_seconds = max_time
+        return solver.Solve(schedule.model), solver
+
+    status, solver = solve_with(list(guards), profile.max_time_in_seconds)
+    print(f"Infeasibility diagnosis: {solver.StatusName(status)} with {len(guards)} guards "
+          f"in {solver.WallTime():.2f}s")
+    if status != cp_model.INFEASIBLE:
+        return InfeasibilityReport(status=solver.StatusName(status), unguarded=unguarded)
+
+    core = [literal_scopes[index] for index in solver.SufficientAssumptionsForInfeasibility()]
+    if minimize_core:
+        for scope in list(core):
+            rest = [other for other in core if other != scope]
+            if solve_with(rest, check_seconds)[0] == cp_model.INFEASIBLE:
+                core = rest
+        print(f"Infeasibility diagnosis: core minimized to {len(core)} scopes")
+    return InfeasibilityReport(status='INFEASIBLE', core=core,
+                               constraint_counts={scope: counts[scope] for scope in core}, unguarded=unguarded)
@@ -0,0 +1,30 @@
+from solver.schedule_creator import ScheduleCreator
+from solver.components.total_play import TotalPlayConstraint
+from solver.components.one_thing_at_a_time import OneThingAtATimeConstraint
+from solver.components.play_near_ref import PlayNearRefConstraint
+from solver.components.time_variety_optimization import TimeVarietyOptimization
+
+
+def test_diagnosis_returns_the_conflicting_component(small_facilities):
+    # A single time slot, so no ref can play in an adjacent one
+    facilities = small_facilities(games_per_season=2, time_slots={'13:00': [1]}, num_dates=4)
+    creator = ScheduleCreator(facilities, components=[TotalPlayConstraint(), OneThingAtATimeConstraint(),
+                                                      PlayNearRefConstraint()])
+
+    report = creator.diagnose_infeasibility(minimize_core=True)
+
+    assert report.status == 'INFEASIBLE'
+    assert report.components == ['PlayNearRefConstraint']
+    assert len({scope.weekend_idx for scope in report.core}) == 1
+    assert list(report.get_report()['component'].unique()) == ['PlayNearRefConstraint']
+
+
+def test_diagnosis_of_a_feasible_configuration_is_empty(small_facilities):
+    facilities = small_facilities(games_per_season=2, time_slots={'13:00': [1]}, num_dates=4)
+    creator = ScheduleCreator(facilities, components=[TotalPlayConstraint(), OneThingAtATimeConstraint(),
+                                                      TimeVarietyOptimization()])
+
+    report = creator.diagnose_infeasibility()
+
+    assert report.status in ('OPTIMAL', 'FEASIBLE')
+    assert report.core == []
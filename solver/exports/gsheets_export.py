@@ -416,6 +416,28 @@ def save_best_objective_score(objective_score):
         print(f"Warning: Could not save best objective score to scratch tab: {e}")
 
 
+def get_best_schedule_game_report():
+    """Get the structured game report of the best run from the 'schedule' tab.
+    
+    The multi-run scheduler only uploads improved schedules, so this tab holds
+    the game report of the best schedule found so far.
+    
+    Returns:
+        pd.DataFrame: The game report, or None if the tab is missing, empty or unreadable
+    """
+    try:
+        sheet = get_gspread_sheet()
+        sheet.open_sheet('schedule')
+        records = sheet.sheet.get_all_records()
+        if not records:
+            return None
+        return pd.DataFrame(records)
+        
+    except Exception as e:
+        print(f"Warning: Could not read best schedule from schedule tab: {e}")
+        return None
+
+
 if __name__ == '__main__':
     # Test the connection when run directly
     test_sheets_connection() 
\ No newline at end of file
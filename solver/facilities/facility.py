@@ -1,6 +1,9 @@
+import hashlib
 import yaml
 from dataclasses import dataclass
-from typing import List, Dict, NamedTuple, Set
+from types import MappingProxyType
+from typing import List, Dict, NamedTuple, Set, Tuple, Mapping, Iterable, Optional
+import math
 import pandas as pd
 from datetime import datetime, time
 
@@ -60,10 +63,114 @@ class Facilities:
         self._dates = dates
         self._locations = locations
         self.matches = matches
+        # The full season when these facilities are a partial horizon of it, see for_weekends
+        self._full_season: Optional['Facilities'] = None
+        # Committed (home, away, ref) of earlier weekends a partial horizon builds on, see for_weekends
+        self.carry_over: Dict[Match, Tuple[int, int, int]] = {}
+        # Divisions a match may be played in when not every division, see with_match_divisions
+        self._match_divisions: Dict[Match, Tuple[int, ...]] = {}
         
         # Create time index mapping for maintaining original order
         self.time_idx = {t: idx for idx, t in enumerate(times)}
 
+    def __getstate__(self):
+        """Drop the read-only match indexes, which cannot be pickled."""
+        state = self.__dict__.copy()
+        for key in ('_weekend_idxs', '_time_idxs', '_matches_by_weekend', '_matches_by_time',
+                    '_matches_by_weekend_time', '_matches_by_date', '_matches_by_court', '_match_positions'):
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state):
+        """Restore state and rebuild the match indexes."""
+        self.__dict__.update(state)
+        self._build_match_indexes()
+
+    @property
+    def matches(self) -> List[Match]:
+        """Get the list of all game slots."""
+        return self._matches
+
+    @matches.setter
+    def matches(self, value: List[Match]):
+        """Set the list of game slots and rebuild the match indexes."""
+        self._matches = value
+        self._build_match_indexes()
+
+    def _build_match_indexes(self):
+        """Precompute immutable lookups of matches by weekend, time, date and court.
+
+        Model construction and components look matches up by these keys inside
+        weekend x time x team loops, so they are built once here instead of
+        rescanning the full match list on every lookup.
+        """
+        by_weekend: Dict[int, List[Match]] = {}
+        by_time: Dict[int, List[Match]] = {}
+        by_weekend_time: Dict[Tuple[int, int], List[Match]] = {}
+        by_date: Dict[str, List[Match]] = {}
+        by_court: Dict[int, List[Match]] = {}
+        for match in self._matches:
+            by_weekend.setdefault(match.weekend_idx, []).append(match)
+            by_time.setdefault(match.time_idx, []).append(match)
+            by_weekend_time.setdefault((match.weekend_idx, match.time_idx), []).append(match)
+            by_date.setdefault(match.date, []).append(match)
+            by_court.setdefault(match.location, []).append(match)
+
+        def freeze(index):
+            return MappingProxyType({key: tuple(index[key]) for key in sorted(index)})
+
+        self._weekend_idxs = tuple(sorted(by_weekend))
+        self._time_idxs = tuple(sorted(by_time))
+        self._matches_by_weekend = freeze(by_weekend)
+        self._matches_by_time = freeze(by_time)
+        self._matches_by_weekend_time = freeze(by_weekend_time)
+        self._matches_by_date = MappingProxyType({key: tuple(value) for key, value in by_date.items()})
+        self._matches_by_court = freeze(by_court)
+        self._match_positions = MappingProxyType({match: position for position, match in enumerate(self._matches)})
+
+    @property
+    def weekend_idxs(self) -> Tuple[int, ...]:
+        """Get the sorted weekend indices that have at least one match."""
+        return self._weekend_idxs
+
+    @property
+    def time_idxs(self) -> Tuple[int, ...]:
+        """Get the sorted time indices that have at least one match."""
+        return self._time_idxs
+
+    @property
+    def matches_by_weekend(self) -> Mapping[int, Tuple[Match, ...]]:
+        """Get matches grouped by weekend index."""
+        return self._matches_by_weekend
+
+    @property
+    def matches_by_time(self) -> Mapping[int, Tuple[Match, ...]]:
+        """Get matches grouped by time index across all weekends."""
+        return self._matches_by_time
+
+    @property
+    def matches_by_weekend_time(self) -> Mapping[Tuple[int, int], Tuple[Match, ...]]:
+        """Get matches grouped by (weekend index, time index).
+
+        Slots without any active court have no entry; use ``.get(key, ())``.
+        """
+        return self._matches_by_weekend_time
+
+    @property
+    def matches_by_date(self) -> Mapping[str, Tuple[Match, ...]]:
+        """Get matches grouped by date string, in schedule order."""
+        return self._matches_by_date
+
+    @property
+    def matches_by_court(self) -> Mapping[int, Tuple[Match, ...]]:
+        """Get matches grouped by court (location index)."""
+        return self._matches_by_court
+
+    @property
+    def match_positions(self) -> Mapping[Match, int]:
+        """Get each match's position in matches, e.g. to sort a subset in schedule order."""
+        return self._match_positions
+
     @property
     def times(self) -> List[time]:
         """Get the list of unique times in the schedule."""
@@ -99,6 +206,144 @@ class Facilities:
         """Get the total number of teams across all divisions."""
         return sum(self.team_counts)
 
+    @property
+    def full_season(self) -> 'Facilities':
+        """Get the full season these facilities are a horizon of (themselves unless partial)."""
+        return self._full_season or self
+
+    @property
+    def season_fraction(self) -> float:
+        """Get the share of the full season's matches covered by these facilities and their carry-over."""
+        return (len(self._matches) + len(self.carry_over)) / len(self.full_season.matches)
+
+    def for_weekends(self, weekend_idxs: Iterable[int],
+                     carry_over: Optional[Mapping[Match, Tuple[int, int, int]]] = None) -> 'Facilities':
+        """Get a partial horizon of the season covering only the given weekends.
+
+        Matches keep their weekend and time indexes, so assignments carry over
+        between horizons. A horizon may build on the committed assignment of
+        earlier weekends: their games are not part of the horizon's model, but
+        season counts (Schedule.count, Schedule.get_pair_count) include them as
+        constants. Until the horizon and its carry-over cover the whole season,
+        season-total constraints enforce a prorated range instead of the exact
+        total, see season_range.
+
+        Args:
+            weekend_idxs: Weekend indices to keep
+            carry_over: Optional (home, away, ref) per match of earlier weekends
+
+        Returns:
+            Facilities: The partial horizon
+
+        Raises:
+            ValueError: If a carried-over match is in one of the kept weekends
+        """
+        weekend_idxs = set(weekend_idxs)
+        carry_over = dict(carry_over or {})
+        overlap = sorted({m.weekend_idx for m in carry_over} & weekend_idxs)
+        if overlap:
+            raise ValueError(f"Carried-over matches overlap the horizon's weekends {overlap}")
+        horizon = self._with_matches([m for m in self._matches if m.weekend_idx in weekend_idxs])
+        horizon._full_season = self.full_season
+        horizon.carry_over = carry_over
+        return horizon
+
+    def without_matches(self, removed: Iterable[Match]) -> 'Facilities':
+        """Get these facilities with some matches taken out, e.g. games that can no longer be scheduled.
+
+        The remaining matches keep their weekend and time indexes.
+
+        Args:
+            removed: Matches to take out
+
+        Returns:
+            Facilities: The facilities without the removed matches
+        """
+        removed = set(removed)
+        remaining = self._with_matches([m for m in self._matches if m not in removed])
+        remaining._full_season = self._full_season
+        remaining.carry_over = self.carry_over
+        return remaining
+
+    def with_match_divisions(self, match_divisions: Mapping[Match, Iterable[int]]) -> 'Facilities':
+        """Get these facilities with some matches limited to candidate divisions.
+
+        Division-aware schedules only create role literals for the teams of a
+        match's candidate divisions. Matches not listed may be played in any division.
+
+        Args:
+            match_divisions: Candidate division indices per match
+
+        Returns:
+            Facilities: The facilities with the candidate divisions
+
+        Raises:
+            ValueError: If a match gets no candidate division or an unknown one
+        """
+        restricted = self._with_matches(self._matches)
+        restricted._full_season = self._full_season
+        restricted.carry_over = self.carry_over
+        for match, divisions in match_divisions.items():
+            divisions = tuple(sorted(set(divisions)))
+            if not divisions or not all(0 <= div_idx < len(self.team_counts) for div_idx in divisions):
+                raise ValueError(f"Match {match} needs candidate divisions among 0..{len(self.team_counts) - 1}, "
+                                 f"got {divisions}")
+            restricted._match_divisions[match] = divisions
+        return restricted
+
+    def divisions_for(self, match: Match) -> Tuple[int, ...]:
+        """Get the divisions a match may be played in, see with_match_divisions."""
+        return self._match_divisions.get(match, tuple(range(len(self.team_counts))))
+
+    def _with_matches(self, matches: List[Match]) -> 'Facilities':
+        """Create facilities with the same settings over a subset of the matches."""
+        match_dates = {m.date for m in matches}
+        subset = Facilities(team_counts=self.team_counts, games_per_season=self.games_per_season,
+                            games_per_day=self.games_per_day, times=self._times,
+                            dates=[d for d in self._dates if d in match_dates],
+                            locations=self._locations, matches=matches)
+        kept = set(matches)
+        subset._match_divisions = {m: divisions for m, divisions in self._match_divisions.items() if m in kept}
+        return subset
+
+    def season_range(self, season_total: int, slack: int = 1) -> Tuple[int, int]:
+        """Get the allowed range of a per-team season total on these facilities.
+
+        Args:
+            season_total: The exact total for the full season (e.g. games per team)
+            slack: How far a partial horizon may stray from its prorated share
+
+        Returns:
+            Tuple[int, int]: (season_total, season_total) when these facilities and
+            their carry-over cover the full season, otherwise the prorated share
+            widened by slack and clipped to [0, season_total]
+        """
+        if self.season_fraction == 1:
+            return season_total, season_total
+        share = season_total * self.season_fraction
+        return max(0, math.floor(share) - slack), min(season_total, math.ceil(share) + slack)
+
+    def content_hash(self) -> str:
+        """Get a stable hash of everything that shapes a model built from these facilities.
+
+        Two Facilities with the same team counts, season settings, times, dates,
+        locations, match list (in order), carry-over and match divisions hash the same,
+        however they were loaded.
+
+        Returns:
+            str: Hex SHA-256 digest
+        """
+        content = repr((
+            self.team_counts, self.games_per_season, self.games_per_day,
+            [t.isoformat() for t in self._times], self._dates, self._locations,
+            [(m.weekend_idx, m.date, m.location, m.time.isoformat(), m.time_idx) for m in self._matches],
+            self._full_season.content_hash() if self._full_season is not None else None,
+            sorted((m.weekend_idx, m.date, m.location, m.time_idx, teams) for m, teams in self.carry_over.items()),
+            sorted((m.weekend_idx, m.date, m.location, m.time_idx, divisions)
+                   for m, divisions in self._match_divisions.items()),
+        ))
+        return hashlib.sha256(content.encode()).hexdigest()
+
     def __str__(self) -> str:
         """Return a comprehensive string representation of the facility configuration.
         
@@ -0,0 +1,73 @@
+import pickle
+from pathlib import Path
+
+import pytest
+
+from solver.facilities.facility import Facilities
+
+
+def load_volleyball_facilities():
+    config_path = Path(__file__).parent / "configs" / "volleyball_2025.yaml"
+    return Facilities.from_yaml(str(config_path))
+
+
+def test_match_indexes_partition_matches():
+    facilities = load_volleyball_facilities()
+
+    assert facilities.weekend_idxs == tuple(sorted({m.weekend_idx for m in facilities.matches}))
+    assert facilities.time_idxs == tuple(sorted({m.time_idx for m in facilities.matches}))
+
+    for w_idx in facilities.weekend_idxs:
+        expected = [m for m in facilities.matches if m.weekend_idx == w_idx]
+        assert list(facilities.matches_by_weekend[w_idx]) == expected
+        for t_idx in facilities.time_idxs:
+            expected_slot = [m for m in expected if m.time_idx == t_idx]
+            assert list(facilities.matches_by_weekend_time.get((w_idx, t_idx), ())) == expected_slot
+
+    assert sum(len(ms) for ms in facilities.matches_by_court.values()) == len(facilities.matches)
+    assert sum(len(ms) for ms in facilities.matches_by_date.values()) == len(facilities.matches)
+    assert sum(len(ms) for ms in facilities.matches_by_time.values()) == len(facilities.matches)
+
+
+def test_match_indexes_are_read_only_and_follow_matches():
+    facilities = load_volleyball_facilities()
+
+    with pytest.raises(TypeError):
+        facilities.matches_by_weekend[1] = ()
+
+    first_weekend = facilities.weekend_idxs[0]
+    facilities.matches = list(facilities.matches_by_weekend[first_weekend])
+    assert facilities.weekend_idxs == (first_weekend,)
+
+
+def test_facilities_pickle_round_trip():
+    facilities = load_volleyball_facilities()
+    restored = pickle.loads(pickle.dumps(facilities))
+
+    assert restored.matches == facilities.matches
+    assert restored.matches_by_weekend_time == facilities.matches_by_weekend_time
+
+
+def test_partial_horizon_prorates_season_totals():
+    facilities = load_volleyball_facilities()
+    horizon = facilities.for_weekends(facilities.weekend_idxs[:2])
+
+    assert horizon.weekend_idxs == facilities.weekend_idxs[:2]
+    assert horizon.full_season is facilities
+    assert horizon.season_fraction == pytest.approx(1 / 3)
+    assert facilities.season_range(6) == (6, 6)
+    assert horizon.season_range(6) == (1, 3)
+    assert horizon.content_hash() != facilities.for_weekends(facilities.weekend_idxs).content_hash()
+
+
+def test_partial_horizon_counts_carried_over_weekends():
+    facilities = load_volleyball_facilities()
+    prefix, rest = facilities.weekend_idxs[:2], facilities.weekend_idxs[2:]
+    carry_over = {m: (0, 1, 2) for w_idx in prefix for m in facilities.matches_by_weekend[w_idx]}
+    horizon = facilities.for_weekends(rest, carry_over=carry_over)
+
+    assert horizon.season_fraction == 1
+    assert horizon.season_range(6) == (6, 6)
+    assert horizon.content_hash() != facilities.for_weekends(rest).content_hash()
+    with pytest.raises(ValueError):
+        facilities.for_weekends(facilities.weekend_idxs, carry_over=carry_over)
@@ -0,0 +1,110 @@
+from typing import List, Optional, Sequence, Union
+import dataclasses
+import math
+import time
+import pandas as pd
+from ortools.sat.python import cp_model
+from .schedule import Schedule
+from .solver_profiles import SolverProfile, get_solver_profile
+
+
+def objective_stages(schedule: Schedule, priorities: Optional[Sequence[str]] = None) -> List[str]:
+    """Order a built schedule's objective terms from highest to lowest priority.
+
+    Args:
+        schedule: A built schedule with registered objective terms
+        priorities: Optional term names (component class names), highest priority
+            first. Terms not named follow in default order. By default terms are
+            ordered by weight, so ByeWeekOptimization(weight=10000) comes before
+            TimeVarietyOptimization(weight=1).
+
+    Returns:
+        Term names, highest priority first
+    """
+    coefficients = schedule.objective.get_coefficients()
+    named = [name for name in (priorities or []) if name in coefficients]
+    rest = sorted((name for name in coefficients if name not in named), key=lambda name: -abs(coefficients[name]))
+    return named + rest
+
+
+def _hint_current_solution(schedule: Schedule):
+    """Hint every model variable with its value in the schedule's last solution."""
+    model = schedule.model
+    model.ClearHints()
+    for index in range(len(model.Proto().variables)):
+        var = model.GetIntVarFromProtoIndex(index)
+        model.AddHint(var, schedule.solver.Value(var))
+
+
+def solve_lexicographic(schedule: Schedule, profile: Union[str, SolverProfile, None] = None,
+                        priorities: Optional[Sequence[str]] = None, tolerance: float = 0.0) -> pd.DataFrame:
+    """Solve a built schedule one objective term at a time, highest priority first.
+
+    Each stage minimizes one registered objective term, then bounds it to the
+    stage's result (plus a relative tolerance) before the next stage runs on the
+    same model, hinted with the previous stage's full solution. Each stage gets
+    an equal share of the time that is left. A final solve with every variable
+    fixed to the last stage's solution restores the weighted objective, so the
+    schedule reports and compares like a normally solved one.
+
+    Args:
+        schedule: A built (not yet solved) schedule
+        profile: Solver profile or preset name; its time limit covers all stages.
+            Its objective target is dropped, since it refers to the weighted objective.
+        priorities: Optional term names, highest priority first, see objective_stages
+        tolerance: Relative slack on each stage's result for the later stages (0.01 = 1%)
+
+    Returns:
+        pd.DataFrame: One row per stage with component, status, objective, bound and seconds
+
+    Raises:
+        ValueError: If tolerance is negative, or if the model has an objective
+            but no registered terms to split it into stages
+    """
+    if tolerance < 0:
+        raise ValueError(f"tolerance must be non-negative, got {tolerance}")
+    profile = dataclasses.replace(get_solver_profile(profile), objective_target=None)
+    stages = objective_stages(schedule, priorities)
+    deadline = time.time() + profile.max_time_in_seconds
+    unit = schedule.objective.get_unit()
+    rows = []
+    solved = False
+    if not stages:
+        if schedule.model.HasObjective():
+            raise ValueError("Cannot solve lexicographically: the model has an objective but no registered "
+                             "objective terms. Register terms with schedule.objective.add().")
+        # A feasibility model has no stages; it solves the same either way
+        schedule.solve(profile)
+        return pd.DataFrame(rows, columns=['stage', 'component', 'status', 'objective', 'bound', 'seconds'])
+    for stage_idx, name in enumerate(stages):
+        stage_time = max(1.0, (deadline - time.time()) / (len(stages) - stage_idx))
+        stage_objective = schedule.objective.expression([name])
+        schedule.model.Minimize(stage_objective)
+        stage_start = time.time()
+        schedule.solve(dataclasses.replace(profile, name=f"{profile.name}-lex-{name}",
+                                           max_time_in_seconds=stage_time))
+        status = schedule._last_solve_status
+        found = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        rows.append({
+            'stage': stage_idx + 1,
+            'component': name,
+            'status': schedule.solver.StatusName(status),
+            'objective': float(schedule.solver.ObjectiveValue() * unit) if found else None,
+            'bound': float(schedule.solver.BestObjectiveBound() * unit) if found else None,
+            'seconds': time.time() - stage_start,
+        })
+        if not found:
+            print(f"Lexicographic stage {name} found no solution, keeping the previous stages")
+            break
+        solved = True
+        best = schedule.solver.ObjectiveValue()
+        schedule.model.Add(stage_objective <= math.floor(best * (1 + tolerance) + 1e-6))
+        _hint_current_solution(schedule)
+
+    schedule.objective.minimize(schedule.model)
+    if solved:
+        schedule.solve(dataclasses.replace(
+            profile, name=f"{profile.name}-lex-final", plateau_seconds=None,
+            max_time_in_seconds=max(1.0, deadline - time.time()),
+            extra_parameters={**profile.extra_parameters, 'fix_variables_to_their_hinted_value': True}))
+    return pd.DataFrame(rows, columns=['stage', 'component', 'status', 'objective', 'bound', 'seconds'])
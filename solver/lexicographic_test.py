@@ -0,0 +1,15 @@
+import pytest
+
+from solver.lexicographic import solve_lexicographic
+from solver.schedule_creator import ScheduleCreator
+from solver.components.total_play import TotalPlayConstraint
+
+
+def test_lexicographic_solve_refuses_objective_without_terms(small_facilities):
+    facilities = small_facilities()
+    schedule = ScheduleCreator(facilities, components=[TotalPlayConstraint()]).build_schedule()
+    # An objective set directly on the model cannot be split into stages
+    schedule.model.Minimize(schedule.is_home[facilities.matches[0], 0])
+
+    with pytest.raises(ValueError, match="no registered objective terms"):
+        solve_lexicographic(schedule, 'ci-smoke')
@@ -0,0 +1,198 @@
+from typing import Dict, List, Tuple, Optional, Sequence, Union, Any
+import dataclasses
+import random
+import time
+import pandas as pd
+from ortools.sat.python import cp_model
+from .facilities.facility import Match
+from .schedule import Schedule
+from .schedule_creator import ScheduleCreator
+from .solver_profiles import SolverProfile, get_solver_profile
+from .warm_start import apply_warm_start, solve_with_fixed_assignment
+
+Assignment = Dict[Match, Tuple[int, int, int]]
+
+# Neighborhoods LargeNeighborhoodSearch can free, see _select_neighborhood
+NEIGHBORHOODS = ('weak_weekends', 'weekends', 'division', 'time_slot')
+
+
+def weekend_weakness(schedule: Schedule, assignment: Assignment) -> Dict[int, float]:
+    """Score how much each weekend contributes to bye and time-variety penalties.
+
+    A weekend scores one point per team on a bye that weekend, plus one point
+    per game a team plays that weekend at a time slot it already plays more
+    often than its fair share over the season.
+
+    Args:
+        schedule: The schedule the assignment belongs to
+        assignment: Dict mapping matches to (home, away, ref) team indices
+
+    Returns:
+        Dict mapping weekend index to its weakness score (higher is weaker)
+    """
+    facilities = schedule.facilities
+    total_teams = len(schedule.teams)
+    time_targets = {ti_idx: len(facilities.matches_by_time[ti_idx]) * 2 / total_teams
+                    for ti_idx in facilities.time_idxs}
+    time_counts: Dict[Tuple[int, int], int] = {}
+    weekend_games: Dict[Tuple[int, int], int] = {}
+    for match, (home, away, _) in assignment.items():
+        for t_idx in (home, away):
+            time_counts[t_idx, match.time_idx] = time_counts.get((t_idx, match.time_idx), 0) + 1
+            weekend_games[match.weekend_idx, t_idx] = weekend_games.get((match.weekend_idx, t_idx), 0) + 1
+
+    scores = {w_idx: float(sum(1 for t_idx in schedule.teams if (w_idx, t_idx) not in weekend_games))
+              for w_idx in facilities.weekend_idxs}
+    for match, (home, away, _) in assignment.items():
+        for t_idx in (home, away):
+            if time_counts[t_idx, match.time_idx] > time_targets[match.time_idx]:
+                scores[match.weekend_idx] += 1
+    return scores
+
+
+class LargeNeighborhoodSearch:
+    """Improves a solved schedule by repeatedly re-solving small parts of it.
+
+    Each iteration keeps the current best assignment for most matches and
+    re-solves a neighborhood of freed matches on a copy of the model with a
+    short time limit. Neighborhoods are:
+
+    - 'weak_weekends': one or two weekends picked by weekend_weakness
+    - 'weekends': one or two random weekends
+    - 'division': every match currently played by one division
+    - 'time_slot': one time slot across all weekends
+
+    Improving neighborhood solutions become the new best and the search keeps going.
+    """
+
+    def __init__(self, creator: ScheduleCreator, schedule: Schedule,
+                 neighborhoods: Sequence[str] = NEIGHBORHOODS,
+                 iteration_time_limit: float = 10.0,
+                 profile: Union[str, SolverProfile, None] = None,
+                 seed: int = 0):
+        """Initialize the search.
+
+        Args:
+            creator: The creator that built the schedule, used to validate the result
+            schedule: A built and solved schedule to improve
+            neighborhoods: Neighborhood kinds to rotate through, from NEIGHBORHOODS
+            iteration_time_limit: Seconds per neighborhood solve
+            profile: Solver profile for the neighborhood solves (time limit is replaced).
+                Defaults to the creator's profile.
+            seed: Random seed for picking neighborhoods
+
+        Raises:
+            ValueError: If a neighborhood kind is unknown
+        """
+        unknown = [kind for kind in neighborhoods if kind not in NEIGHBORHOODS]
+        if unknown:
+            raise ValueError(f"Unknown LNS neighborhoods {unknown}. Expected some of: {', '.join(NEIGHBORHOODS)}")
+        self.creator = creator
+        self.schedule = schedule
+        self.neighborhoods = list(neighborhoods)
+        self.profile = dataclasses.replace(get_solver_profile(profile or creator.solver_profile),
+                                           max_time_in_seconds=iteration_time_limit,
+                                           objective_target=None, plateau_seconds=None)
+        self.rng = random.Random(seed)
+        self.best_assignment: Assignment = schedule.get_assignment()
+        self.best_objective: float = schedule.solver.ObjectiveValue()
+        self.history: List[Dict[str, Any]] = []
+
+    def _select_neighborhood(self, kind: str) -> List[Match]:
+        """Pick the matches to free for one iteration."""
+        facilities = self.schedule.facilities
+        if kind in ('weak_weekends', 'weekends'):
+            weekend_idxs = list(facilities.weekend_idxs)
+            num_weekends = min(len(weekend_idxs), self.rng.choice((1, 2)))
+            if kind == 'weak_weekends':
+                scores = weekend_weakness(self.schedule, self.best_assignment)
+                # Sample proportionally to weakness so repeated iterations don't retry one weekend
+                chosen = set()
+                while len(chosen) < num_weekends:
+                    chosen.add(self.rng.choices(weekend_idxs, weights=[scores[w] + 1 for w in weekend_idxs])[0])
+            else:
+                chosen = set(self.rng.sample(weekend_idxs, num_weekends))
+            return [match for match in self.schedule.matches if match.weekend_idx in chosen]
+        if kind == 'division':
+            div_idx = self.rng.randrange(len(facilities.team_counts))
+            return [match for match, (home, _, _) in self.best_assignment.items()
+                    if self.schedule.team_div[home] == div_idx]
+        time_idx = self.rng.choice(list(facilities.time_idxs))
+        return [match for match in self.schedule.matches if match.time_idx == time_idx]
+
+    def _solve_neighborhood(self, freed: List[Match]) -> Tuple[str, Optional[float], Optional[Assignment]]:
+        """Re-solve the freed matches with every other match fixed to the best assignment.
+
+        Returns:
+            Tuple of the solver status name, and the objective and assignment if one was found
+        """
+        schedule = self.schedule
+        apply_warm_start(schedule, self.best_assignment)
+        # The clone keeps variable indexes and hints, so the schedule's variables address it directly
+        neighborhood_model = schedule.model.Clone()
+        freed_set = set(freed)
+        for match, (home, away, ref) in self.best_assignment.items():
+            if match not in freed_set:
+                neighborhood_model.AddBoolAnd([schedule.is_home[match, home], schedule.is_away[match, away],
+                                               schedule.is_ref[match, ref]])
+
+        solver = cp_model.CpSolver()
+        self.profile.apply(solver)
+        status = solver.Solve(neighborhood_model)
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            return solver.StatusName(status), None, None
+        assignment = {match: schedule._read_match_assignment(match, solver.Value) for match in schedule.matches}
+        return solver.StatusName(status), solver.ObjectiveValue(), assignment
+
+    def run(self, max_iterations: int = 50, time_limit: Optional[float] = None) -> Schedule:
+        """Run the search and leave the schedule solved with the best assignment found.
+
+        Args:
+            max_iterations: Maximum neighborhood solves
+            time_limit: Optional overall time limit in seconds
+
+        Returns:
+            Schedule: The schedule, re-solved with the best assignment and validated
+        """
+        start = time.time()
+        starting_objective = self.best_objective
+        print(f"LNS starting from objective {starting_objective:,.2f}")
+        for iteration in range(max_iterations):
+            if time_limit is not None and time.time() - start >= time_limit:
+                break
+            kind = self.neighborhoods[iteration % len(self.neighborhoods)]
+            freed = self._select_neighborhood(kind)
+            iteration_start = time.time()
+            status, objective, assignment = self._solve_neighborhood(freed)
+            improved = objective is not None and objective < self.best_objective
+            if improved:
+                print(f"[{time.time() - start:6.2f}s] LNS iteration {iteration} ({kind}, {len(freed)} matches): "
+                      f"{self.best_objective:,.2f} -> {objective:,.2f}")
+                self.best_objective = objective
+                self.best_assignment = assignment
+            self.history.append({
+                'iteration': iteration,
+                'neighborhood': kind,
+                'freed_matches': len(freed),
+                'status': status,
+                'objective': objective,
+                'improved': improved,
+                'best_objective': self.best_objective,
+                'seconds': time.time() - iteration_start,
+            })
+
+        print(f"LNS finished after {len(self.history)} iterations: {starting_objective:,.2f} -> "
+              f"{self.best_objective:,.2f} in {time.time() - start:.1f}s")
+        solve_with_fixed_assignment(self.schedule, self.best_assignment,
+                                    dataclasses.replace(self.profile, max_time_in_seconds=60.0))
+        self.creator.finalize_schedule(self.schedule)
+        return self.schedule
+
+    def get_history_report(self) -> pd.DataFrame:
+        """Get one row per iteration with its neighborhood, result and the best objective so far.
+
+        Returns:
+            pd.DataFrame: The iteration history
+        """
+        return pd.DataFrame(self.history, columns=['iteration', 'neighborhood', 'freed_matches', 'status',
+                                                   'objective', 'improved', 'best_objective', 'seconds'])
@@ -0,0 +1,30 @@
+from solver.schedule_creator import ScheduleCreator
+from solver.lns import LargeNeighborhoodSearch
+from solver.solver_profiles import SolverProfile
+from solver.components.total_play import TotalPlayConstraint
+from solver.components.time_variety_optimization import TimeVarietyOptimization
+from solver.components.bye_week_optimization import ByeWeekOptimization
+
+
+def test_lns_objective_never_gets_worse(small_facilities):
+    facilities = small_facilities(team_counts=[6], games_per_season=2)
+    creator = ScheduleCreator(facilities, components=[TotalPlayConstraint(), TimeVarietyOptimization(),
+                                                      ByeWeekOptimization()],
+                              solver_profile='ci-smoke')
+    schedule = creator.create_schedule()
+    starting_objective = schedule.solver.ObjectiveValue()
+
+    lns = LargeNeighborhoodSearch(creator, schedule, iteration_time_limit=2.0,
+                                  profile=SolverProfile(name='lns', num_workers=1, random_seed=0))
+    schedule = lns.run(max_iterations=4)
+
+    best_objectives = list(lns.get_history_report()['best_objective'])
+    assert len(best_objectives) == 4
+    assert all(later <= earlier for earlier, later in zip([starting_objective] + best_objectives, best_objectives))
+    assert schedule.solver.ObjectiveValue() == lns.best_objective <= starting_objective
+    assert schedule.get_assignment() == lns.best_assignment
+    games = {t_idx: 0 for t_idx in schedule.teams}
+    for home, away, _ in lns.best_assignment.values():
+        games[home] += 1
+        games[away] += 1
+    assert set(games.values()) == {facilities.games_per_season}
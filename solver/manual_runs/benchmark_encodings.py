@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark the core model encodings on the volleyball 2025 facilities.
+
+Builds the sand volleyball template once per encoding ('intvar' and
+'boolean'), with and without division-aware matches, reports build time and
+model size, then solves each model with the same short time limit and
+reports time to first solution and the best objective found.
+"""
+
+import pathlib
+import time
+from typing import Dict, Any
+from ortools.sat.python import cp_model
+from .. import Facilities
+from ..schedule import ENCODINGS, Schedule, SolutionStatusCallback
+from ..schedule_creator import ScheduleCreator
+from ..solver_profiles import SolverProfile
+from ..component_sets.sand_volleyball_template import get_sand_volleyball_template
+
+
+def run_benchmark_solve(schedule: Schedule, time_limit: float = 60.0, num_workers: int = 8) -> Dict[str, Any]:
+    """Solve a built schedule with a short time limit and collect solve statistics.
+
+    Args:
+        schedule: A schedule whose model has been built
+        time_limit: Solver time limit in seconds
+        num_workers: Number of CP-SAT search workers
+
+    Returns:
+        Dict with model size, status, first-solution time, objective and bound
+    """
+    proto = schedule.model.Proto()
+    solver = schedule.solver
+    SolverProfile(name='benchmark', max_time_in_seconds=time_limit, num_workers=num_workers).apply(solver)
+    callback = SolutionStatusCallback(schedule, interval=time_limit)
+    status = solver.Solve(schedule.model, callback)
+    schedule.solution_history = callback.objective_history
+    schedule._last_solve_status = status
+
+    has_solution = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    return {
+        'variables': len(proto.variables),
+        'constraints': len(proto.constraints),
+        'status': solver.StatusName(status),
+        'first_solution_seconds': schedule.get_time_to_objective(),
+        'objective': solver.ObjectiveValue() if has_solution else None,
+        'best_bound': solver.BestObjectiveBound() if has_solution else None,
+        'wall_seconds': solver.WallTime(),
+    }
+
+
+def benchmark_encoding(facilities: Facilities, encoding: str, division_aware: bool = False,
+                       time_limit: float = 60.0, num_workers: int = 8) -> Dict[str, Any]:
+    """Build and solve the template with one encoding and collect timings.
+
+    Args:
+        facilities: The facilities to schedule
+        encoding: Core model encoding to benchmark
+        division_aware: Whether matches choose a single division for all roles
+        time_limit: Solver time limit in seconds
+        num_workers: Number of CP-SAT search workers
+
+    Returns:
+        Dict with build time, model size and solve statistics
+    """
+    creator = ScheduleCreator(facilities, components=get_sand_volleyball_template(), encoding=encoding,
+                              division_aware=division_aware)
+    build_start = time.time()
+    schedule = creator.build_schedule()
+    build_seconds = time.time() - build_start
+
+    return {
+        'encoding': encoding + ('+div' if division_aware else ''),
+        'build_seconds': build_seconds,
+        **run_benchmark_solve(schedule, time_limit=time_limit, num_workers=num_workers),
+    }
+
+
+def main(time_limit: float = 60.0):
+    """Benchmark every encoding variant on volleyball_2025.yaml and print a summary."""
+    current_dir = pathlib.Path(__file__).parent.parent  # Get the 'solver' directory
+    facilities_yaml_path = current_dir / "facilities" / "configs" / "volleyball_2025.yaml"
+    facilities = Facilities.from_yaml(str(facilities_yaml_path))
+
+    results = [benchmark_encoding(facilities, encoding, division_aware=division_aware, time_limit=time_limit)
+               for encoding in ENCODINGS for division_aware in (False, True)]
+
+    print(f"\n{'='*60}")
+    print(f"ENCODING BENCHMARK ({time_limit:.0f}s solve limit)")
+    print(f"{'='*60}")
+    for result in results:
+        first = result['first_solution_seconds']
+        objective = result['objective']
+        print(f"{result['encoding']:12s} | build {result['build_seconds']:6.2f}s "
+              f"| vars {result['variables']:7d} | cons {result['constraints']:7d} "
+              f"| first solution {f'{first:6.2f}s' if first is not None else '   none'} "
+              f"| objective {f'{objective:,.2f}' if objective is not None else 'none'} "
+              f"| {result['status']}")
+
+
+if __name__ == "__main__":
+    main()
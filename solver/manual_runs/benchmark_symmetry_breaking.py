@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark the symmetry-breaking component on the volleyball 2025 facilities.
+
+Solves the sand volleyball template with and without
+SymmetryBreakingConstraint under the same time limit and reports how much it
+changes time to first solution and time to reach a target objective. Unless a
+target is given, the target is the worse of the two final objectives, so it
+is one both runs reached.
+"""
+
+import pathlib
+from typing import Dict, Any, Optional
+from .. import Facilities
+from ..schedule_creator import ScheduleCreator
+from ..component_sets.sand_volleyball_template import get_sand_volleyball_template
+from ..components.symmetry_breaking import SymmetryBreakingConstraint
+from .benchmark_encodings import run_benchmark_solve
+
+
+def benchmark_symmetry_breaking(facilities: Facilities, time_limit: float = 60.0, num_workers: int = 8,
+                                target: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+    """Solve the template with and without symmetry breaking and compare timings.
+
+    Args:
+        facilities: The facilities to schedule
+        time_limit: Solver time limit in seconds for each run
+        num_workers: Number of CP-SAT search workers
+        target: Objective to time against. Defaults to the worse final objective.
+
+    Returns:
+        Dict keyed by 'baseline' and 'symmetry_breaking' with solve statistics
+    """
+    schedules = {}
+    results = {}
+    for label, extra_components in (('baseline', []), ('symmetry_breaking', [SymmetryBreakingConstraint()])):
+        creator = ScheduleCreator(facilities, components=get_sand_volleyball_template() + extra_components)
+        schedules[label] = creator.build_schedule()
+        results[label] = run_benchmark_solve(schedules[label], time_limit=time_limit, num_workers=num_workers)
+
+    if target is None:
+        objectives = [result['objective'] for result in results.values() if result['objective'] is not None]
+        target = max(objectives) if len(objectives) == len(results) else None
+    for label, result in results.items():
+        result['target'] = target
+        result['target_seconds'] = schedules[label].get_time_to_objective(target) if target is not None else None
+    return results
+
+
+def main(time_limit: float = 60.0):
+    """Compare symmetry breaking against the baseline on volleyball_2025.yaml and print a summary."""
+    current_dir = pathlib.Path(__file__).parent.parent  # Get the 'solver' directory
+    facilities_yaml_path = current_dir / "facilities" / "configs" / "volleyball_2025.yaml"
+    facilities = Facilities.from_yaml(str(facilities_yaml_path))
+
+    results = benchmark_symmetry_breaking(facilities, time_limit=time_limit)
+
+    def seconds(value):
+        return f'{value:6.2f}s' if value is not None else '   none'
+
+    print(f"\n{'='*60}")
+    print(f"SYMMETRY BREAKING BENCHMARK ({time_limit:.0f}s solve limit)")
+    print(f"{'='*60}")
+    for label, result in results.items():
+        objective = result['objective']
+        print(f"{label:18s} | first solution {seconds(result['first_solution_seconds'])} "
+              f"| target {seconds(result['target_seconds'])} "
+              f"| objective {f'{objective:,.2f}' if objective is not None else 'none'} "
+              f"| {result['status']}")
+
+    baseline, broken = results['baseline'], results['symmetry_breaking']
+    for key, name in (('first_solution_seconds', 'Time to first solution'), ('target_seconds', 'Time to target')):
+        if baseline[key] is not None and broken[key] is not None:
+            print(f"{name}: {baseline[key]:.2f}s -> {broken[key]:.2f}s ({baseline[key] - broken[key]:+.2f}s saved)")
+
+
+if __name__ == "__main__":
+    main()
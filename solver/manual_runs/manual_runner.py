@@ -1,27 +1,53 @@
-from typing import Optional, Set, Any, Iterable, Tuple
+from typing import Optional, Set, Any, Iterable, Tuple, Union
 import pathlib
 import datetime
 from ortools.sat.python import cp_model
 from ..facilities import Facilities
-from ..schedule import Schedule
+from ..schedule import Schedule, INTVAR_ENCODING
 from ..schedule_creator import ScheduleCreator
 from ..schedule_component import SchedulerComponent
+from ..model_cache import ModelCache
+from ..solver_profiles import SolverProfile
+from ..warm_start import WarmStartSource
+from ..lns import LargeNeighborhoodSearch
 
-def make_schedule(facilities: Facilities, components: Iterable[SchedulerComponent]) -> Tuple[Schedule, ScheduleCreator]:
+def make_schedule(facilities: Facilities, components: Iterable[SchedulerComponent],
+                  encoding: str = INTVAR_ENCODING,
+                  division_aware: bool = False,
+                  model_cache: Optional[ModelCache] = None,
+                  solver_profile: Union[str, SolverProfile, None] = None,
+                  warm_start: Optional[WarmStartSource] = None,
+                  repair_hint: bool = False,
+                  lns_iterations: int = 0) -> Tuple[Schedule, ScheduleCreator]:
     """Make a scheduling optimization with the given facilities and constraints.
     
     Args:
         facilities: The Facilities object containing all facility constraints
         components: Iterable of SchedulerComponents to apply to the schedule
+        encoding: Core model encoding ('intvar' or 'boolean')
+        division_aware: Whether matches choose a single division for all roles
+        model_cache: Optional ModelCache to load the built model from (or store it in)
+        solver_profile: SolverProfile or preset name, e.g. 'quick-feasibility',
+            'overnight' or 'ci-smoke'. Defaults to the 'default' preset.
+        warm_start: Optional prior schedule (Schedule, game report DataFrame or
+            canned schedule path) to hint the search with
+        repair_hint: Whether to repair a warm start that violates the constraints
+        lns_iterations: Number of Large Neighborhood Search iterations to improve
+            the solved schedule with (0 skips LNS)
         
     Returns:
         Tuple[Schedule, ScheduleCreator]: The solved schedule and the creator (for debug reports)
     """
     # Create schedule creator
-    creator = ScheduleCreator(facilities, components=components)
+    creator = ScheduleCreator(facilities, components=components, encoding=encoding,
+                              division_aware=division_aware, model_cache=model_cache,
+                              solver_profile=solver_profile, warm_start=warm_start,
+                              repair_hint=repair_hint)
     
     # Create and configure the schedule
     schedule = creator.create_schedule()
+    if lns_iterations:
+        schedule = LargeNeighborhoodSearch(creator, schedule).run(max_iterations=lns_iterations)
     
     return schedule, creator
 
@@ -8,19 +8,26 @@ tracks the best objective score in Google Sheets, and only uploads improved sche
 
 import pathlib
 import os
+import dataclasses
 from .. import Facilities, Schedule
 from ..component_sets.sand_volleyball_template import get_sand_volleyball_template
 from .manual_runner import make_schedule
-from ..exports.gsheets_export import export_schedule_to_sheets, get_best_objective_score, save_best_objective_score
+from ..model_cache import ModelCache
+from ..solver_profiles import SOLVER_PROFILES
+from ..portfolio import run_portfolio, rebuild_portfolio_winner, get_portfolio_report
+from ..exports.gsheets_export import (export_schedule_to_sheets, get_best_objective_score, save_best_objective_score,
+                                      get_best_schedule_game_report)
 from .make_teamwise_schedules_2025 import make_teamwise_schedules
 
 
-def generate_multiple_schedules(update_schedule=True):
+def generate_multiple_schedules(update_schedule=True, warm_start=True):
     """Run the volleyball scheduler multiple times and track the best result.
     
     Args:
         update_schedule (bool): Whether to update Google Sheets during runs. 
                                If False, only tracks best score without uploading.
+        warm_start (bool): Whether to seed each run with the best schedule so far,
+                           starting from the best-run 'schedule' tab in Google Sheets.
     """
     print("Running Multi-Run Volleyball Scheduler for 2025...")
     
@@ -37,13 +44,24 @@ def generate_multiple_schedules(update_schedule=True):
     # Get schedule components
     schedule_components = get_sand_volleyball_template()
     
+    # The model is identical every run, so build it once and reload it from disk
+    model_cache = ModelCache(str(current_dir / "scratch" / "model_cache"))
+    
+    # Stop a run as soon as it reaches the target score, or once it stops improving
+    solver_profile = dataclasses.replace(SOLVER_PROFILES['default'], name='multi-run',
+                                         objective_target=80000, plateau_seconds=60.0)
+    
+    # Seed the search with the best stored schedule; it may predate config
+    # changes, so it is repaired to the current constraints first
+    warm_start_source = get_best_schedule_game_report() if warm_start else None
+    
     best_schedule = None
     best_creator = None
     best_score = current_best_score
     improved_runs = 0
     early_stop = False
     
-    # Run the scheduler 20 times (or until we find a score <= 80,000)
+    # Run the scheduler 20 times (or until we reach the profile's objective target)
     for run_num in range(1, 21):
         print(f"\n{'='*60}")
         print(f"RUN {run_num}/20")
@@ -51,10 +69,15 @@ def generate_multiple_schedules(update_schedule=True):
         
         try:
             # Generate schedule
-            schedule, creator = make_schedule(facilities, schedule_components)
+            schedule, creator = make_schedule(facilities, schedule_components, model_cache=model_cache,
+                                              solver_profile=solver_profile,
+                                              warm_start=warm_start_source,
+                                              repair_hint=warm_start_source is not None
+                                              and not isinstance(warm_start_source, Schedule))
             current_score = schedule.solver.ObjectiveValue()
             
-            print(f"Run {run_num} completed with objective score: {current_score:,.2f}")
+            print(f"Run {run_num} completed with objective score: {current_score:,.2f} "
+                  f"(stopped by {schedule.stop_reason})")
             
             # Check if this is better than our current best
             if current_score < best_score:
@@ -63,6 +86,8 @@ def generate_multiple_schedules(update_schedule=True):
                 best_creator = creator
                 best_score = current_score
                 improved_runs += 1
+                if warm_start:
+                    warm_start_source = schedule
                 
                 # Upload the improved schedule if update_schedule is True
                 if update_schedule:
@@ -83,8 +108,9 @@ def generate_multiple_schedules(update_schedule=True):
                     print(f"📝 Skipping upload (update_schedule=False)")
                 
                 # Check for early stop condition
-                if current_score <= 80000:
-                    print(f"🎯 EXCELLENT SCORE ACHIEVED! Score {current_score:,.2f} <= 80,000 - stopping early!")
+                if current_score <= solver_profile.objective_target:
+                    print(f"🎯 EXCELLENT SCORE ACHIEVED! Score {current_score:,.2f} <= "
+                          f"{solver_profile.objective_target:,.0f} - stopping early!")
                     early_stop = True
                     break
             else:
@@ -131,5 +157,55 @@ def generate_multiple_schedules(update_schedule=True):
     print(f"\nMulti-run optimization complete!")
 
 
+def generate_portfolio_schedules(update_schedule=True, num_runs=20, max_parallel=None):
+    """Run the volleyball scheduler as a parallel portfolio and upload only the winner.
+    
+    The runs solve concurrently on a process pool with distinct seeds and
+    parameter variations; see portfolio.run_portfolio. Outstanding runs are
+    cancelled once one reaches the solver profile's objective target.
+    
+    Args:
+        update_schedule (bool): Whether to upload the winner if it beats the stored best score.
+        num_runs (int): Number of solves in the portfolio.
+        max_parallel (int): Maximum concurrent solves. Defaults to one per
+                            portfolio.MIN_WORKERS_PER_RUN cores.
+    """
+    print("Running Portfolio Volleyball Scheduler for 2025...")
+    
+    current_dir = pathlib.Path(__file__).parent.parent # Get the 'solver' directory
+    facilities_yaml_path = current_dir / "facilities" / "configs" / "volleyball_2025.yaml"
+    facilities = Facilities.from_yaml(str(facilities_yaml_path))
+    current_best_score = get_best_objective_score()
+    print(f"Current best objective score: {current_best_score:,.2f}")
+    
+    model_cache = ModelCache(str(current_dir / "scratch" / "model_cache"))
+    solver_profile = dataclasses.replace(SOLVER_PROFILES['default'], name='portfolio',
+                                         objective_target=80000, plateau_seconds=60.0)
+    results = run_portfolio(facilities, get_sand_volleyball_template, num_runs=num_runs,
+                            base_profile=solver_profile, max_parallel=max_parallel, model_cache=model_cache,
+                            warm_start=get_best_schedule_game_report())
+    print(get_portfolio_report(results).to_string())
+    
+    winner = results[0] if results and results[0].objective is not None else None
+    if winner is None:
+        print("❌ No portfolio run found a schedule.")
+        return
+    print(f"Portfolio winner: run {winner.run_idx} with objective score {winner.objective:,.2f}")
+    if winner.objective >= current_best_score:
+        print(f"No improvement. Current best remains: {current_best_score:,.2f}")
+        return
+    if not update_schedule:
+        print(f"📝 Skipping upload (update_schedule=False)")
+        return
+    
+    print(f"🚀 Uploading winning schedule to Google Sheets...")
+    schedule, creator = rebuild_portfolio_winner(facilities, get_sand_volleyball_template(), winner,
+                                                 model_cache=model_cache)
+    export_schedule_to_sheets(schedule, creator)
+    save_best_objective_score(schedule.solver.ObjectiveValue())
+    make_teamwise_schedules()
+    print(f"✅ Upload complete! New best score saved: {schedule.solver.ObjectiveValue():,.2f}")
+
+
 if __name__ == "__main__":
     generate_multiple_schedules() 
\ No newline at end of file
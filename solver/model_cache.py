@@ -0,0 +1,140 @@
+from typing import Iterable, Dict, Any, Optional, Type
+import hashlib
+import inspect
+import os
+import pathlib
+import pickle
+import sys
+import ortools
+from ortools.sat.python import cp_model
+from .facilities.facility import Facilities
+from .objective import ObjectiveRegistry
+from .schedule import Schedule
+from .schedule_component import SchedulerComponent
+
+# Bump when the cached payload layout changes
+CACHE_FORMAT_VERSION = 2
+
+
+def _module_source_hash(module_name: str) -> str:
+    """Hash a module's source so edits to model-building code invalidate cached models."""
+    try:
+        source = inspect.getsource(sys.modules[module_name])
+    except (KeyError, OSError, TypeError):
+        source = module_name
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+def _component_fingerprint(component: SchedulerComponent) -> str:
+    """Describe a component by its class, public settings (weights etc.) and source."""
+    cls = component.__class__
+    settings = sorted((key, repr(value)) for key, value in vars(component).items() if not key.startswith('_'))
+    return f"{cls.__module__}.{cls.__qualname__}{settings}@{_module_source_hash(cls.__module__)}"
+
+
+class ModelCache:
+    """An on-disk cache of built CP models keyed by facilities and component configuration.
+
+    A cache entry holds the serialized CpModel proto (constraints, optimizers and
+    objective included), the proto variable indexes of the Schedule's core
+    variable dictionaries, the terms of schedule.objective and every component's
+    build state (SchedulerComponent.get_build_state), so a later run or process
+    can skip Python model construction entirely.
+    """
+
+    def __init__(self, cache_dir: str):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory to store cached models in. Created if missing.
+        """
+        self.cache_dir = pathlib.Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key_for(facilities: Facilities, components: Iterable[SchedulerComponent],
+                encoding: str, division_aware: bool, schedule_class: Type[Schedule] = Schedule) -> str:
+        """Compute the cache key for a model build.
+
+        The key covers the facilities content, each component's class, public
+        settings and module source, the schedule class and its module source,
+        the sources of the Schedule, Facilities and objective modules, the
+        encoding options and the OR-Tools version.
+
+        Args:
+            facilities: The facilities the model is built for
+            components: The components the model is built with
+            encoding: Core model encoding ('intvar' or 'boolean')
+            division_aware: Whether matches choose a single division for all roles
+            schedule_class: The Schedule (sub)class the creator builds, e.g. PlayOnlySchedule
+
+        Returns:
+            str: Hex SHA-256 digest
+        """
+        parts = [
+            f"format={CACHE_FORMAT_VERSION}",
+            f"ortools={ortools.__version__}",
+            f"facilities={facilities.content_hash()}",
+            f"facilities_module={_module_source_hash(Facilities.__module__)}",
+            f"objective={_module_source_hash(ObjectiveRegistry.__module__)}",
+            f"schedule={_module_source_hash(Schedule.__module__)}",
+            f"schedule_class={schedule_class.__module__}.{schedule_class.__qualname__}"
+            f"@{_module_source_hash(schedule_class.__module__)}",
+            f"encoding={encoding}",
+            f"division_aware={division_aware}",
+        ]
+        parts.extend(_component_fingerprint(component) for component in components)
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    def _path(self, key: str) -> pathlib.Path:
+        return self.cache_dir / f"{key}.pkl"
+
+    def __contains__(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def load(self, key: str, model: cp_model.CpModel) -> Optional[Dict[str, Any]]:
+        """Load a cached model into the given model.
+
+        Args:
+            key: Cache key from key_for
+            model: Model to replace with the cached proto
+
+        Returns:
+            The cached payload, or None on a cache miss: 'var_indexes' to pass to
+            Schedule(var_indexes=...), 'objective_terms' for
+            ObjectiveRegistry.restore_term_indexes and 'component_states', one
+            per component in build order
+        """
+        path = self._path(key)
+        if not path.exists():
+            return None
+        with open(path, 'rb') as f:
+            payload = pickle.load(f)
+        model.Proto().ParseFromString(payload['proto'])
+        model.rebuild_var_and_constant_map()
+        return payload
+
+    def store(self, key: str, schedule: Schedule, components: Iterable[SchedulerComponent]):
+        """Store a built (not yet solved) schedule's model under the given key.
+
+        Args:
+            key: Cache key from key_for
+            schedule: The built schedule
+            components: The components the schedule was built with, in build order
+        """
+        payload = {
+            'proto': schedule.model.Proto().SerializeToString(),
+            'var_indexes': schedule.get_var_indexes(),
+            'objective_terms': schedule.objective.get_term_indexes(),
+            'component_states': [component.get_build_state() for component in components],
+        }
+        # Write then rename so concurrent runs never read a partial file
+        tmp_path = self._path(key).with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self._path(key))
+
+    def clear(self):
+        """Delete every cached model."""
+        for path in self.cache_dir.glob("*.pkl"):
+            path.unlink()
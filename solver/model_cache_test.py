@@ -0,0 +1,73 @@
+from solver.model_cache import ModelCache
+from solver.schedule import Schedule
+from solver.schedule_creator import ScheduleCreator, LEXICOGRAPHIC_OBJECTIVE
+from solver.play_first import PlayOnlySchedule, PlayOnlyScheduleCreator
+from solver.components.total_play import TotalPlayConstraint
+from solver.components.time_variety_optimization import TimeVarietyOptimization
+from solver.components.bye_week_optimization import ByeWeekOptimization
+from solver.components.symmetry_breaking import SymmetryBreakingConstraint
+
+
+def test_cached_model_matches_fresh_build(tmp_path, small_facilities):
+    facilities = small_facilities()
+    cache = ModelCache(str(tmp_path / "cache"))
+
+    def build(weight=1.0):
+        components = [TotalPlayConstraint(), TimeVarietyOptimization(weight=weight)]
+        return ScheduleCreator(facilities, components=components, model_cache=cache).build_schedule()
+
+    built = build()
+    cached = build()
+
+    assert cached.build_metrics[0]['stage'] == 'cache'
+    assert cached.model.Proto() == built.model.Proto()
+    assert cached.get_var_indexes() == built.get_var_indexes()
+    assert cached.is_home[facilities.matches[0], 0].Not() is not None
+
+    # Different component settings build (and cache) a separate model
+    reweighted = build(weight=2.0)
+    assert reweighted.build_metrics[0]['stage'] == 'core'
+    assert len(list(cache.cache_dir.glob("*.pkl"))) == 2
+
+
+def test_cached_model_keeps_objective_terms_and_component_state(tmp_path, small_facilities):
+    facilities = small_facilities()
+    cache = ModelCache(str(tmp_path / "cache"))
+
+    def create(objective_mode):
+        components = [TotalPlayConstraint(), SymmetryBreakingConstraint(),
+                      ByeWeekOptimization(weight=100), TimeVarietyOptimization(weight=1)]
+        creator = ScheduleCreator(facilities, components=components, model_cache=cache,
+                                  solver_profile='ci-smoke', objective_mode=objective_mode)
+        return creator, creator.create_schedule()
+
+    built_creator, built = create(LEXICOGRAPHIC_OBJECTIVE)
+    cached_creator, cached = create(LEXICOGRAPHIC_OBJECTIVE)
+
+    assert cached.build_metrics[0]['stage'] == 'cache'
+    assert cached.objective.get_coefficients() == built.objective.get_coefficients()
+    assert cached.get_objective_breakdown() == built.get_objective_breakdown()
+    assert sum(cached.get_objective_breakdown().values()) == cached.solver.ObjectiveValue()
+    assert list(cached_creator.lexicographic_report['component']) == ['ByeWeekOptimization',
+                                                                       'TimeVarietyOptimization']
+    assert cached_creator.lexicographic_report.equals(built_creator.lexicographic_report.assign(
+        seconds=cached_creator.lexicographic_report['seconds']))
+    assert cached_creator.components[1]._added_counts == built_creator.components[1]._added_counts
+
+
+def test_play_only_creator_gets_its_own_cache_entry(tmp_path, small_facilities):
+    facilities = small_facilities()
+    cache = ModelCache(str(tmp_path / "cache"))
+
+    def create(creator_class):
+        return creator_class(facilities, components=[TotalPlayConstraint()], encoding='boolean', model_cache=cache)
+
+    full_key = cache.key_for(facilities, [TotalPlayConstraint()], 'boolean', False, Schedule)
+    play_only_key = cache.key_for(facilities, [TotalPlayConstraint()], 'boolean', False, PlayOnlySchedule)
+    assert full_key != play_only_key
+
+    create(ScheduleCreator).build_schedule()
+    play_only = create(PlayOnlyScheduleCreator).build_schedule()
+    assert isinstance(play_only, PlayOnlySchedule)
+    assert play_only.build_metrics[0]['stage'] == 'core'
+    assert full_key in cache and play_only_key in cache
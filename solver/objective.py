@@ -0,0 +1,161 @@
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import math
+from ortools.sat.python import cp_model, cp_model_helper
+
+Weight = Union[int, float, Fraction]
+
+
+@dataclass(frozen=True)
+class ObjectiveTerm:
+    """A named group of integer expressions sharing one weight.
+
+    Attributes:
+        name: Term name, by convention the registering component's class name
+        exprs: Integer linear expressions (variables, or e.g. 1 - literal)
+        weight: Exact weight of every expression in objective units
+    """
+    name: str
+    exprs: Tuple
+    weight: Fraction
+
+
+def _to_fraction(weight: Weight) -> Fraction:
+    """Convert a weight to an exact fraction, reading floats as their decimal form (0.1 -> 1/10).
+
+    Raises:
+        ValueError: If the weight is not finite
+    """
+    if isinstance(weight, float):
+        if not math.isfinite(weight):
+            raise ValueError(f"Objective weights must be finite, got {weight}")
+        return Fraction(repr(weight))
+    return Fraction(weight)
+
+
+class ObjectiveRegistry:
+    """The schedule's objective as named, weighted terms.
+
+    Components register their terms with add() instead of building float
+    expressions. The registry turns every weight into an integer coefficient
+    with the smallest common scale (common denominator, then divided by the gcd),
+    minimizes a single LinearExpr.WeightedSum and sets the objective proto's
+    scaling factor, so solver objective values stay in the weights' units.
+    breakdown() reports each term's share of a solution.
+    """
+
+    def __init__(self):
+        self.terms: List[ObjectiveTerm] = []
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    @property
+    def names(self) -> List[str]:
+        """Registered term names, in registration order without repeats."""
+        return list(dict.fromkeys(term.name for term in self.terms))
+
+    def add(self, name: str, exprs: Iterable, weight: Weight = 1):
+        """Register expressions to minimize under a name; repeated names accumulate.
+
+        Args:
+            name: Term name, e.g. the component's class name
+            exprs: Integer linear expressions; each one contributes its value times weight
+            weight: Weight per unit of every expression (int, float or Fraction)
+
+        Raises:
+            ValueError: If the weight is not finite
+        """
+        self.terms.append(ObjectiveTerm(name=name, exprs=tuple(exprs), weight=_to_fraction(weight)))
+
+    def get_term_indexes(self) -> List[Tuple[str, Fraction, List[Tuple[List[int], List[int], int]]]]:
+        """Get the registered terms with every expression flattened to proto variable indexes.
+
+        Returns:
+            (name, weight, [(variable indexes, coefficients, offset)]) per term, in registration order
+        """
+        term_indexes = []
+        for term in self.terms:
+            flat_exprs = [cp_model_helper.FlatIntExpr(expr) for expr in term.exprs]
+            term_indexes.append((term.name, term.weight,
+                                 [([var.index for var in flat.vars], list(flat.coeffs), flat.offset)
+                                  for flat in flat_exprs]))
+        return term_indexes
+
+    def restore_term_indexes(self, model: cp_model.CpModel,
+                             term_indexes: List[Tuple[str, Fraction, List[Tuple[List[int], List[int], int]]]]):
+        """Register terms saved by get_term_indexes against an already built model.
+
+        Args:
+            model: The model holding the terms' variables
+            term_indexes: Terms from get_term_indexes
+        """
+        for name, weight, flat_exprs in term_indexes:
+            exprs = [cp_model.LinearExpr.WeightedSum([model.GetIntVarFromProtoIndex(index) for index in indexes],
+                                                     coeffs) + offset
+                     for indexes, coeffs, offset in flat_exprs]
+            self.add(name, exprs, weight)
+
+    def get_unit(self) -> Fraction:
+        """Objective units per unit of the integer objective (scale of the smallest coefficient step)."""
+        weights = [term.weight for term in self.terms if term.weight]
+        if not weights:
+            return Fraction(1)
+        denominator = math.lcm(*(weight.denominator for weight in weights))
+        return Fraction(math.gcd(*(int(weight * denominator) for weight in weights)), denominator)
+
+    def get_coefficients(self) -> Dict[str, int]:
+        """Integer coefficient per term name, sharing the scale of get_unit.
+
+        Raises:
+            ValueError: If one name was registered with different weights
+        """
+        unit = self.get_unit()
+        coefficients = {}
+        for term in self.terms:
+            coefficient = int(term.weight / unit)
+            if coefficients.setdefault(term.name, coefficient) != coefficient:
+                raise ValueError(f"Objective term '{term.name}' was registered with different weights")
+        return coefficients
+
+    def expression(self, names: Optional[Iterable[str]] = None) -> cp_model.LinearExpr:
+        """The integer-coefficient objective over all terms, or only the named ones.
+
+        Args:
+            names: Optional term names to include
+
+        Returns:
+            LinearExpr: Sum of the terms in units of get_unit()
+        """
+        unit = self.get_unit()
+        names = None if names is None else set(names)
+        exprs, coeffs = [], []
+        for term in self.terms:
+            if (names is None or term.name in names) and term.weight:
+                exprs.extend(term.exprs)
+                coeffs.extend([int(term.weight / unit)] * len(term.exprs))
+        return cp_model.LinearExpr.WeightedSum(exprs, coeffs)
+
+    def minimize(self, model: cp_model.CpModel):
+        """Set the model objective to the registered terms, reported in objective units.
+
+        Args:
+            model: The model to set the objective on
+        """
+        model.Minimize(self.expression())
+        model.Proto().objective.scaling_factor = float(self.get_unit())
+
+    def breakdown(self, solver: Union[cp_model.CpSolver, cp_model.CpSolverSolutionCallback]) -> Dict[str, float]:
+        """Contribution of each term name to a solution's objective.
+
+        Args:
+            solver: A solver (or solution callback) holding a solution of the model
+
+        Returns:
+            Dict mapping term names to objective units, in registration order
+        """
+        contributions = {name: 0.0 for name in self.names}
+        for term in self.terms:
+            contributions[term.name] += float(term.weight * sum(solver.Value(expr) for expr in term.exprs))
+        return contributions
@@ -0,0 +1,22 @@
+from ortools.sat.python import cp_model
+from solver.objective import ObjectiveRegistry
+
+
+def test_registry_reduces_weights_and_breaks_down_objective():
+    model = cp_model.CpModel()
+    byes = [model.NewBoolVar(f"bye_{i}") for i in range(2)]
+    deviation = model.NewIntVar(3, 10, "deviation")
+    model.Add(sum(byes) == 1)
+
+    objective = ObjectiveRegistry()
+    objective.add('ByeWeekOptimization', byes, 10000.0)
+    objective.add('TimeVarietyOptimization', [deviation], 2.5)
+    objective.minimize(model)
+
+    assert objective.get_unit() == 2.5
+    assert objective.get_coefficients() == {'ByeWeekOptimization': 4000, 'TimeVarietyOptimization': 1}
+
+    solver = cp_model.CpSolver()
+    assert solver.Solve(model) == cp_model.OPTIMAL
+    assert solver.ObjectiveValue() == 10007.5
+    assert objective.breakdown(solver) == {'ByeWeekOptimization': 10000.0, 'TimeVarietyOptimization': 7.5}
@@ -0,0 +1,172 @@
+from typing import Dict, Iterable, Optional, Tuple
+from ortools.graph.python import max_flow
+from ortools.sat.python import cp_model
+from .facilities.facility import Facilities, Match
+from .schedule import Schedule, BOOLEAN_ENCODING
+from .schedule_creator import ScheduleCreator
+from .warm_start import solve_with_fixed_assignment
+from .components.balance_reffing import BalanceReffingConstraint
+from .components.play_near_ref import PlayNearRefConstraint
+from .components.ref_same_division import RefSameDivisionConstraint
+from .components.ref_availability import RefAvailabilityConstraint
+
+# Components that only constrain refs, replaced by RefAvailabilityConstraint in the play phase
+REF_COMPONENTS = (BalanceReffingConstraint, PlayNearRefConstraint, RefSameDivisionConstraint)
+
+
+class PlayOnlySchedule(Schedule):
+    """A Schedule core model without ref literals, for solving the play schedule alone.
+
+    Every is_ref entry is the same literal fixed to false, so components and
+    aggregates that read refs (busy counts, OneThingAtATime, NoThreeHoursDays)
+    see only the games. Always uses the boolean encoding, without division-aware
+    match divisions.
+    """
+
+    def __init__(self, facilities: Facilities, model: Optional[cp_model.CpModel],
+                 encoding: str = BOOLEAN_ENCODING, division_aware: bool = False, var_indexes=None):
+        """Initialize the schedule.
+
+        Raises:
+            ValueError: If another encoding or division_aware is requested
+        """
+        if encoding != BOOLEAN_ENCODING or division_aware:
+            raise ValueError("PlayOnlySchedule only supports the boolean encoding without division_aware")
+        super().__init__(facilities, model, encoding=encoding, division_aware=division_aware,
+                         var_indexes=var_indexes)
+
+    def _add_boolean_core_variables(self, all_matches: Iterable[Match]):
+        """Create home and away literals per match; refs are a single false literal."""
+        self._init_derived_var_dicts()
+        no_ref = self.model.NewBoolVar("no_ref")
+        self.model.Add(no_ref == 0)
+
+        for m in all_matches:
+            name_suffix = self._match_name_suffix(m)
+            self.match_loc[m] = self.model.NewConstant(m.location)
+            for t_idx in range(self.total_teams):
+                self.is_home[m, t_idx] = self.model.NewBoolVar(f"is_home_{name_suffix}_{t_idx}")
+                self.is_away[m, t_idx] = self.model.NewBoolVar(f"is_away_{name_suffix}_{t_idx}")
+                self.is_ref[m, t_idx] = no_ref
+                self.model.AddAtMostOne([self.is_home[m, t_idx], self.is_away[m, t_idx]])
+
+                self.is_playing[m, t_idx] = self.model.NewBoolVar(f"is_playing_{name_suffix}_{t_idx}")
+                self.model.Add(self.is_playing[m, t_idx] == self.is_home[m, t_idx] + self.is_away[m, t_idx])
+                self.is_busy[m, t_idx] = self.is_playing[m, t_idx]
+
+            self.model.AddExactlyOne(self.is_home[m, t_idx] for t_idx in range(self.total_teams))
+            self.model.AddExactlyOne(self.is_away[m, t_idx] for t_idx in range(self.total_teams))
+
+    def get_play_assignment(self) -> Dict[Match, Tuple[int, int]]:
+        """Get the solved (home, away) teams of every match.
+
+        Returns:
+            Dict mapping matches to (home, away) team indices
+        """
+        return {match: tuple(next(t_idx for t_idx in self.teams if self.solver.BooleanValue(role_literals[match, t_idx]))
+                             for role_literals in (self.is_home, self.is_away))
+                for match in self.matches}
+
+
+class PlayOnlyScheduleCreator(ScheduleCreator):
+    """A ScheduleCreator that builds PlayOnlySchedule models."""
+
+    schedule_class = PlayOnlySchedule
+
+
+def assign_weekend_refs(facilities: Facilities, games: Dict[Match, Tuple[int, int]],
+                        refs: Iterable[int]) -> Optional[Dict[Match, Tuple[int, int, int]]]:
+    """Assign one weekend's refs to its matches with a max flow (bipartite matching).
+
+    Follows the reffing rules of the sand volleyball template: a ref is in the
+    match's division, plays exactly one game that weekend, in the time before or
+    after the match (PlayNearRef, NoThreeHoursDays, OneThingAtATime), and refs
+    once. Weekends are independent, so each can be assigned on its own.
+
+    Args:
+        facilities: The season facilities
+        games: Dict mapping the weekend's matches to their (home, away) teams
+        refs: The teams that ref once this weekend
+
+    Returns:
+        Dict mapping the weekend's matches to (home, away, ref), or None if no assignment exists
+    """
+    team_div = [div_idx for div_idx, count in enumerate(facilities.team_counts) for _ in range(count)]
+    played_times: Dict[int, list] = {}
+    for match, teams in games.items():
+        for t_idx in teams:
+            played_times.setdefault(t_idx, []).append(match.time_idx)
+
+    flow = max_flow.SimpleMaxFlow()
+    source, sink = 0, 1
+    match_nodes = {match: node for node, match in enumerate(games, start=2)}
+    ref_nodes = {t_idx: node for node, t_idx in enumerate(refs, start=2 + len(match_nodes))}
+    ref_arcs = {}
+    for t_idx, ref_node in ref_nodes.items():
+        flow.add_arc_with_capacity(ref_node, sink, 1)
+    for match, (home, away) in games.items():
+        flow.add_arc_with_capacity(source, match_nodes[match], 1)
+        for t_idx, ref_node in ref_nodes.items():
+            times = played_times.get(t_idx, [])
+            if team_div[t_idx] == team_div[home] and len(times) == 1 and abs(times[0] - match.time_idx) == 1:
+                ref_arcs[flow.add_arc_with_capacity(match_nodes[match], ref_node, 1)] = (match, t_idx)
+
+    if flow.solve(source, sink) != flow.OPTIMAL or flow.optimal_flow() < len(games):
+        return None
+    return {match: games[match] + (t_idx,) for arc, (match, t_idx) in ref_arcs.items() if flow.flow(arc)}
+
+
+def solve_play_first(creator: ScheduleCreator) -> Optional[Schedule]:
+    """Solve with the play-first, ref-later pipeline.
+
+    The play schedule is solved on a PlayOnlySchedule with the creator's
+    components minus REF_COMPONENTS, plus RefAvailabilityConstraint, which picks
+    each weekend's reffing teams. Refs are then matched to matches weekend by
+    weekend with assign_weekend_refs, and the merged
+    assignment is solved fixed in the creator's full model so every component's
+    variables and objective apply as usual.
+
+    Args:
+        creator: The creator to take facilities, components and settings from
+
+    Returns:
+        The solved (not yet finalized) schedule, or None if either phase found no solution
+    """
+    facilities = creator.facilities
+    profile = creator.solver_profile
+    balance_reffing = next((component for component in creator.components
+                            if isinstance(component, BalanceReffingConstraint)), None)
+    ref_availability = RefAvailabilityConstraint()
+    if balance_reffing is not None:
+        ref_availability = RefAvailabilityConstraint(season_refs=balance_reffing.season_ref_range(facilities),
+                                                     max_weekend_games=balance_reffing.max_weekend_games)
+    play_components = [component for component in creator.components if not isinstance(component, REF_COMPONENTS)]
+    play_components.append(ref_availability)
+
+    play_creator = PlayOnlyScheduleCreator(facilities, components=play_components, encoding=BOOLEAN_ENCODING,
+                                           track_memory=creator.track_memory, solver_profile=profile)
+    play_schedule = play_creator.build_schedule()
+    play_schedule.solve(profile)
+    if play_schedule._last_solve_status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return None
+
+    games = play_schedule.get_play_assignment()
+    assignment = {}
+    for w_idx in facilities.weekend_idxs:
+        refs = [t_idx for t_idx in play_schedule.teams
+                if play_schedule.solver.BooleanValue(ref_availability.ref_weekend[w_idx, t_idx])]
+        weekend_assignment = assign_weekend_refs(
+            facilities, {match: games[match] for match in facilities.matches_by_weekend[w_idx]}, refs)
+        if weekend_assignment is None:
+            print(f"Play-first: no ref assignment exists for weekend {w_idx}")
+            return None
+        assignment.update(weekend_assignment)
+    print(f"Play-first: assigned refs to {len(assignment)} matches")
+
+    full_creator = creator.__class__(facilities, components=creator.components, encoding=creator.encoding,
+                                     division_aware=creator.division_aware, track_memory=creator.track_memory,
+                                     model_cache=creator.model_cache, solver_profile=profile)
+    schedule = full_creator.build_schedule()
+    if solve_with_fixed_assignment(schedule, assignment, profile) not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return None
+    return schedule
@@ -0,0 +1,22 @@
+from solver.schedule_creator import ScheduleCreator
+from solver.play_first import solve_play_first
+from solver.component_sets.sand_volleyball_template import get_sand_volleyball_template
+
+
+def test_play_first_produces_a_validated_schedule(small_facilities):
+    facilities = small_facilities(team_counts=[6], games_per_season=2)
+    creator = ScheduleCreator(facilities, components=get_sand_volleyball_template(), solver_profile='ci-smoke')
+
+    # Called directly so a failed pipeline cannot fall back to the full model
+    schedule = solve_play_first(creator)
+    assert schedule is not None
+    creator.finalize_schedule(schedule)
+
+    assignment = schedule.get_assignment()
+    assert set(assignment) == set(facilities.matches)
+    for match, (home, away, ref) in assignment.items():
+        assert len({home, away, ref}) == 3
+        # Refs play in the time slot next to the one they ref
+        ref_times = [other.time_idx for other in facilities.matches_by_weekend[match.weekend_idx]
+                     if ref in assignment[other][:2]]
+        assert ref_times and all(abs(time_idx - match.time_idx) == 1 for time_idx in ref_times)
@@ -0,0 +1,277 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union, Any
+import math
+import multiprocessing
+import os
+import threading
+import time
+import pandas as pd
+from .facilities.facility import Facilities
+from .schedule import Schedule, INTVAR_ENCODING
+from .schedule_creator import ScheduleCreator
+from .schedule_component import SchedulerComponent
+from .model_cache import ModelCache
+from .solver_profiles import SolverProfile, get_solver_profile
+from .warm_start import WarmStartSource, solve_with_fixed_assignment
+
+# Components hold closures and cannot be pickled, so worker processes build their
+# own from a module-level factory such as get_sand_volleyball_template
+ComponentFactory = Callable[[], Iterable[SchedulerComponent]]
+
+# Parameter variations cycled through the portfolio runs, on top of distinct seeds
+PORTFOLIO_VARIATIONS: List[Dict[str, Any]] = [
+    {},
+    {'linearization_level': 1},
+    {'extra_parameters': {'randomize_search': True}},
+    {'linearization_level': 2},
+]
+
+# CP-SAT's parallel search needs several workers per solve to run its mix of
+# LNS and bounding subsolvers, so by default cores are not split any finer
+MIN_WORKERS_PER_RUN = 8
+
+
+@dataclass(frozen=True)
+class PortfolioResult:
+    """The outcome of one portfolio run.
+
+    Attributes:
+        run_idx: Index of the run in the portfolio
+        profile: The solver profile the run used
+        status: CP-SAT status name, 'CANCELLED' if the run never started, or 'ERROR'
+        stop_reason: Schedule.stop_reason, or 'portfolio_target' when another run reached the target
+        objective: Objective value, or None without a solution
+        wall_seconds: Build and solve time of the run
+        assignment: (home, away, ref) per match in facilities.matches order, or None
+        error: Error message if the run (or its validators) failed
+    """
+    run_idx: int
+    profile: SolverProfile
+    status: str
+    stop_reason: Optional[str] = None
+    objective: Optional[float] = None
+    wall_seconds: float = 0.0
+    assignment: Optional[Tuple[Tuple[int, int, int], ...]] = None
+    error: Optional[str] = None
+
+
+# Shared between the worker processes, set by _init_worker
+_stop_event = None
+_best_objective = None
+
+
+def _init_worker(stop_event, best_objective):
+    global _stop_event, _best_objective
+    _stop_event = stop_event
+    _best_objective = best_objective
+
+
+def portfolio_profiles(base_profile: SolverProfile, num_runs: int, num_workers: int) -> List[SolverProfile]:
+    """Derive one solver profile per run with distinct seeds and parameter variations.
+
+    Args:
+        base_profile: Profile the runs start from (time limit, target, plateau etc.)
+        num_runs: Number of runs
+        num_workers: CP-SAT workers per run
+
+    Returns:
+        List of profiles, one per run
+    """
+    profiles = []
+    base_seed = base_profile.random_seed or 0
+    for run_idx in range(num_runs):
+        variation = dict(PORTFOLIO_VARIATIONS[run_idx % len(PORTFOLIO_VARIATIONS)])
+        variation['extra_parameters'] = {**base_profile.extra_parameters, **variation.get('extra_parameters', {})}
+        profiles.append(replace(base_profile, name=f"{base_profile.name}-run{run_idx}",
+                                random_seed=base_seed + run_idx, num_workers=num_workers, **variation))
+    return profiles
+
+
+def _run_portfolio_solve(run_idx: int, facilities: Facilities, component_factory: ComponentFactory,
+                         profile: SolverProfile, encoding: str, division_aware: bool,
+                         model_cache: Optional[ModelCache], warm_start: Optional[WarmStartSource]) -> PortfolioResult:
+    """Build, solve and validate one portfolio run in a worker process."""
+    if _stop_event.is_set():
+        return PortfolioResult(run_idx, profile, 'CANCELLED', stop_reason='portfolio_target')
+
+    start = time.time()
+    try:
+        creator = ScheduleCreator(facilities, components=component_factory(), encoding=encoding,
+                                  division_aware=division_aware, model_cache=model_cache,
+                                  solver_profile=profile, warm_start=warm_start)
+        schedule = creator.build_schedule()
+
+        # Stop this search as soon as another run reaches the target
+        solve_done = threading.Event()
+        cancelled = threading.Event()
+
+        def watch_for_stop():
+            while not solve_done.wait(1.0):
+                if _stop_event.is_set():
+                    cancelled.set()
+                    schedule.solver.StopSearch()
+                    return
+
+        watcher = threading.Thread(target=watch_for_stop, daemon=True)
+        watcher.start()
+        try:
+            schedule.solve(profile)
+        finally:
+            solve_done.set()
+            watcher.join()
+
+        status = schedule.solver.StatusName(schedule._last_solve_status)
+        stop_reason = 'portfolio_target' if cancelled.is_set() else schedule.stop_reason
+        if status not in ('OPTIMAL', 'FEASIBLE'):
+            return PortfolioResult(run_idx, profile, status, stop_reason=stop_reason,
+                                   wall_seconds=time.time() - start)
+
+        objective = schedule.solver.ObjectiveValue()
+        assignment = tuple(schedule.get_assignment()[match] for match in schedule.matches)
+        creator.finalize_schedule(schedule)
+    except Exception as e:
+        return PortfolioResult(run_idx, profile, 'ERROR', wall_seconds=time.time() - start, error=str(e))
+
+    with _best_objective.get_lock():
+        if objective < _best_objective.value:
+            _best_objective.value = objective
+    if profile.objective_target is not None and objective <= profile.objective_target:
+        _stop_event.set()
+    return PortfolioResult(run_idx, profile, status, stop_reason=stop_reason, objective=objective,
+                           wall_seconds=time.time() - start, assignment=assignment)
+
+
+def run_portfolio(facilities: Facilities, component_factory: ComponentFactory, num_runs: int = 20,
+                  base_profile: Union[str, SolverProfile, None] = None, max_parallel: Optional[int] = None,
+                  encoding: str = INTVAR_ENCODING, division_aware: bool = False,
+                  model_cache: Optional[ModelCache] = None,
+                  warm_start: Optional[WarmStartSource] = None) -> List[PortfolioResult]:
+    """Run independent solves concurrently on a process pool and collect the results.
+
+    The cores are split between the runs: max_parallel runs at a time (at most
+    num_runs), each with cpu_count // max_parallel CP-SAT workers. By default
+    only cpu_count // MIN_WORKERS_PER_RUN runs go at a time (at least one), so
+    each keeps at least MIN_WORKERS_PER_RUN workers. The per-run worker count is
+    printed when the portfolio starts. Runs get distinct seeds and cycle through
+    PORTFOLIO_VARIATIONS. When a run reaches base_profile.objective_target, the
+    other running searches are stopped and runs that have not started yet are
+    cancelled.
+
+    Runs only return their assignment; use rebuild_portfolio_winner to get a
+    solved Schedule (and creator) for exporting the winner.
+
+    Args:
+        facilities: The Facilities to schedule
+        component_factory: Module-level function returning the components, called in each worker
+        num_runs: Number of runs
+        base_profile: Solver profile (or preset name) the runs are derived from
+        max_parallel: Maximum concurrent runs. Defaults to cpu_count // MIN_WORKERS_PER_RUN.
+        encoding: Core model encoding ('intvar' or 'boolean')
+        division_aware: Whether matches choose a single division for all roles
+        model_cache: Optional ModelCache. The model is built and stored once before
+            the runs start, so every worker loads it instead of building it.
+        warm_start: Optional warm start for every run. A Schedule is passed on as
+            its game report since schedules cannot be sent to worker processes.
+
+    Returns:
+        List of results, best objective first, runs without a solution last
+    """
+    base_profile = get_solver_profile(base_profile)
+    cpu_count = os.cpu_count() or 1
+    max_parallel = min(max_parallel or max(1, cpu_count // MIN_WORKERS_PER_RUN), num_runs)
+    profiles = portfolio_profiles(base_profile, num_runs, max(1, cpu_count // max_parallel))
+    if isinstance(warm_start, Schedule):
+        warm_start = warm_start.get_game_report()
+
+    if model_cache is not None:
+        components = list(component_factory())
+        if model_cache.key_for(facilities, components, encoding, division_aware) not in model_cache:
+            ScheduleCreator(facilities, components=components, encoding=encoding, division_aware=division_aware,
+                            model_cache=model_cache).build_schedule()
+
+    print(f"Running a portfolio of {num_runs} solves, {max_parallel} at a time "
+          f"with {profiles[0].num_workers} CP-SAT workers each")
+    stop_event = multiprocessing.Event()
+    best_objective = multiprocessing.Value('d', math.inf)
+    results = []
+    with ProcessPoolExecutor(max_workers=max_parallel, initializer=_init_worker,
+                             initargs=(stop_event, best_objective)) as executor:
+        futures = [executor.submit(_run_portfolio_solve, run_idx, facilities, component_factory, profile,
+                                   encoding, division_aware, model_cache, warm_start)
+                   for run_idx, profile in enumerate(profiles)]
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            result = future.result()
+            results.append(result)
+            objective = f"{result.objective:,.2f}" if result.objective is not None else "-"
+            print(f"Portfolio run {result.run_idx} finished: {result.status} objective {objective} "
+                  f"(stopped by {result.stop_reason}); best so far {best_objective.value:,.2f}")
+            if result.error:
+                print(f"  Run {result.run_idx} failed: {result.error}")
+            if stop_event.is_set():
+                for pending in futures:
+                    pending.cancel()
+
+    for run_idx, future in enumerate(futures):
+        if future.cancelled():
+            results.append(PortfolioResult(run_idx, profiles[run_idx], 'CANCELLED', stop_reason='portfolio_target'))
+    return sorted(results, key=lambda r: (r.objective is None, r.objective if r.objective is not None else 0,
+                                          r.run_idx))
+
+
+def get_portfolio_report(results: List[PortfolioResult]) -> pd.DataFrame:
+    """Summarize portfolio results.
+
+    Args:
+        results: Results from run_portfolio
+
+    Returns:
+        pd.DataFrame: One row per run with its seed, variation, status, stop reason, objective and time
+    """
+    return pd.DataFrame([{
+        'run_idx': result.run_idx,
+        'random_seed': result.profile.random_seed,
+        'linearization_level': result.profile.linearization_level,
+        'extra_parameters': result.profile.extra_parameters,
+        'status': result.status,
+        'stop_reason': result.stop_reason,
+        'objective': result.objective,
+        'wall_seconds': result.wall_seconds,
+        'error': result.error,
+    } for result in results])
+
+
+def rebuild_portfolio_winner(facilities: Facilities, components: Iterable[SchedulerComponent],
+                             result: PortfolioResult, encoding: str = INTVAR_ENCODING,
+                             division_aware: bool = False,
+                             model_cache: Optional[ModelCache] = None) -> Tuple[Schedule, ScheduleCreator]:
+    """Rebuild and solve a portfolio run's schedule in this process, for export.
+
+    The run's assignment is hinted and fixed, so the solve only completes the
+    component helper variables.
+
+    Args:
+        facilities: The facilities the portfolio ran on
+        components: The components the portfolio ran with
+        result: A result with a solution, e.g. run_portfolio(...)[0]
+        encoding: Core model encoding the portfolio used
+        division_aware: Division-aware setting the portfolio used
+        model_cache: Optional ModelCache the portfolio used
+
+    Returns:
+        Tuple[Schedule, ScheduleCreator]: The solved, validated schedule and its creator
+
+    Raises:
+        ValueError: If the result has no solution
+    """
+    if result.assignment is None:
+        raise ValueError(f"Portfolio run {result.run_idx} has no solution to rebuild ({result.status})")
+    profile = replace(result.profile, num_workers=0)
+    creator = ScheduleCreator(facilities, components=components, encoding=encoding, division_aware=division_aware,
+                              model_cache=model_cache, solver_profile=profile)
+    schedule = creator.build_schedule()
+    solve_with_fixed_assignment(schedule, dict(zip(schedule.matches, result.assignment)), profile)
+    creator.finalize_schedule(schedule)
+    return schedule, creator
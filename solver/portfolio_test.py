@@ -0,0 +1,43 @@
+from solver import portfolio
+from solver.portfolio import run_portfolio, rebuild_portfolio_winner
+from solver.solver_profiles import SolverProfile
+from solver.components.total_play import TotalPlayConstraint
+from solver.components.time_variety_optimization import TimeVarietyOptimization
+
+
+def make_components():
+    return [TotalPlayConstraint(), TimeVarietyOptimization()]
+
+
+def test_reaching_the_target_cancels_the_remaining_runs(small_facilities):
+    facilities = small_facilities()
+    # Any solution reaches the target, so the first run stops the portfolio
+    profile = SolverProfile(name='target', max_time_in_seconds=20.0, num_workers=1, random_seed=0,
+                            objective_target=1e9)
+
+    results = run_portfolio(facilities, make_components, num_runs=4, base_profile=profile, max_parallel=1)
+
+    assert sorted(result.run_idx for result in results) == [0, 1, 2, 3]
+    winner = results[0]
+    assert winner.run_idx == 0
+    assert winner.status in ('OPTIMAL', 'FEASIBLE')
+    assert winner.assignment is not None
+    assert all(result.status == 'CANCELLED' and result.stop_reason == 'portfolio_target'
+               for result in results[1:])
+
+    schedule, _ = rebuild_portfolio_winner(facilities, make_components(), winner)
+    assert tuple(schedule.get_assignment()[match] for match in schedule.matches) == winner.assignment
+    assert schedule.solver.ObjectiveValue() == winner.objective
+
+
+def test_default_parallelism_keeps_enough_workers_per_run(small_facilities, monkeypatch, capsys):
+    facilities = small_facilities()
+    monkeypatch.setattr(portfolio.os, 'cpu_count', lambda: 20)
+    profile = SolverProfile(name='quick', max_time_in_seconds=20.0, random_seed=0,
+                            extra_parameters={'stop_after_first_solution': True})
+
+    results = run_portfolio(facilities, make_components, num_runs=3, base_profile=profile)
+
+    assert "2 at a time with 10 CP-SAT workers each" in capsys.readouterr().out
+    assert all(result.profile.num_workers == 10 for result in results)
+    assert all(result.status in ('OPTIMAL', 'FEASIBLE') for result in results)
@@ -0,0 +1,185 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, Union, TYPE_CHECKING
+import heapq
+import itertools
+import pandas as pd
+from ortools.sat.python import cp_model
+from .schedule_component import SchedulerComponent
+from .solver_profiles import SolverProfile, get_solver_profile
+from .diagnostics import make_guardable
+from .components.balance_reffing import BalanceReffingConstraint
+
+if TYPE_CHECKING:
+    from .schedule_creator import ScheduleCreator
+
+
+@dataclass(frozen=True)
+class RelaxableParameter:
+    """A component setting that may be loosened to make a configuration feasible.
+
+    The component's constraint actors must read the attribute when they run, and
+    its public attributes must be its constructor arguments (as for ModelCache
+    keys), so relaxed copies can be rebuilt.
+
+    Attributes:
+        component_class: Component class the setting belongs to
+        attribute: Attribute (and constructor argument) name
+        levels: Values from strictest to loosest; the first is the usual setting
+    """
+    component_class: Type[SchedulerComponent]
+    attribute: str
+    levels: Tuple[Any, ...]
+
+    @property
+    def name(self) -> str:
+        return f"{self.component_class.__name__}.{self.attribute}"
+
+
+# Season refs within 1, then 2, of weekends // 2, and a third game per weekend
+DEFAULT_RELAXATIONS = (
+    RelaxableParameter(BalanceReffingConstraint, 'season_ref_slack', (0, 1, 2)),
+    RelaxableParameter(BalanceReffingConstraint, 'max_weekend_games', (2, 3)),
+)
+
+
+@dataclass
+class RelaxationResult:
+    """Result of find_relaxation.
+
+    Attributes:
+        found: Whether a feasible configuration was found
+        settings: Parameter name ('Class.attribute') -> value of the found configuration
+        steps: Total relaxation levels of the found configuration (0 = nothing relaxed)
+        components: The creator's components with the found settings applied, or None
+        attempts: One row per configuration tried, with its settings, status and seconds
+    """
+    found: bool
+    settings: Dict[str, Any] = field(default_factory=dict)
+    steps: int = 0
+    components: Optional[List[SchedulerComponent]] = None
+    attempts: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+
+def _with_settings(component: SchedulerComponent, settings: Dict[str, Any]) -> SchedulerComponent:
+    """Rebuild a component from its public attributes with some of them replaced."""
+    kwargs = {key: value for key, value in vars(component).items() if not key.startswith('_')}
+    kwargs.update(settings)
+    return component.__class__(**kwargs)
+
+
+def find_relaxation(creator: 'ScheduleCreator', relaxations: Sequence[RelaxableParameter] = DEFAULT_RELAXATIONS,
+                    profile: Union[str, SolverProfile, None] = None, max_attempts: int = 20) -> RelaxationResult:
+    """Find the least-relaxed feasible configuration of the creator's components.
+
+    The model is built once. Every component with relaxable parameters is built
+    once per combination of their levels, each copy's constraints behind its own
+    guard literal (see diagnostics.make_guardable); other components are built
+    as usual and optimizers are skipped. Each attempt then selects one copy per
+    component with assumptions and checks feasibility.
+
+    Configurations are tried in order of total relaxation steps. An infeasible
+    attempt's core (SufficientAssumptionsForInfeasibility) tells which
+    components take part in the conflict, and only their parameters are relaxed
+    a step further, so the first feasible configuration found has the fewest
+    steps.
+
+    Args:
+        creator: The creator whose facilities and components to relax
+        relaxations: Parameters that may be relaxed, see DEFAULT_RELAXATIONS
+        profile: Solver profile or preset name for each attempt. Defaults to 'diagnose'.
+        max_attempts: Most configurations to try
+
+    Returns:
+        RelaxationResult: The least-relaxed feasible configuration, or found=False
+
+    Raises:
+        ValueError: If a relaxable component adds constraints that cannot be guarded
+    """
+    profile = get_solver_profile(profile if profile is not None else 'diagnose')
+    schedule = creator.schedule_class(creator.facilities, cp_model.CpModel(), encoding=creator.encoding,
+                                      division_aware=creator.division_aware)
+    proto = schedule.model.Proto()
+
+    # Guard literal per (component position, level of each of its parameters)
+    component_params: Dict[int, List[int]] = {}
+    guards: Dict[Tuple[int, Tuple[int, ...]], Any] = {}
+    for c_idx, component in enumerate(creator.components):
+        param_idxs = [p_idx for p_idx, parameter in enumerate(relaxations)
+                      if isinstance(component, parameter.component_class)]
+        if not param_idxs:
+            for constraint in component._constraints:
+                constraint(schedule)
+            continue
+        component_params[c_idx] = param_idxs
+        original = {relaxations[p_idx].attribute: getattr(component, relaxations[p_idx].attribute)
+                    for p_idx in param_idxs}
+        try:
+            for levels in itertools.product(*(range(len(relaxations[p_idx].levels)) for p_idx in param_idxs)):
+                for p_idx, level in zip(param_idxs, levels):
+                    setattr(component, relaxations[p_idx].attribute, relaxations[p_idx].levels[level])
+                guard = schedule.model.NewBoolVar(f"relax_{c_idx}_{'_'.join(map(str, levels))}")
+                guards[c_idx, levels] = guard
+                first = len(proto.constraints)
+                for constraint in component._constraints:
+                    constraint(schedule)
+                for proto_idx in range(first, len(proto.constraints)):
+                    if proto_idx in schedule.definition_constraints:
+                        continue  # Shared variables stay defined for every level
+                    proto_constraint = proto.constraints[proto_idx]
+                    if not make_guardable(proto_constraint):
+                        raise ValueError(f"{component.__class__.__name__} adds a "
+                                         f"{proto_constraint.WhichOneof('constraint')} constraint, "
+                                         f"which cannot be relaxed")
+                    proto_constraint.enforcement_literal.append(guard.Index())
+        finally:
+            for attribute, value in original.items():
+                setattr(component, attribute, value)
+
+    def settings_of(levels: Tuple[int, ...]) -> Dict[str, Any]:
+        return {parameter.name: parameter.levels[level] for parameter, level in zip(relaxations, levels)}
+
+    rows = []
+    start = tuple(0 for _ in relaxations)
+    queue = [(0, start)]
+    seen = {start}
+    while queue and len(rows) < max_attempts:
+        steps, levels = heapq.heappop(queue)
+        chosen = {c_idx: guards[c_idx, tuple(levels[p_idx] for p_idx in param_idxs)]
+                  for c_idx, param_idxs in component_params.items()}
+        schedule.model.ClearAssumptions()
+        schedule.model.AddAssumptions([guard if guard is chosen.get(c_idx) else guard.Not()
+                                       for (c_idx, _), guard in guards.items()])
+        solver = cp_model.CpSolver()
+        profile.apply(solver)
+        status = solver.Solve(schedule.model)
+        rows.append({**settings_of(levels), 'steps': steps, 'status': solver.StatusName(status),
+                     'seconds': solver.WallTime()})
+        print(f"Relaxation attempt {len(rows)} ({steps} steps): {solver.StatusName(status)}")
+
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            settings = settings_of(levels)
+            components = []
+            for c_idx, component in enumerate(creator.components):
+                if c_idx in component_params:
+                    component = _with_settings(component, {relaxations[p_idx].attribute: settings[relaxations[p_idx].name]
+                                                           for p_idx in component_params[c_idx]})
+                components.append(component)
+            return RelaxationResult(found=True, settings=settings, steps=steps, components=components,
+                                    attempts=pd.DataFrame(rows))
+
+        if status == cp_model.INFEASIBLE:
+            core = set(solver.SufficientAssumptionsForInfeasibility())
+            conflicting = [c_idx for c_idx, guard in chosen.items() if guard.Index() in core]
+            if not conflicting:
+                print("Relaxation: infeasible without the relaxable components, nothing to relax")
+                break
+        else:
+            # Undecided in time: any parameter may be the one to relax
+            conflicting = list(component_params)
+        for p_idx in sorted({p_idx for c_idx in conflicting for p_idx in component_params[c_idx]}):
+            if levels[p_idx] + 1 < len(relaxations[p_idx].levels):
+                relaxed = levels[:p_idx] + (levels[p_idx] + 1,) + levels[p_idx + 1:]
+                if relaxed not in seen:
+                    seen.add(relaxed)
+                    heapq.heappush(queue, (steps + 1, relaxed))
+    return RelaxationResult(found=False, attempts=pd.DataFrame(rows))
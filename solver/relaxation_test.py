@@ -0,0 +1,29 @@
+from solver.schedule_creator import ScheduleCreator
+from solver.components.total_play import TotalPlayConstraint
+from solver.components.one_thing_at_a_time import OneThingAtATimeConstraint
+from solver.components.balance_reffing import BalanceReffingConstraint
+
+
+def test_relaxation_climbs_the_ladder_to_the_first_feasible_level(small_facilities):
+    # 6 matches need 6 refs from 4 teams, but every team should ref 3 // 2 == 1 time
+    facilities = small_facilities(time_slots={'13:00': [1], '14:00': [1]}, num_dates=3)
+    balance_reffing = BalanceReffingConstraint()
+    creator = ScheduleCreator(facilities, components=[TotalPlayConstraint(), OneThingAtATimeConstraint(),
+                                                      balance_reffing])
+
+    result = creator.find_relaxation()
+
+    assert result.found
+    assert result.steps == 1
+    assert result.settings == {'BalanceReffingConstraint.season_ref_slack': 1,
+                               'BalanceReffingConstraint.max_weekend_games': 2}
+    # Both one-step relaxations are tried before anything is relaxed twice
+    assert list(result.attempts['steps']) == [0, 1, 1]
+    assert list(result.attempts['status']) == ['INFEASIBLE', 'INFEASIBLE', 'OPTIMAL']
+    # The creator's own component is left as it was
+    assert balance_reffing.season_ref_slack == 0
+
+    relaxed = next(component for component in result.components if isinstance(component, BalanceReffingConstraint))
+    assert relaxed.season_ref_slack == 1
+    schedule = ScheduleCreator(facilities, components=result.components, solver_profile='ci-smoke').create_schedule()
+    assert set(schedule.get_assignment()) == set(facilities.matches)
@@ -0,0 +1,121 @@
+from typing import Dict, Iterable, Optional, Tuple, Union
+import datetime
+import pandas as pd
+from .facilities.facility import Facilities, Match
+from .schedule import Schedule, INTVAR_ENCODING
+from .schedule_creator import ScheduleCreator
+from .schedule_component import SchedulerComponent
+from .solver_profiles import SolverProfile
+from .warm_start import _time_key, apply_warm_start
+from .components.freeze_assignment import FreezeAssignmentConstraint
+from .components.minimal_change import MinimalChangeOptimization
+
+
+def _parse_date(value) -> datetime.date:
+    """Parse a facilities date string ('6/22/2025') or date object."""
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.datetime.strptime(str(value), '%m/%d/%Y').date()
+
+
+def _map_previous_games(game_report: pd.DataFrame, facilities: Facilities,
+                        team_mapping: Optional[Dict[int, Optional[int]]] = None
+                        ) -> Dict[Match, Tuple[Optional[int], Optional[int], Optional[int]]]:
+    """Map an old schedule's games onto changed facilities, with None for withdrawn teams."""
+    if team_mapping is None:
+        old_teams = set(game_report['team1']) | set(game_report['team2']) | set(game_report['ref'])
+        if max(old_teams) >= facilities.total_teams:
+            raise ValueError("The team count changed; pass team_mapping to map old team indices to new ones")
+        team_mapping = {t_idx: t_idx for t_idx in range(facilities.total_teams)}
+
+    matches = {(_parse_date(match.date), _time_key(match.time), match.location): match
+               for match in facilities.matches}
+    previous = {}
+    for _, row in game_report.iterrows():
+        match = matches.get((_parse_date(row['date']), _time_key(row['time']), int(row['location'])))
+        if match is not None:
+            previous[match] = tuple(team_mapping.get(int(row[column])) for column in ('team1', 'team2', 'ref'))
+    return previous
+
+
+def map_previous_assignment(game_report: pd.DataFrame, facilities: Facilities,
+                            team_mapping: Optional[Dict[int, Optional[int]]] = None
+                            ) -> Dict[Match, Tuple[int, int, int]]:
+    """Map an old schedule's games onto changed facilities.
+
+    Games are matched to the new facilities' matches by date, time and court, so
+    removed dates or courts simply drop their games and the remaining weekends
+    keep their games even if weekend indices shifted.
+
+    Args:
+        game_report: The old schedule's game report
+        facilities: The changed facilities
+        team_mapping: Optional dict from old to new team index, with None for
+            withdrawn teams. Defaults to the identity when the team count is unchanged.
+
+    Returns:
+        Dict mapping new matches to (home, away, ref) tuples. Games with a
+        withdrawn team or without a matching slot are left out.
+
+    Raises:
+        ValueError: If the team count changed and no team_mapping was given
+    """
+    return {match: teams for match, teams in _map_previous_games(game_report, facilities, team_mapping).items()
+            if None not in teams}
+
+
+def repair_schedule(previous: Union[Schedule, pd.DataFrame], facilities: Facilities,
+                    components: Iterable[SchedulerComponent], as_of: Union[str, datetime.date],
+                    team_mapping: Optional[Dict[int, Optional[int]]] = None,
+                    change_weight: float = 100.0,
+                    encoding: str = INTVAR_ENCODING, division_aware: bool = False,
+                    solver_profile: Union[str, SolverProfile, None] = 'repair'
+                    ) -> Tuple[Schedule, ScheduleCreator]:
+    """Re-solve a season after mid-season changes, keeping played games and minimizing other changes.
+
+    Matches dated before as_of have been played. Those between remaining teams
+    are frozen to the old schedule. Those a withdrawn team took part in cannot
+    be expressed with the new teams, so they are taken out of the facilities
+    rather than re-solved; their games do not count towards the remaining
+    teams' season totals. Only unplayed matches of withdrawn teams are freed.
+    The other unplayed matches are re-solved with the usual components plus a
+    MinimalChangeOptimization term against the old assignment, hinted with
+    that assignment so the solver starts next to it.
+
+    Args:
+        previous: The old solved Schedule or its game report
+        facilities: The changed facilities (e.g. a team withdrawn, a date or court removed)
+        components: The season's components, unchanged
+        as_of: First date that has not been played yet ('M/D/YYYY' or a date)
+        team_mapping: Old to new team index (None for withdrawn teams), see map_previous_assignment
+        change_weight: Penalty per changed (match, role) among unplayed matches
+        encoding: Core model encoding ('intvar' or 'boolean')
+        division_aware: Whether matches choose a single division for all roles
+        solver_profile: Solver profile or preset name. Defaults to the 'repair' preset.
+
+    Returns:
+        Tuple[Schedule, ScheduleCreator]: The repaired schedule and its creator
+    """
+    game_report = previous.get_game_report() if isinstance(previous, Schedule) else previous
+    previous_games = _map_previous_games(game_report, facilities, team_mapping)
+    as_of = _parse_date(as_of)
+    played = {match: teams for match, teams in previous_games.items() if _parse_date(match.date) < as_of}
+    frozen = {match: teams for match, teams in played.items() if None not in teams}
+    withdrawn_played = [match for match, teams in played.items() if None in teams]
+    unplayed = {match: teams for match, teams in previous_games.items()
+                if match not in played and None not in teams}
+    print(f"Repairing schedule as of {as_of}: {len(frozen)} played matches frozen, "
+          f"{len(withdrawn_played)} played matches of withdrawn teams removed, "
+          f"{len(unplayed)} unplayed matches kept as the baseline")
+    if withdrawn_played:
+        facilities = facilities.without_matches(withdrawn_played)
+
+    creator = ScheduleCreator(facilities, components=list(components), encoding=encoding,
+                              division_aware=division_aware, solver_profile=solver_profile)
+    creator.add_components([FreezeAssignmentConstraint(frozen),
+                            MinimalChangeOptimization(unplayed, weight=change_weight)])
+    schedule = creator.build_schedule()
+    apply_warm_start(schedule, {**frozen, **unplayed})
+    schedule.solve(creator.solver_profile)
+    creator.finalize_schedule(schedule)
+    return schedule, creator
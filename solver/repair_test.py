@@ -0,0 +1,37 @@
+import pandas as pd
+
+from solver.repair import map_previous_assignment, repair_schedule
+from solver.components.total_play import TotalPlayConstraint
+
+
+# Team 3 withdraws after 6/22: it played a game that day and is in both games of 6/29
+PREVIOUS_GAMES = pd.DataFrame([
+    {'date': '6/22/2025', 'time': '13:00', 'location': 0, 'team1': 0, 'team2': 1, 'ref': 2},
+    {'date': '6/22/2025', 'time': '14:00', 'location': 0, 'team1': 2, 'team2': 3, 'ref': 0},
+    {'date': '6/29/2025', 'time': '13:00', 'location': 0, 'team1': 0, 'team2': 2, 'ref': 3},
+    {'date': '6/29/2025', 'time': '14:00', 'location': 0, 'team1': 1, 'team2': 3, 'ref': 2},
+])
+TEAM_MAPPING = {0: 0, 1: 1, 2: 2, 3: None}
+
+
+def test_withdrawn_team_games_are_dropped_from_the_baseline(small_facilities):
+    facilities = small_facilities(team_counts=[3], games_per_season=2, games_per_day=2,
+                                  time_slots={'13:00': [1], '14:00': [1]})
+    previous = map_previous_assignment(PREVIOUS_GAMES, facilities, TEAM_MAPPING)
+    assert list(previous.values()) == [(0, 1, 2)]
+
+
+def test_repair_keeps_played_games_after_withdrawal(small_facilities):
+    facilities = small_facilities(team_counts=[3], games_per_season=2, games_per_day=2,
+                                  time_slots={'13:00': [1], '14:00': [1]})
+    schedule, _ = repair_schedule(PREVIOUS_GAMES, facilities, [TotalPlayConstraint()], as_of='6/29/2025',
+                                  team_mapping=TEAM_MAPPING, solver_profile='ci-smoke')
+    assignment = schedule.get_assignment()
+    played = [match for match in assignment if match.date == facilities.matches[0].date]
+
+    # The played game with the withdrawn team is not re-solved with other teams
+    assert len(assignment) == 3
+    assert [assignment[match] for match in played] == [(0, 1, 2)]
+    # Both of the withdrawn team's unplayed games were released and refilled
+    unplayed_teams = [teams for match, teams in assignment.items() if match not in played]
+    assert all(2 in teams[:2] for teams in unplayed_teams)
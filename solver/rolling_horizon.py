@@ -0,0 +1,147 @@
+from typing import Dict, Iterable, List, Tuple, Union, Any
+import time
+import pandas as pd
+from ortools.sat.python import cp_model
+from .facilities.facility import Facilities, Match
+from .schedule import Schedule, INTVAR_ENCODING
+from .schedule_creator import ScheduleCreator
+from .schedule_component import SchedulerComponent
+from .solver_profiles import SolverProfile, get_solver_profile
+from .warm_start import apply_warm_start, solve_with_fixed_assignment
+
+
+class RollingHorizonSolver:
+    """Builds a season in overlapping windows of weekends instead of one large model.
+
+    Each window's model covers only its own weekends. The weekends committed by
+    earlier windows are passed in as the horizon's carry-over
+    (Facilities.for_weekends), so cumulative counts (games played, refs, vs
+    play, time variety) include them as constants instead of frozen variables.
+    Windows short of the season end enforce season totals as prorated ranges.
+    A window commits its first step_weekends weekends; the rest overlap with the
+    next window, which re-solves them. The last window reaches the season end
+    with the exact season totals, and the committed weekends plus its solution
+    are then solved as one full season model with every match fixed, which
+    validates the season and gives a regular Schedule. If a window is
+    infeasible, the last committed step is reopened and the window retried.
+    """
+
+    def __init__(self, facilities: Facilities, components: Iterable[SchedulerComponent],
+                 window_weekends: int = 4, step_weekends: int = 2,
+                 solver_profile: Union[str, SolverProfile, None] = None,
+                 encoding: str = INTVAR_ENCODING, division_aware: bool = False):
+        """Initialize the solver.
+
+        Args:
+            facilities: The full season facilities
+            components: The season's components, applied to every window
+            window_weekends: Weekends open for solving in each window
+            step_weekends: Weekends each window commits (window_weekends - step_weekends overlap)
+            solver_profile: Solver profile or preset name for each window solve
+            encoding: Core model encoding ('intvar' or 'boolean')
+            division_aware: Whether matches choose a single division for all roles
+
+        Raises:
+            ValueError: If the step is not between 1 and the window size
+        """
+        if not 1 <= step_weekends <= window_weekends:
+            raise ValueError(f"step_weekends must be between 1 and window_weekends ({window_weekends}), "
+                             f"got {step_weekends}")
+        self.facilities = facilities
+        self.components = list(components)
+        self.window_weekends = window_weekends
+        self.step_weekends = step_weekends
+        self.solver_profile = get_solver_profile(solver_profile)
+        self.encoding = encoding
+        self.division_aware = division_aware
+        self.history: List[Dict[str, Any]] = []
+
+    def _solve_window(self, weekend_idxs: Tuple[int, ...], carry_over: Dict[Match, Tuple[int, int, int]],
+                      hints: Dict[Match, Tuple[int, int, int]]) -> Tuple[Schedule, ScheduleCreator]:
+        """Build and solve one window over the given weekends on top of the carried-over matches."""
+        if len(weekend_idxs) == len(self.facilities.weekend_idxs):
+            horizon = self.facilities
+        else:
+            horizon = self.facilities.for_weekends(weekend_idxs, carry_over=carry_over)
+        creator = ScheduleCreator(horizon, components=self.components, encoding=self.encoding,
+                                  division_aware=self.division_aware, solver_profile=self.solver_profile)
+        schedule = creator.build_schedule()
+        window_matches = set(horizon.matches)
+        apply_warm_start(schedule, {match: teams for match, teams in hints.items() if match in window_matches})
+        schedule.solve(self.solver_profile)
+        return schedule, creator
+
+    def _assemble_season(self, assignment: Dict[Match, Tuple[int, int, int]]) -> Tuple[Schedule, ScheduleCreator]:
+        """Solve the full season model with every match fixed to the windows' assignment."""
+        creator = ScheduleCreator(self.facilities, components=self.components, encoding=self.encoding,
+                                  division_aware=self.division_aware, solver_profile=self.solver_profile)
+        schedule = creator.build_schedule()
+        status = solve_with_fixed_assignment(schedule, assignment, self.solver_profile)
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            raise ValueError(f"The rolling horizon windows' season does not solve as a full season "
+                             f"({schedule.solver.StatusName(status)})")
+        return schedule, creator
+
+    def solve(self) -> Tuple[Schedule, ScheduleCreator]:
+        """Solve the season window by window.
+
+        Returns:
+            Tuple[Schedule, ScheduleCreator]: The full season schedule, validated, and its creator
+
+        Raises:
+            ValueError: If a window is infeasible even with every earlier weekend
+                reopened, or the windows' season does not solve as a full season
+        """
+        weekend_idxs = self.facilities.weekend_idxs
+        committed: Dict[Match, Tuple[int, int, int]] = {}
+        hints: Dict[Match, Tuple[int, int, int]] = {}
+        start = 0
+        end = min(self.window_weekends, len(weekend_idxs))
+        reopened = 0
+        while True:
+            carried_weekends = set(weekend_idxs[:start])
+            carry_over = {match: teams for match, teams in committed.items()
+                          if match.weekend_idx in carried_weekends}
+            window_start = time.time()
+            schedule, creator = self._solve_window(weekend_idxs[start:end], carry_over, hints)
+            status = schedule._last_solve_status
+            solved = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+            self.history.append({
+                'first_open_weekend': weekend_idxs[start],
+                'last_weekend': weekend_idxs[end - 1],
+                'carried_matches': len(carry_over),
+                'status': schedule.solver.StatusName(status),
+                'objective': schedule.solver.ObjectiveValue() if solved else None,
+                'seconds': time.time() - window_start,
+            })
+            if not solved:
+                if start == 0 or reopened >= len(weekend_idxs):
+                    raise ValueError(f"Rolling horizon window ending at weekend {weekend_idxs[end - 1]} "
+                                     f"has no solution ({schedule.solver.StatusName(status)})")
+                # Reopen the last committed step and retry the same window end
+                start = max(0, start - self.step_weekends)
+                reopened += 1
+                print(f"Rolling horizon: reopening from weekend {weekend_idxs[start]}")
+                continue
+
+            hints = schedule.get_assignment()
+            if end == len(weekend_idxs):
+                if start > 0:
+                    schedule, creator = self._assemble_season({**carry_over, **hints})
+                creator.finalize_schedule(schedule)
+                return schedule, creator
+
+            committed_weekends = set(weekend_idxs[start:start + self.step_weekends])
+            committed.update({match: teams for match, teams in hints.items()
+                              if match.weekend_idx in committed_weekends})
+            start = min(start + self.step_weekends, len(weekend_idxs) - 1)
+            end = min(start + self.window_weekends, len(weekend_idxs))
+
+    def get_history_report(self) -> pd.DataFrame:
+        """Get one row per window solve with its weekends, carried-over matches, status, objective and time.
+
+        Returns:
+            pd.DataFrame: The window history
+        """
+        return pd.DataFrame(self.history, columns=['first_open_weekend', 'last_weekend', 'carried_matches',
+                                                   'status', 'objective', 'seconds'])
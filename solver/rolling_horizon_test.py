@@ -0,0 +1,31 @@
+from solver.rolling_horizon import RollingHorizonSolver
+from solver.components.total_play import TotalPlayConstraint
+from solver.components.vs_play_balance import VsPlayBalanceConstraint
+
+
+def test_windows_build_on_the_committed_prefix(small_facilities, monkeypatch):
+    facilities = small_facilities(time_slots={'13:00': [1]}, num_dates=6)
+    components = [TotalPlayConstraint(), VsPlayBalanceConstraint()]
+    rolling = RollingHorizonSolver(facilities, components, window_weekends=2, step_weekends=1,
+                                   solver_profile='ci-smoke')
+
+    windows = []
+    solve_window = rolling._solve_window
+
+    def record_window(weekend_idxs, carry_over, hints):
+        schedule, creator = solve_window(weekend_idxs, carry_over, hints)
+        windows.append((schedule, dict(carry_over)))
+        return schedule, creator
+
+    monkeypatch.setattr(rolling, '_solve_window', record_window)
+    schedule, _ = rolling.solve()
+
+    assert list(rolling.get_history_report()['carried_matches']) == [0, 1, 2, 3, 4]
+    assignment = schedule.get_assignment()
+    for window, carry_over in windows:
+        # A window's model holds only its own weekends, the rest is carried over as constants
+        assert {m.weekend_idx for m in window.matches}.isdisjoint(m.weekend_idx for m in carry_over)
+        assert len(window.matches) == 2
+        # The carried-over prefix ends up in the season unchanged
+        assert all(assignment[match] == teams for match, teams in carry_over.items())
+    assert len(assignment) == len(facilities.matches)
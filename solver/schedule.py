@@ -1,22 +1,73 @@
-from typing import List, Dict, Set, Any, Iterable, Tuple, Optional
+from typing import List, Dict, Set, Any, Iterable, Tuple, Optional, Callable, Union, Sequence
+import collections
+import contextlib
 import datetime
+import itertools
+import threading
 import time
+from dataclasses import dataclass
 import pandas as pd
 from ortools.sat.python import cp_model
 from .facilities.facility import Facilities, Match
 from .schedule_component import ModelActor
+from .build_metrics import build_metrics_to_dataframe, write_build_metrics_json
+from .solver_profiles import SolverProfile, get_solver_profile
+from .objective import ObjectiveRegistry
+
+
+# Core model encodings selectable on Schedule and ScheduleCreator.
+# 'intvar' gives every match home/away/ref IntVars and channels the per-team
+# literals to them with reified equalities. 'boolean' makes the per-team role
+# literals the primary variables (one-hot per role and match) and only derives
+# the IntVars when something asks for them.
+INTVAR_ENCODING = 'intvar'
+BOOLEAN_ENCODING = 'boolean'
+ENCODINGS = (INTVAR_ENCODING, BOOLEAN_ENCODING)
+
+
+class _DerivedVarDict(dict):
+    """A dict that creates a model variable the first time a missing key is read."""
+
+    def __init__(self, factory: Callable[[Any], Any]):
+        super().__init__()
+        self._factory = factory
+
+    def __missing__(self, key):
+        value = self._factory(key)
+        self[key] = value
+        return value
+
+
+@dataclass(frozen=True)
+class PoolSolution:
+    """An improving solution captured during the search.
+
+    Attributes:
+        objective: Objective value of the solution
+        elapsed_seconds: Seconds from solve start until it was found
+        assignment: (home, away, ref) team indices per match, in Schedule.matches order
+    """
+    objective: float
+    elapsed_seconds: float
+    assignment: Tuple[Tuple[int, int, int], ...]
 
 
 class SolutionStatusCallback(cp_model.CpSolverSolutionCallback):
     """A callback to print solver status at regular intervals."""
 
-    def __init__(self, schedule: 'Schedule', interval: float = 10.0):
+    def __init__(self, schedule: 'Schedule', interval: float = 10.0, pool_size: int = 0,
+                 objective_target: Optional[float] = None, plateau_seconds: Optional[float] = None):
         """
         Initializes the callback.
 
         Args:
             schedule: The schedule object being solved.
             interval: The interval in seconds at which to print status updates.
+            pool_size: How many of the latest (best) improving solutions to keep
+                in solution_pool. 0 disables capturing assignments.
+            objective_target: Stop the search once a solution at or below this objective is found.
+            plateau_seconds: Stop the search after this many seconds without an
+                improving solution. Needs start_plateau_watchdog() around the solve.
         """
         super().__init__()
         self._schedule = schedule
@@ -24,11 +75,30 @@ class SolutionStatusCallback(cp_model.CpSolverSolutionCallback):
         self._start_time = time.time()
         self._last_print_time = time.time()
         self._solution_count = 0
+        self.objective_history: List[Tuple[float, float]] = []  # (elapsed seconds, objective)
+        # Improving solutions arrive best-last, so the latest pool_size are the best ones
+        self.solution_pool: collections.deque = collections.deque(maxlen=pool_size)
+        self._pool_size = pool_size
+        self._objective_target = objective_target
+        self._plateau_seconds = plateau_seconds
+        self._last_improvement_time = time.time()
+        self._watchdog_done = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+        self.stop_reason: Optional[str] = None  # Set when this callback stops the search
 
     def on_solution_callback(self):
         """Called by the solver when a new solution is found."""
         current_time = time.time()
         self._solution_count += 1
+        self._last_improvement_time = current_time
+        self.objective_history.append((current_time - self._start_time, self.ObjectiveValue()))
+        if self._pool_size:
+            self.solution_pool.append(PoolSolution(
+                objective=self.ObjectiveValue(),
+                elapsed_seconds=current_time - self._start_time,
+                assignment=tuple(self._schedule._read_match_assignment(match, self.Value)
+                                 for match in self._schedule.matches),
+            ))
         first_schedule_found = self._solution_count == 1
         if current_time - self._last_print_time >= self._interval or first_schedule_found:
             elapsed_time = current_time - self._start_time
@@ -41,20 +111,84 @@ class SolutionStatusCallback(cp_model.CpSolverSolutionCallback):
 
             self._last_print_time = current_time
 
+        if self._objective_target is not None and self.ObjectiveValue() <= self._objective_target:
+            print(f"[{current_time - self._start_time:6.2f}s] Objective target {self._objective_target:,.2f} reached, stopping.")
+            self.stop_reason = 'objective_target'
+            self.StopSearch()
+
+    def start_plateau_watchdog(self, solver: cp_model.CpSolver):
+        """Start a background thread that stops the solver when the search plateaus.
+
+        Improving solutions only reach the callback when they are found, so a
+        separate thread checks the time since the last one.
+
+        Args:
+            solver: The solver running the search
+        """
+        if self._plateau_seconds is None:
+            return
+
+        def watch():
+            while not self._watchdog_done.wait(min(1.0, self._plateau_seconds)):
+                if self._solution_count and time.time() - self._last_improvement_time >= self._plateau_seconds:
+                    print(f"No improvement for {self._plateau_seconds:.0f}s, stopping.")
+                    self.stop_reason = 'plateau'
+                    solver.StopSearch()
+                    return
+
+        self._watchdog = threading.Thread(target=watch, daemon=True)
+        self._watchdog.start()
+
+    def stop_plateau_watchdog(self):
+        """Stop the plateau watchdog thread, if running."""
+        self._watchdog_done.set()
+        if self._watchdog is not None:
+            self._watchdog.join()
+
 
 class Schedule:
     """A solver for scheduling games using constraint programming."""
     
-    def __init__(self, facilities: Facilities, model: Optional[cp_model.CpModel]):
+    # Variable dictionaries that make up the built core model. ModelCache stores
+    # these as proto variable indexes so a cached model can be reattached.
+    VAR_DICT_NAMES = (
+        'home_team', 'away_team', 'ref', 'match_div', 'match_loc', 'in_division', 'home_div', 'ref_div',
+        'is_home', 'is_away', 'is_ref', 'is_playing', 'is_busy',
+        'busy_count_at_time', 'busy_at_time', 'reffing_at_time', 'playing_at_time', 'playing_around_time',
+        'games_per_weekend', 'busy_count_per_weekend', 'pair_in_match', 'counts', 'byes',
+    )
+
+    # Roles Schedule.count can count, each a per (match, team) literal dictionary
+    COUNT_ROLES = ('home', 'away', 'ref', 'playing', 'busy')
+
+    def __init__(self, facilities: Facilities, model: Optional[cp_model.CpModel],
+                 encoding: str = INTVAR_ENCODING, division_aware: bool = False,
+                 var_indexes: Optional[Dict[str, Dict[Any, int]]] = None):
         """Initialize the solver with facility constraints.
         
         Args:
             facilities: The Facilities object containing all facility constraints
             model: Optional OR-Tools model. If None, creates a new CpModel.
+            encoding: Core model encoding, either 'intvar' (default) or 'boolean'.
+                Both expose the same component-facing dictionaries.
+            division_aware: If True, each match chooses a single division and its
+                home, away and ref teams are drawn from that division's allowed
+                assignments. home_div and ref_div are then the match division.
+                Role literals only exist for the teams of the match's candidate
+                divisions (Facilities.divisions_for); the others read as a
+                constant false literal.
+            var_indexes: Optional proto variable indexes for every VAR_DICT_NAMES
+                dictionary. When given, model must already contain the built core
+                model (e.g. loaded by ModelCache) and the dictionaries are restored
+                from it instead of adding the core model again.
         """
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unknown encoding '{encoding}'. Expected one of: {', '.join(ENCODINGS)}")
         self.facilities = facilities
-        self.model = model
+        self.model = model if model is not None else cp_model.CpModel()
         self.solver = cp_model.CpSolver()
+        self.encoding = encoding
+        self.division_aware = division_aware
         
         # Initialize dictionaries for OR-Tools variables
         self.home_team: Dict[Any, Any] = {}
@@ -62,6 +196,7 @@ class Schedule:
         self.ref: Dict[Any, Any] = {}
         self.match_div: Dict[Any, Any] = {}
         self.match_loc: Dict[Any, Any] = {}
+        self.in_division: Dict[Tuple[Any, int], Any] = {}  # (match, div_idx) -> bool, division-aware only
         self.home_div: Dict[Any, Any] = {}
         self.ref_div: Dict[Any, Any] = {}
 
@@ -70,6 +205,10 @@ class Schedule:
         self.is_ref: Dict[Tuple[Any, int], Any] = {}
         self.is_playing: Dict[Tuple[Any, int], Any] = {}
         self.is_busy: Dict[Tuple[Any, int], Any] = {}
+        self._false_literal = None
+        if division_aware:
+            for name in ('is_home', 'is_away', 'is_ref', 'is_playing', 'is_busy'):
+                setattr(self, name, _DerivedVarDict(self._absent_role_literal))
 
         self.busy_count_at_time: Dict[Tuple[int, int, int], Any] = {}
         self.busy_at_time: Dict[Tuple[int, int, int], Any] = {}
@@ -78,13 +217,34 @@ class Schedule:
         self.playing_around_time: Dict[Tuple[int, int, int], Any] = {}
         self.games_per_weekend: Dict[Tuple[int, int], Any] = {}  # (weekend_idx, team_idx) -> games
         self.busy_count_per_weekend: Dict[Tuple[int, int], Any] = {} # (weekend_idx, team_idx) -> games
+        # (match, t1, t2) -> bool, t1 < t2 in one division; see get_pair_literal
+        self.pair_in_match: Dict[Tuple[Any, int, int], Any] = _DerivedVarDict(
+            lambda key: self._derive_pair_literal(*key))
+        self._pair_counts: Dict[Tuple[int, int, Optional[int]], Any] = {}
+        self.counts: Dict[Tuple[str, int, Optional[int], Optional[int]], Any] = {}  # See count()
+        self.byes: Dict[Tuple[int, int], Any] = {}  # (weekend_idx, team_idx) -> bool, see is_bye()
+        # Proto indexes of constraints that only define shared variables (counts,
+        # byes, pair literals, derived IntVars); guarding them would leave the
+        # variables free for every other user, so diagnostics and relaxation skip them
+        self.definition_constraints: Set[int] = set()
+        self._cross_division_forbidden = False
         
         self._total_teams: int = 0
         self._game_report: Optional[pd.DataFrame] = None
         self._debug_report: Optional[str] = None
+        self.solution_history: List[Tuple[float, float]] = []  # (elapsed seconds, objective) per solution
+        self.build_metrics: List[Dict[str, Any]] = []  # Filled in by ScheduleCreator.build_schedule
+        self.solution_pool: List[PoolSolution] = []  # Best first, see SolverProfile.solution_pool_size
+        self._selected_solution: Optional[PoolSolution] = None
+        self.stop_reason: Optional[str] = None  # Why the last solve stopped, see solve()
+        self.objective = ObjectiveRegistry()  # Named objective terms, filled in by optimizer components
 
-        # Apply facility constraints to the model
-        self._apply_facilities_to_model()
+        if var_indexes is not None:
+            self._init_teams()
+            self._restore_var_indexes(var_indexes)
+        else:
+            # Apply facility constraints to the model
+            self._apply_facilities_to_model()
 
     def set_debug_report(self, report: str):
         """Store the debug report string on the schedule object."""
@@ -98,11 +258,8 @@ class Schedule:
     def matches(self):
         return self.facilities.matches
     
-    def _apply_facilities_to_model(self):
-        """Apply facility-level constraints and define core model variables based on facilities.
-        Translates logic from Colab notebook.
-        """
-        
+    def _init_teams(self):
+        """Derive the team list and team/division lookups from the facilities team counts."""
         calculated_total_teams = sum(self.facilities.team_counts)
         if calculated_total_teams <= 0:
             raise ValueError("Scheduling requires at least one team. Please check team_counts in facilities.")
@@ -118,6 +275,29 @@ class Schedule:
         # and team_counts is structured correctly (i.e., sum of positive counts > 0)
         if not self.team_div:
              raise ValueError("team_div is empty despite total_teams > 0. Check team_counts structure.")
+        self.division_teams = [[t_idx for t_idx in self.teams if self.team_div[t_idx] == div_idx]
+                               for div_idx in range(len(self.facilities.team_counts))]
+
+    def _candidate_teams(self, m: Match) -> Sequence[int]:
+        """Get the teams that may fill a role in a match: all, or the candidate divisions' in division-aware mode."""
+        if not self.division_aware:
+            return self.teams
+        return [t_idx for div_idx in self.facilities.divisions_for(m) for t_idx in self.division_teams[div_idx]]
+
+    def _absent_role_literal(self, key: Tuple[Match, int]):
+        """Get the constant false literal of a team outside a match's candidate divisions."""
+        m, t_idx = key
+        if m not in self.facilities.match_positions or not 0 <= t_idx < self.total_teams:
+            raise KeyError(key)
+        if self._false_literal is None:
+            self._false_literal = self.model.NewConstant(0)
+        return self._false_literal
+
+    def _apply_facilities_to_model(self):
+        """Apply facility-level constraints and define core model variables based on facilities.
+        Translates logic from Colab notebook.
+        """
+        self._init_teams()
 
         all_matches = self.facilities.matches
         if not all_matches:
@@ -127,66 +307,27 @@ class Schedule:
             print("Warning: No matches found in facilities. Model variables related to matches will not be created.")
             return # Exit early if no matches, as loops below depend on them
 
-        for m_obj in all_matches:
-            m = m_obj
-            name_suffix = f"{m_obj.weekend_idx}_{m_obj.date}_{m_obj.location}_{m_obj.time_idx}"
-
-            self.home_team[m] = self.model.NewIntVar(0, self.total_teams - 1, f"home_team_{name_suffix}")
-            self.away_team[m] = self.model.NewIntVar(0, self.total_teams - 1, f"away_team_{name_suffix}")
-            self.ref[m] = self.model.NewIntVar(0, self.total_teams - 1, f"ref_team_{name_suffix}")
-            
-            # len(self.facilities.team_counts) should be > 0 if total_teams > 0
-            # and team_counts is not empty. Assume team_counts is a non-empty list.
-            num_divisions = len(self.facilities.team_counts)
-            self.match_div[m] = self.model.NewIntVar(0, num_divisions - 1, f"division_of_{name_suffix}")
-            self.match_loc[m] = self.model.NewConstant(m_obj.location)
-
-            self.home_div[m] = self.model.NewIntVar(0, num_divisions - 1, f"home_div_{name_suffix}")
-            self.ref_div[m] = self.model.NewIntVar(0, num_divisions - 1, f"ref_div_{name_suffix}")
-
-            self.model.AddElement(self.home_team[m], self.team_div, self.home_div[m])
-            self.model.AddElement(self.ref[m], self.team_div, self.ref_div[m])
-            
-            self.model.Add(self.home_team[m] != self.away_team[m])
-            self.model.Add(self.home_team[m] != self.ref[m])
-            self.model.Add(self.away_team[m] != self.ref[m])
-
-        for m_obj in all_matches:
-            m = m_obj
-            name_suffix = f"{m_obj.weekend_idx}_{m_obj.date}_{m_obj.location}_{m_obj.time_idx}"
-            for t_idx in range(self.total_teams):
-                self.is_home[m, t_idx] = self.model.NewBoolVar(f"is_home_{name_suffix}_{t_idx}")
-                self.model.Add(self.home_team[m] == t_idx).OnlyEnforceIf(self.is_home[m, t_idx])
-                self.model.Add(self.home_team[m] != t_idx).OnlyEnforceIf(self.is_home[m, t_idx].Not())
-
-                self.is_away[m, t_idx] = self.model.NewBoolVar(f"is_away_{name_suffix}_{t_idx}")
-                self.model.Add(self.away_team[m] == t_idx).OnlyEnforceIf(self.is_away[m, t_idx])
-                self.model.Add(self.away_team[m] != t_idx).OnlyEnforceIf(self.is_away[m, t_idx].Not())
-
-                self.is_ref[m, t_idx] = self.model.NewBoolVar(f"is_ref_{name_suffix}_{t_idx}")
-                self.model.Add(self.ref[m] == t_idx).OnlyEnforceIf(self.is_ref[m, t_idx])
-                self.model.Add(self.ref[m] != t_idx).OnlyEnforceIf(self.is_ref[m, t_idx].Not())
-
-                self.is_playing[m, t_idx] = self.model.NewBoolVar(f"is_playing_{name_suffix}_{t_idx}")
-                self.model.AddBoolOr([self.is_home[m, t_idx], self.is_away[m, t_idx]]).OnlyEnforceIf(self.is_playing[m, t_idx])
-                self.model.AddBoolAnd([self.is_home[m, t_idx].Not(), self.is_away[m, t_idx].Not()]).OnlyEnforceIf(self.is_playing[m, t_idx].Not())
-
-                self.is_busy[m, t_idx] = self.model.NewBoolVar(f"is_busy_{name_suffix}_{t_idx}")
-                self.model.AddBoolOr([self.is_playing[m, t_idx], self.is_ref[m, t_idx]]).OnlyEnforceIf(self.is_busy[m, t_idx])
-                self.model.AddBoolAnd([self.is_playing[m, t_idx].Not(), self.is_ref[m, t_idx].Not()]).OnlyEnforceIf(self.is_busy[m, t_idx].Not())
+        if self.encoding == BOOLEAN_ENCODING:
+            self._add_boolean_core_variables(all_matches)
+        else:
+            self._add_intvar_core_variables(all_matches)
+        if self.division_aware:
+            self._add_division_structure(all_matches)
 
-        weekend_idxs = sorted(list(set(m.weekend_idx for m in all_matches)))
-        time_indices = sorted(list(set(m.time_idx for m in all_matches)))
+        weekend_idxs = self.facilities.weekend_idxs
+        time_indices = self.facilities.time_idxs
+        matches_by_weekend_time = self.facilities.matches_by_weekend_time
         num_locations = len(self.facilities.locations) if self.facilities.locations else 0
         # If num_locations could be 0, max_busy_val needs to handle it. Smallest positive if 0.
         max_busy_val = num_locations * 3 if num_locations > 0 else 3 
 
         for w_idx in weekend_idxs:
             for ti_idx in time_indices:
+                slot_matches = matches_by_weekend_time.get((w_idx, ti_idx), ())
                 for t_idx in range(self.total_teams):
                     key = (w_idx, ti_idx, t_idx)
-                    playing_vars_at_time = [self.is_playing[m_obj, t_idx] for m_obj in all_matches if m_obj.weekend_idx == w_idx and m_obj.time_idx == ti_idx]
-                    reffing_vars_at_time = [self.is_ref[m_obj, t_idx] for m_obj in all_matches if m_obj.weekend_idx == w_idx and m_obj.time_idx == ti_idx]
+                    playing_vars_at_time = [self.is_playing[m_obj, t_idx] for m_obj in slot_matches]
+                    reffing_vars_at_time = [self.is_ref[m_obj, t_idx] for m_obj in slot_matches]
 
                     self.busy_count_at_time[key] = self.model.NewIntVar(0, max_busy_val, f"busy_count_at_time_{w_idx}_{ti_idx}_{t_idx}")
                     self.model.Add(self.busy_count_at_time[key] == sum(playing_vars_at_time) + sum(reffing_vars_at_time))
@@ -224,22 +365,425 @@ class Schedule:
 
         
         # Add games_per_weekend variables
-        weekend_idxs = sorted(list(set(m.weekend_idx for m in all_matches)))
         self.games_per_weekend = {}
         self.busy_count_per_weekend = {}
         for w_idx in weekend_idxs:
+            weekend_matches = self.facilities.matches_by_weekend[w_idx]
             for t_idx in range(self.total_teams):
                 key = (w_idx, t_idx)
                 # Count all games this team plays this weekend
-                weekend_playing_vars = [self.is_playing[m_obj, t_idx] for m_obj in all_matches if m_obj.weekend_idx == w_idx]
+                weekend_playing_vars = [self.is_playing[m_obj, t_idx] for m_obj in weekend_matches]
                 self.games_per_weekend[key] = self.model.NewIntVar(0, len(weekend_playing_vars), f"games_per_weekend_{w_idx}_{t_idx}")
                 self.model.Add(self.games_per_weekend[key] == sum(weekend_playing_vars))
                 
                 # Count all busy times this team has this weekend
-                weekend_busy_vars = [self.is_busy[m_obj, t_idx] for m_obj in all_matches if m_obj.weekend_idx == w_idx]
+                weekend_busy_vars = [self.is_busy[m_obj, t_idx] for m_obj in weekend_matches]
                 self.busy_count_per_weekend[key] = self.model.NewIntVar(0, len(weekend_busy_vars), f"busy_count_per_weekend_{w_idx}_{t_idx}")
                 self.model.Add(self.busy_count_per_weekend[key] == sum(weekend_busy_vars))
 
+    def _add_intvar_core_variables(self, all_matches: Iterable[Match]):
+        """Create home/away/ref IntVars per match and channel per-team literals to them."""
+        for m_obj in all_matches:
+            m = m_obj
+            name_suffix = self._match_name_suffix(m_obj)
+
+            teams = cp_model.Domain.FromValues(list(self._candidate_teams(m)))
+            self.home_team[m] = self.model.NewIntVarFromDomain(teams, f"home_team_{name_suffix}")
+            self.away_team[m] = self.model.NewIntVarFromDomain(teams, f"away_team_{name_suffix}")
+            self.ref[m] = self.model.NewIntVarFromDomain(teams, f"ref_team_{name_suffix}")
+        
+            # len(self.facilities.team_counts) should be > 0 if total_teams > 0
+            # and team_counts is not empty. Assume team_counts is a non-empty list.
+            num_divisions = len(self.facilities.team_counts)
+            self.match_div[m] = self.model.NewIntVarFromDomain(
+                cp_model.Domain.FromValues(list(self.facilities.divisions_for(m)) if self.division_aware
+                                           else list(range(num_divisions))), f"division_of_{name_suffix}")
+            self.match_loc[m] = self.model.NewConstant(m_obj.location)
+
+            if self.division_aware:
+                # Division links and distinct teams come from the allowed-assignment
+                # table added in _add_division_structure
+                continue
+
+            self.home_div[m] = self.model.NewIntVar(0, num_divisions - 1, f"home_div_{name_suffix}")
+            self.ref_div[m] = self.model.NewIntVar(0, num_divisions - 1, f"ref_div_{name_suffix}")
+
+            self.model.AddElement(self.home_team[m], self.team_div, self.home_div[m])
+            self.model.AddElement(self.ref[m], self.team_div, self.ref_div[m])
+        
+            self.model.Add(self.home_team[m] != self.away_team[m])
+            self.model.Add(self.home_team[m] != self.ref[m])
+            self.model.Add(self.away_team[m] != self.ref[m])
+
+        for m_obj in all_matches:
+            m = m_obj
+            name_suffix = self._match_name_suffix(m_obj)
+            for t_idx in self._candidate_teams(m):
+                self.is_home[m, t_idx] = self.model.NewBoolVar(f"is_home_{name_suffix}_{t_idx}")
+                self.model.Add(self.home_team[m] == t_idx).OnlyEnforceIf(self.is_home[m, t_idx])
+                self.model.Add(self.home_team[m] != t_idx).OnlyEnforceIf(self.is_home[m, t_idx].Not())
+
+                self.is_away[m, t_idx] = self.model.NewBoolVar(f"is_away_{name_suffix}_{t_idx}")
+                self.model.Add(self.away_team[m] == t_idx).OnlyEnforceIf(self.is_away[m, t_idx])
+                self.model.Add(self.away_team[m] != t_idx).OnlyEnforceIf(self.is_away[m, t_idx].Not())
+
+                self.is_ref[m, t_idx] = self.model.NewBoolVar(f"is_ref_{name_suffix}_{t_idx}")
+                self.model.Add(self.ref[m] == t_idx).OnlyEnforceIf(self.is_ref[m, t_idx])
+                self.model.Add(self.ref[m] != t_idx).OnlyEnforceIf(self.is_ref[m, t_idx].Not())
+
+                self.is_playing[m, t_idx] = self.model.NewBoolVar(f"is_playing_{name_suffix}_{t_idx}")
+                self.model.AddBoolOr([self.is_home[m, t_idx], self.is_away[m, t_idx]]).OnlyEnforceIf(self.is_playing[m, t_idx])
+                self.model.AddBoolAnd([self.is_home[m, t_idx].Not(), self.is_away[m, t_idx].Not()]).OnlyEnforceIf(self.is_playing[m, t_idx].Not())
+
+                self.is_busy[m, t_idx] = self.model.NewBoolVar(f"is_busy_{name_suffix}_{t_idx}")
+                self.model.AddBoolOr([self.is_playing[m, t_idx], self.is_ref[m, t_idx]]).OnlyEnforceIf(self.is_busy[m, t_idx])
+                self.model.AddBoolAnd([self.is_playing[m, t_idx].Not(), self.is_ref[m, t_idx].Not()]).OnlyEnforceIf(self.is_busy[m, t_idx].Not())
+
+    def _add_boolean_core_variables(self, all_matches: Iterable[Match]):
+        """Create one-hot role literals per match and channel the derived literals linearly.
+
+        Each role (home, away, ref) is filled by exactly one team per match and a
+        team holds at most one role in a match, so is_playing and is_busy are plain
+        sums of the role literals. The IntVar views (home_team, home_div, ...) are
+        only added to the model when a component reads them.
+        """
+        self._init_derived_var_dicts()
+
+        for m in all_matches:
+            name_suffix = self._match_name_suffix(m)
+            self.match_loc[m] = self.model.NewConstant(m.location)
+            teams = self._candidate_teams(m)
+            for t_idx in teams:
+                self.is_home[m, t_idx] = self.model.NewBoolVar(f"is_home_{name_suffix}_{t_idx}")
+                self.is_away[m, t_idx] = self.model.NewBoolVar(f"is_away_{name_suffix}_{t_idx}")
+                self.is_ref[m, t_idx] = self.model.NewBoolVar(f"is_ref_{name_suffix}_{t_idx}")
+                # A team fills at most one role in a match
+                self.model.AddAtMostOne([self.is_home[m, t_idx], self.is_away[m, t_idx], self.is_ref[m, t_idx]])
+
+                self.is_playing[m, t_idx] = self.model.NewBoolVar(f"is_playing_{name_suffix}_{t_idx}")
+                self.model.Add(self.is_playing[m, t_idx] == self.is_home[m, t_idx] + self.is_away[m, t_idx])
+
+                self.is_busy[m, t_idx] = self.model.NewBoolVar(f"is_busy_{name_suffix}_{t_idx}")
+                self.model.Add(self.is_busy[m, t_idx] == self.is_playing[m, t_idx] + self.is_ref[m, t_idx])
+
+            # Every role is filled by exactly one team
+            self.model.AddExactlyOne(self.is_home[m, t_idx] for t_idx in teams)
+            self.model.AddExactlyOne(self.is_away[m, t_idx] for t_idx in teams)
+            self.model.AddExactlyOne(self.is_ref[m, t_idx] for t_idx in teams)
+
+    def _init_derived_var_dicts(self):
+        """Make the IntVar views of the boolean encoding derive variables on first access."""
+        self.home_team = _DerivedVarDict(lambda m: self._derive_team_var(m, self.is_home, "home_team"))
+        self.away_team = _DerivedVarDict(lambda m: self._derive_team_var(m, self.is_away, "away_team"))
+        self.ref = _DerivedVarDict(lambda m: self._derive_team_var(m, self.is_ref, "ref_team"))
+        self.home_div = _DerivedVarDict(lambda m: self._derive_div_var(m, self.is_home, "home_div"))
+        self.ref_div = _DerivedVarDict(lambda m: self._derive_div_var(m, self.is_ref, "ref_div"))
+        self.match_div = _DerivedVarDict(lambda m: self._derive_div_var(m, self.is_home, "division_of"))
+
+    def _restore_var_indexes(self, var_indexes: Dict[str, Dict[Any, int]]):
+        """Reattach the variable dictionaries to an already built model by proto index."""
+        if self.encoding == BOOLEAN_ENCODING:
+            self._init_derived_var_dicts()
+        for name in self.VAR_DICT_NAMES:
+            getattr(self, name).update({key: self.model.GetIntVarFromProtoIndex(index)
+                                        for key, index in var_indexes.get(name, {}).items()})
+
+    def get_var_indexes(self) -> Dict[str, Dict[Any, int]]:
+        """Get the proto variable index of every entry in the core variable dictionaries.
+
+        Returns:
+            Dict mapping each VAR_DICT_NAMES name to {key: proto variable index}
+        """
+        return {name: {key: var.Index() for key, var in getattr(self, name).items()}
+                for name in self.VAR_DICT_NAMES}
+
+    def _add_division_structure(self, all_matches: Iterable[Match]):
+        """Give every match a single division shared by its home, away and ref teams.
+
+        Only the match's candidate divisions (Facilities.divisions_for) get an
+        in_division literal. In the intvar encoding the (division, home, away, ref) tuple of a match is
+        restricted to a table of valid same-division triples, which replaces the
+        AddElement division lookups and pairwise != constraints. In the boolean
+        encoding each role's literals for a division sum to that division's
+        literal. Either way home_div and ref_div are the match division itself.
+        """
+        division_triples = [
+            [(div_idx, home, away, ref) for home, away, ref in itertools.permutations(div_teams, 3)]
+            for div_idx, div_teams in enumerate(self.division_teams)
+        ]
+        for m in all_matches:
+            name_suffix = self._match_name_suffix(m)
+            divisions = self.facilities.divisions_for(m)
+            for div_idx in divisions:
+                self.in_division[m, div_idx] = self.model.NewBoolVar(f"in_division_{name_suffix}_{div_idx}")
+            self.model.AddExactlyOne(self.in_division[m, div_idx] for div_idx in divisions)
+
+            if self.encoding == BOOLEAN_ENCODING:
+                self.match_div[m] = self.model.NewIntVarFromDomain(cp_model.Domain.FromValues(list(divisions)),
+                                                                   f"division_of_{name_suffix}")
+                self.model.Add(self.match_div[m] == sum(div_idx * self.in_division[m, div_idx]
+                                                        for div_idx in divisions))
+                for role_literals in (self.is_home, self.is_away, self.is_ref):
+                    for div_idx in divisions:
+                        self.model.Add(sum(role_literals[m, t_idx] for t_idx in self.division_teams[div_idx])
+                                       == self.in_division[m, div_idx])
+            else:
+                self.model.AddAllowedAssignments(
+                    [self.match_div[m], self.home_team[m], self.away_team[m], self.ref[m]],
+                    [triple for div_idx in divisions for triple in division_triples[div_idx]])
+                for div_idx in divisions:
+                    self.model.Add(self.match_div[m] == div_idx).OnlyEnforceIf(self.in_division[m, div_idx])
+
+            self.home_div[m] = self.match_div[m]
+            self.ref_div[m] = self.match_div[m]
+
+    @staticmethod
+    def _match_name_suffix(m: Match) -> str:
+        return f"{m.weekend_idx}_{m.date}_{m.location}_{m.time_idx}"
+
+    @contextlib.contextmanager
+    def _defining(self):
+        """Record the constraints added inside the block in definition_constraints."""
+        first = len(self.model.Proto().constraints)
+        yield
+        self.definition_constraints.update(range(first, len(self.model.Proto().constraints)))
+
+    def _derive_team_var(self, m: Match, role_literals: Dict[Tuple[Any, int], Any], prefix: str):
+        """Add a team-index IntVar for one role of a match, linked to its one-hot literals."""
+        with self._defining():
+            var = self.model.NewIntVar(0, self.total_teams - 1, f"{prefix}_{self._match_name_suffix(m)}")
+            self.model.Add(var == sum(t_idx * role_literals[m, t_idx] for t_idx in self._candidate_teams(m)))
+        return var
+
+    def _derive_div_var(self, m: Match, role_literals: Dict[Tuple[Any, int], Any], prefix: str):
+        """Add a division IntVar for one role of a match, linked to its one-hot literals."""
+        num_divisions = len(self.facilities.team_counts)
+        with self._defining():
+            var = self.model.NewIntVar(0, num_divisions - 1, f"{prefix}_{self._match_name_suffix(m)}")
+            self.model.Add(var == sum(self.team_div[t_idx] * role_literals[m, t_idx]
+                                      for t_idx in self._candidate_teams(m)))
+        return var
+
+    def _derive_pair_literal(self, m: Match, t1: int, t2: int):
+        """Add a literal for two teams playing each other in a match.
+
+        A match has one home and one away team, so the pair meets exactly when
+        both teams are playing: pair -> playing(t1), pair -> playing(t2) and
+        playing(t1) and playing(t2) -> pair.
+        """
+        with self._defining():
+            pair = self.model.NewBoolVar(f"pair_{self._match_name_suffix(m)}_{t1}_{t2}")
+            self.model.AddImplication(pair, self.is_playing[m, t1])
+            self.model.AddImplication(pair, self.is_playing[m, t2])
+            self.model.AddBoolOr([self.is_playing[m, t1].Not(), self.is_playing[m, t2].Not(), pair])
+        return pair
+
+    def get_pair_literal(self, m: Match, t1: int, t2: int):
+        """Get the literal that is true when two teams of one division play each other in a match.
+
+        Literals are created on first use and shared by every component. Pairs
+        from different divisions have none; see forbid_cross_division_play.
+
+        Args:
+            m: The match
+            t1: One team index
+            t2: The other team index, in the same division as t1
+
+        Returns:
+            The BoolVar for the pair meeting in the match
+
+        Raises:
+            ValueError: If the teams are the same or in different divisions
+        """
+        if t1 == t2 or self.team_div[t1] != self.team_div[t2]:
+            raise ValueError(f"Teams {t1} and {t2} are not two teams of one division")
+        return self.pair_in_match[(m, min(t1, t2), max(t1, t2))]
+
+    def get_pair_count(self, t1: int, t2: int, weekend_idx: Optional[int] = None):
+        """Get the number of times two teams of one division play each other.
+
+        The sum is built once per pair (and weekend) and cached, so components
+        such as vs-play balance, rematch spacing or reports share the same
+        pair literals.
+
+        Args:
+            t1: One team index
+            t2: The other team index, in the same division as t1
+            weekend_idx: Optional weekend to count over instead of the whole season
+
+        Returns:
+            Linear expression counting the pair's matches. Season counts include
+            the pair's games in the facilities' carry-over as a constant.
+
+        Raises:
+            ValueError: If the teams are the same or in different divisions
+        """
+        key = (min(t1, t2), max(t1, t2), weekend_idx)
+        if key not in self._pair_counts:
+            matches = self.matches if weekend_idx is None else self.facilities.matches_by_weekend[weekend_idx]
+            carried = 0
+            if weekend_idx is None:
+                carried = sum(1 for teams in self.facilities.carry_over.values() if {t1, t2} == set(teams[:2]))
+            self._pair_counts[key] = sum(self.get_pair_literal(m, t1, t2) for m in matches) + carried
+        return self._pair_counts[key]
+
+    def forbid_cross_division_play(self):
+        """Require the home and away teams of every match to share a division.
+
+        Division-aware schedules already draw every role from the match
+        division. Otherwise each match gets one linear constraint per division,
+        equal numbers of home and away teams from it, in place of per-pair
+        forbids. Calling it again adds nothing.
+        """
+        if self._cross_division_forbidden or self.division_aware:
+            return
+        for m in self.matches:
+            for div_teams in self.division_teams:
+                self.model.Add(sum(self.is_home[m, t_idx] for t_idx in div_teams)
+                               == sum(self.is_away[m, t_idx] for t_idx in div_teams))
+        self._cross_division_forbidden = True
+
+    def matches_in(self, weekend_idx: Optional[int] = None, time_idx: Optional[int] = None) -> Sequence[Match]:
+        """Get the matches of a weekend, a time slot (over all weekends), both, or the season."""
+        if weekend_idx is not None and time_idx is not None:
+            return self.facilities.matches_by_weekend_time.get((weekend_idx, time_idx), ())
+        if weekend_idx is not None:
+            return self.facilities.matches_by_weekend[weekend_idx]
+        if time_idx is not None:
+            return self.facilities.matches_by_time[time_idx]
+        return self.matches
+
+    def count(self, role: str, team: int, weekend: Optional[int] = None, time: Optional[int] = None):
+        """Get the shared IntVar counting a team's matches in a role.
+
+        One variable is created per distinct (role, team, weekend, time) and
+        reused by every component that asks for it. Weekend playing and busy
+        counts and per-time busy counts are the core aggregates
+        (games_per_weekend, busy_count_per_weekend, busy_count_at_time).
+
+        Args:
+            role: One of COUNT_ROLES ('home', 'away', 'ref', 'playing', 'busy')
+            team: Team index
+            weekend: Optional weekend index to count in
+            time: Optional time index to count in, over every weekend unless one is given
+
+        Returns:
+            IntVar equal to the number of matches. Counts over the whole season
+            include the team's games in the facilities' carry-over as a constant.
+
+        Raises:
+            ValueError: If the role is unknown
+        """
+        if role not in self.COUNT_ROLES:
+            raise ValueError(f"Unknown role '{role}'. Expected one of: {', '.join(self.COUNT_ROLES)}")
+        key = (role, team, weekend, time)
+        if key not in self.counts:
+            if weekend is not None and time is None and role == 'playing':
+                self.counts[key] = self.games_per_weekend[weekend, team]
+            elif weekend is not None and time is None and role == 'busy':
+                self.counts[key] = self.busy_count_per_weekend[weekend, team]
+            elif weekend is not None and time is not None and role == 'busy':
+                self.counts[key] = self.busy_count_at_time[weekend, time, team]
+            else:
+                literals = getattr(self, f"is_{role}")
+                matches = self.matches_in(weekend, time)
+                carried = 0
+                if weekend is None:
+                    carried = sum(team in self._role_teams(role, teams)
+                                  for m, teams in self.facilities.carry_over.items()
+                                  if time is None or m.time_idx == time)
+                suffix = "_".join("all" if idx is None else str(idx) for idx in (weekend, time))
+                with self._defining():
+                    var = self.model.NewIntVar(carried, carried + len(matches), f"count_{role}_{team}_{suffix}")
+                    self.model.Add(var == sum(literals[m, team] for m in matches) + carried)
+                self.counts[key] = var
+        return self.counts[key]
+
+    @staticmethod
+    def _role_teams(role: str, teams: Tuple[int, int, int]) -> Tuple[int, ...]:
+        """Get the teams of a (home, away, ref) tuple that fill a count role."""
+        home, away, ref = teams
+        return {'home': (home,), 'away': (away,), 'ref': (ref,), 'playing': (home, away),
+                'busy': (home, away, ref)}[role]
+
+    def is_bye(self, weekend: int, team: int):
+        """Get the shared literal that is true when a team plays no games in a weekend.
+
+        Args:
+            weekend: Weekend index
+            team: Team index
+
+        Returns:
+            BoolVar equal to games_per_weekend == 0
+        """
+        key = (weekend, team)
+        if key not in self.byes:
+            games = self.count('playing', team, weekend)
+            with self._defining():
+                bye = self.model.NewBoolVar(f"bye_week_{weekend}_{team}")
+                self.model.Add(games == 0).OnlyEnforceIf(bye)
+                self.model.Add(games > 0).OnlyEnforceIf(bye.Not())
+            self.byes[key] = bye
+        return self.byes[key]
+
+    def get_assignment(self) -> Dict[Match, Tuple[int, int, int]]:
+        """Get the solved (home, away, ref) team indices for every match.
+
+        Reads the primary variables of the active encoding, so it never adds
+        derived variables to an already solved model. Post-processor
+        reassignments are not applied here; see get_game_report.
+
+        Returns:
+            Dict mapping each match to a (home, away, ref) tuple of team indices
+        """
+        if self._selected_solution is not None:
+            return dict(zip(self.matches, self._selected_solution.assignment))
+        return {match: self._read_match_assignment(match, self.solver.Value) for match in self.matches}
+
+    def get_solution_pool_report(self) -> pd.DataFrame:
+        """Summarize the solution pool.
+
+        Returns:
+            pd.DataFrame: One row per pooled solution (rank 0 is the best) with its
+            objective, when it was found and how many matches differ from the best
+        """
+        best = self.solution_pool[0].assignment if self.solution_pool else ()
+        return pd.DataFrame([{
+            'rank': rank,
+            'objective': solution.objective,
+            'elapsed_seconds': solution.elapsed_seconds,
+            'matches_changed_from_best': sum(1 for a, b in zip(solution.assignment, best) if a != b),
+        } for rank, solution in enumerate(self.solution_pool)],
+            columns=['rank', 'objective', 'elapsed_seconds', 'matches_changed_from_best'])
+
+    def select_solution(self, rank: Optional[int] = None):
+        """Make reports read a solution from the pool instead of the solver's final one.
+
+        get_assignment, get_game_report, get_team_report and everything built on
+        them (debug schedules, exports) follow the selection. Post-processor
+        reassignments belong to the previously selected solution and are dropped,
+        so run ScheduleCreator.finalize_schedule again for the new selection.
+
+        Args:
+            rank: Index into solution_pool (0 is the best), or None for the final solution
+
+        Raises:
+            IndexError: If rank is outside the pool
+        """
+        self._selected_solution = self.solution_pool[rank] if rank is not None else None
+        self._game_report = None
+        if hasattr(self, '_team_reassignments'):
+            del self._team_reassignments
+
+    def _read_match_assignment(self, match: Match, value: Callable[[Any], int]) -> Tuple[int, int, int]:
+        """Read one match's (home, away, ref) teams using the given value function."""
+        if self.encoding == BOOLEAN_ENCODING:
+            return tuple(
+                next(t_idx for t_idx in self.teams if value(role_literals[match, t_idx]))
+                for role_literals in (self.is_home, self.is_away, self.is_ref)
+            )
+        return (value(self.home_team[match]), value(self.away_team[match]), value(self.ref[match]))
+
     def get_game_report(self):
         """Get a DataFrame report of the solved schedule using singleton pattern.
         
@@ -263,6 +807,7 @@ class Schedule:
         
         # Generate the report
         schedule_rows = []
+        assignment = self.get_assignment()
         
         for match in self.matches:
             # Check if this match has been reassigned by post-processors
@@ -273,9 +818,7 @@ class Schedule:
                 ref_idx = reassignment['ref']
             else:
                 # Use original solver values
-                home_idx = self.solver.Value(self.home_team[match])
-                away_idx = self.solver.Value(self.away_team[match])
-                ref_idx = self.solver.Value(self.ref[match])
+                home_idx, away_idx, ref_idx = assignment[match]
             
             schedule_rows.append({
                 "weekend_idx": match.weekend_idx,
@@ -341,41 +884,115 @@ class Schedule:
         
         return team_report
     
-    def solve(self):
-        """Solve the scheduling problem with optimized solver parameters."""
+    def solve(self, profile: Union[str, SolverProfile, None] = None):
+        """Solve the scheduling problem with the given solver profile.
+        
+        After solving, stop_reason records why the search ended: 'optimal',
+        'infeasible', 'model_invalid', 'objective_target', 'gap', 'plateau',
+        'time_limit' or 'stopped' (e.g. stop_after_first_solution).
+        
+        Args:
+            profile: A SolverProfile or preset name from SOLVER_PROFILES
+                ('default', 'quick-feasibility', 'overnight', 'ci-smoke', 'repair', 'diagnose').
+                Defaults to 'default': 240s on 8 workers without linearization.
+        """
+        profile = get_solver_profile(profile)
         start = datetime.datetime.now()
-        print(f"Starting solution process at {start}")
+        print(f"Starting solution process at {start} (solver profile '{profile.name}')")
 
-        # Set solver parameters optimized for performance
-        self.solver.parameters.max_time_in_seconds = 240.0
-        self.solver.parameters.num_search_workers = 8  # Use multicore
-        self.solver.parameters.linearization_level = 0  # Disable linearization for speed
-        self.solver.parameters.cp_model_presolve = True  # Enable presolve optimizations
-        #self.solver.parameters.enumerate_all_solutions = True
+        profile.apply(self.solver)
         
-        solution_callback = SolutionStatusCallback(self, interval=10.0)
-        status = self.solver.Solve(self.model, solution_callback)
+        solution_callback = SolutionStatusCallback(self, interval=profile.log_interval,
+                                                   pool_size=profile.solution_pool_size,
+                                                   objective_target=profile.objective_target,
+                                                   plateau_seconds=profile.plateau_seconds)
+        solution_callback.start_plateau_watchdog(self.solver)
+        try:
+            status = self.solver.Solve(self.model, solution_callback)
+        finally:
+            solution_callback.stop_plateau_watchdog()
+        self.stop_reason = solution_callback.stop_reason or self._solver_stop_reason(status, profile)
+        self.solution_history = solution_callback.objective_history
+        self.solution_pool = list(reversed(solution_callback.solution_pool))
+        self.select_solution(None)
         
         end = datetime.datetime.now()
         delta = end - start
-        print(f"Solver status: {self.solver.StatusName(status)}")
+        print(f"Solver status: {self.solver.StatusName(status)} (stop reason: {self.stop_reason})")
         print(f"Finished at {end}, duration: {delta}")
 
-        if status == cp_model.OPTIMAL:
+        if self.stop_reason == 'optimal':
             print('Optimal solution found!')
-        elif status == cp_model.FEASIBLE:
-            print('Feasible solution found (time limit reached)!')
+        elif status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            print(f'Feasible solution found (search stopped by {self.stop_reason})!')
         else:
             print('No solution found. Status:', status)
             if status == cp_model.INFEASIBLE:
-                print("Model is infeasible.")
+                print("Model is infeasible. ScheduleCreator.diagnose_infeasibility() finds the conflicting components.")
             elif status == cp_model.MODEL_INVALID:
                 print("Model is invalid. Check constraints and variable definitions.")
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE) and len(self.objective):
+            print("Objective breakdown: " + ", ".join(
+                f"{name} {value:,.2f}" for name, value in self.get_objective_breakdown().items()))
 
 
         # Store the solve status for later reference
         self._last_solve_status = status
 
+    def _solver_stop_reason(self, status: int, profile: SolverProfile) -> str:
+        """Work out why CP-SAT ended a search that no callback criterion stopped."""
+        if status == cp_model.OPTIMAL:
+            # Gap limits end the search with OPTIMAL before the bound meets the objective
+            if self.model.HasObjective() and self.solver.ObjectiveValue() != self.solver.BestObjectiveBound():
+                return 'gap'
+            return 'optimal'
+        if status == cp_model.INFEASIBLE:
+            return 'infeasible'
+        if status == cp_model.MODEL_INVALID:
+            return 'model_invalid'
+        if self.solver.WallTime() >= profile.max_time_in_seconds * 0.99:
+            return 'time_limit'
+        return 'stopped'
+
+    def get_build_metrics_report(self) -> pd.DataFrame:
+        """Get per-step model build metrics as a DataFrame.
+
+        Returns:
+            pd.DataFrame: One row per build step (core model, each constraint and
+            optimizer) with wall time, variables/constraints added and memory
+        """
+        return build_metrics_to_dataframe(self.build_metrics)
+
+    def write_build_metrics(self, path: str):
+        """Write the per-step model build metrics to a JSON file.
+
+        Args:
+            path: Output file path
+        """
+        write_build_metrics_json(self.build_metrics, path)
+
+    def get_time_to_objective(self, target: Optional[float] = None) -> Optional[float]:
+        """Seconds from solve start until a solution at or below the target objective.
+
+        Args:
+            target: Objective value to reach. If None, returns the time to the first solution.
+
+        Returns:
+            Optional[float]: Elapsed seconds, or None if no such solution was found
+        """
+        for elapsed, objective in self.solution_history:
+            if target is None or objective <= target:
+                return elapsed
+        return None
+
+    def get_objective_breakdown(self) -> Dict[str, float]:
+        """Contribution of each registered objective term to the last solve's solution.
+
+        Returns:
+            Dict[str, float]: Term name (e.g. 'ByeWeekOptimization') to objective units
+        """
+        return self.objective.breakdown(self.solver)
+
     def get_volleyball_debug_schedule(self):
         """Get a human-readable volleyball schedule string for debugging.
         
@@ -581,12 +1198,15 @@ class Schedule:
 class ReffedSchedule(Schedule):
     """A solver for scheduling games that includes referee assignments."""
     
-    def __init__(self, facilities: Facilities, model: Optional[cp_model.CpModel] = None):
+    def __init__(self, facilities: Facilities, model: Optional[cp_model.CpModel] = None,
+                 encoding: str = INTVAR_ENCODING, division_aware: bool = False):
         """Initialize the solver with facility and referee constraints.
         
         Args:
             facilities: The Facilities object containing all facility constraints
             model: Optional OR-Tools model. If None, creates a new CpModel.
+            encoding: Core model encoding, either 'intvar' (default) or 'boolean'.
+            division_aware: Whether matches choose a single division (see Schedule).
         """
-        super().__init__(facilities, model)
+        super().__init__(facilities, model, encoding, division_aware)
         
@@ -100,6 +100,26 @@ class SchedulerComponent:
         """
         self._debug_reports.append(debug_report)
 
+    def get_build_state(self) -> Any:
+        """Get what the component keeps from building a model, so a cached model can restore it.
+
+        Components that keep model variables or other results of their
+        constraints and optimizers override this and restore_build_state.
+        Variables must be returned as proto indexes.
+
+        Returns:
+            Picklable build state, or None if the component keeps none
+        """
+        return None
+
+    def restore_build_state(self, schedule: 'Schedule', state: Any):
+        """Restore build state from get_build_state on a schedule loaded from a model cache.
+
+        Args:
+            schedule: The loaded schedule
+            state: State returned by get_build_state when the model was built
+        """
+
     def get_component_classes(self) -> List[str]:
         """Get the list of component class names that make up this component.
         
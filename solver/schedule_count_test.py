@@ -0,0 +1,54 @@
+import itertools
+import pytest
+from solver.schedule_creator import ScheduleCreator
+from solver.components.total_play import TotalPlayConstraint
+from solver.components.bye_week_optimization import ByeWeekOptimization
+from solver.components.time_variety_optimization import TimeVarietyOptimization
+
+
+ROLE_POSITIONS = {'home': (0,), 'away': (1,), 'ref': (2,), 'playing': (0, 1), 'busy': (0, 1, 2)}
+
+
+def create(facilities, encoding='intvar'):
+    return ScheduleCreator(facilities, components=[TotalPlayConstraint(), ByeWeekOptimization(),
+                                                   TimeVarietyOptimization()],
+                           encoding=encoding, solver_profile='ci-smoke')
+
+
+def test_counts_and_byes_are_shared(small_facilities):
+    facilities = small_facilities()
+    schedule = create(facilities).build_schedule()
+    w_idx = facilities.weekend_idxs[0]
+
+    assert schedule.count('ref', 0) is schedule.count('ref', 0)
+    assert schedule.count('playing', 0, w_idx) is schedule.games_per_weekend[w_idx, 0]
+    assert schedule.count('busy', 0, w_idx) is schedule.busy_count_per_weekend[w_idx, 0]
+    assert schedule.is_bye(w_idx, 0) is schedule.is_bye(w_idx, 0)
+    with pytest.raises(ValueError):
+        schedule.count('bench', 0)
+
+
+@pytest.mark.parametrize('encoding', ['intvar', 'boolean'])
+def test_counts_and_byes_match_the_solved_assignment(small_facilities, encoding):
+    facilities = small_facilities()
+    creator = create(facilities, encoding)
+    schedule = creator.build_schedule()
+    weekends = (None,) + tuple(facilities.weekend_idxs)
+    times = (None,) + tuple(facilities.time_idxs)
+    counts = {key: schedule.count(*key)
+              for key in itertools.product(schedule.COUNT_ROLES, schedule.teams, weekends, times)}
+    byes = {(w_idx, t_idx): schedule.is_bye(w_idx, t_idx)
+            for w_idx in facilities.weekend_idxs for t_idx in schedule.teams}
+
+    schedule.solve(creator.solver_profile)
+    creator.finalize_schedule(schedule)
+
+    assignment = schedule.get_assignment()
+    for (role, t_idx, w_idx, ti_idx), count in counts.items():
+        expected = sum(1 for match, teams in assignment.items()
+                       if w_idx in (None, match.weekend_idx) and ti_idx in (None, match.time_idx)
+                       for position in ROLE_POSITIONS[role] if teams[position] == t_idx)
+        assert schedule.solver.Value(count) == expected, (role, t_idx, w_idx, ti_idx)
+    for (w_idx, t_idx), bye in byes.items():
+        plays = any(t_idx in teams[:2] for match, teams in assignment.items() if match.weekend_idx == w_idx)
+        assert schedule.solver.BooleanValue(bye) == (not plays), (w_idx, t_idx)
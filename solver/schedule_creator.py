@@ -1,22 +1,78 @@
-from typing import List, Optional, Iterable
+from typing import List, Optional, Iterable, Union
 from ortools.sat.python import cp_model
 from .facilities.facility import Facilities
-from .schedule import Schedule
+from .schedule import Schedule, INTVAR_ENCODING
 from .schedule_component import SchedulerComponent
+from .build_metrics import BuildMetricsRecorder
+from .model_cache import ModelCache
+from .capacity import assert_capacity
+from .solver_profiles import SolverProfile, get_solver_profile
+from .warm_start import WarmStartSource, assignment_from_source, apply_warm_start, repair_assignment
+
+MONOLITHIC_PIPELINE = 'monolithic'
+TWO_PHASE_PIPELINE = 'two_phase'
+PLAY_FIRST_PIPELINE = 'play_first'
+PIPELINES = (MONOLITHIC_PIPELINE, TWO_PHASE_PIPELINE, PLAY_FIRST_PIPELINE)
+
+WEIGHTED_OBJECTIVE = 'weighted'
+LEXICOGRAPHIC_OBJECTIVE = 'lexicographic'
+OBJECTIVE_MODES = (WEIGHTED_OBJECTIVE, LEXICOGRAPHIC_OBJECTIVE)
+
 
 class ScheduleCreator:
     """A factory class for creating and configuring Schedule instances."""
+
+    # The Schedule class built by build_schedule; subclasses may use a variant core model
+    schedule_class = Schedule
     
     def __init__(self, 
                  facilities: Facilities, 
                  model: Optional[cp_model.CpModel] = None,
-                 components: Optional[Iterable[SchedulerComponent]] = None):
+                 components: Optional[Iterable[SchedulerComponent]] = None,
+                 encoding: str = INTVAR_ENCODING,
+                 division_aware: bool = False,
+                 track_memory: bool = False,
+                 model_cache: Optional[ModelCache] = None,
+                 solver_profile: Union[str, SolverProfile, None] = None,
+                 warm_start: Optional[WarmStartSource] = None,
+                 repair_hint: bool = False,
+                 pipeline: str = MONOLITHIC_PIPELINE,
+                 objective_mode: str = WEIGHTED_OBJECTIVE,
+                 capacity_check: bool = True):
         """Initialize the ScheduleCreator.
         
         Args:
             facilities: The Facilities object containing all facility constraints
             model: Optional OR-Tools model. If None, creates a new CpModel.
             components: Optional iterable of SchedulerComponents to apply
+            encoding: Core model encoding passed to Schedule ('intvar' or 'boolean')
+            division_aware: Whether matches choose a single division for all roles
+            track_memory: Whether build metrics include tracemalloc Python peak memory
+                per step. Off by default because tracing slows the build.
+            model_cache: Optional ModelCache. build_schedule loads the model from
+                it when an entry for this configuration exists and stores it otherwise.
+            solver_profile: SolverProfile or preset name used by create_schedule.
+                Defaults to the 'default' preset.
+            warm_start: Optional prior schedule to hint the search with: a solved
+                Schedule, a game report DataFrame (e.g. the best-run store), a canned
+                schedule file path or a parsed canned schedule.
+            repair_hint: If True, a warm start that violates the current constraints
+                is first repaired to the nearest feasible assignment (see
+                warm_start.repair_assignment) and that is used as the hint.
+            pipeline: How create_schedule solves: 'monolithic' (one full model),
+                'two_phase' (weekend pairings first, then courts and times, see
+                two_phase.solve_two_phase) or 'play_first' (games first, then refs,
+                see play_first.solve_play_first). The latter two fall back to the
+                full model.
+            objective_mode: How the full model is optimized: 'weighted' (one
+                weighted sum of every component's terms) or 'lexicographic' (one
+                component at a time by weight, see lexicographic.solve_lexicographic)
+            capacity_check: Whether build_schedule first runs capacity.check_capacity,
+                which rejects facilities that cannot hold the season in milliseconds
+                instead of after a long infeasible solve.
+                
+        Raises:
+            ValueError: If pipeline is not one of PIPELINES or objective_mode not one of OBJECTIVE_MODES
         """
         self.facilities = facilities
         if model is not None:
@@ -24,6 +80,22 @@ class ScheduleCreator:
         else:
             self.model = cp_model.CpModel()
         self.components = list(components) if components is not None else []
+        self.encoding = encoding
+        self.division_aware = division_aware
+        self.track_memory = track_memory
+        self.model_cache = model_cache
+        self.solver_profile = get_solver_profile(solver_profile)
+        self.warm_start = warm_start
+        self.repair_hint = repair_hint
+        if pipeline not in PIPELINES:
+            raise ValueError(f"Unknown pipeline '{pipeline}'. Expected one of: {', '.join(PIPELINES)}")
+        self.pipeline = pipeline
+        if objective_mode not in OBJECTIVE_MODES:
+            raise ValueError(f"Unknown objective mode '{objective_mode}'. "
+                             f"Expected one of: {', '.join(OBJECTIVE_MODES)}")
+        self.objective_mode = objective_mode
+        self.lexicographic_report = None  # Stage report of the last lexicographic solve
+        self.capacity_check = capacity_check
     
     def add_component(self, component: SchedulerComponent):
         """Add a single component to the schedule.
@@ -42,13 +114,65 @@ class ScheduleCreator:
         self.components.extend(components)
     
     def create_schedule(self) -> Schedule:
-        """Create and configure a Schedule instance.
+        """Create, solve, validate and post-process a Schedule instance.
+
+        Solves with the creator's pipeline; validators and post-processors always
+        run with the full component list.
+        
+        Returns:
+            Schedule: The solved schedule
+        """
+        schedule = None
+        if self.pipeline == TWO_PHASE_PIPELINE:
+            # Imported here since two_phase builds its phase 2 model with a ScheduleCreator
+            from .two_phase import solve_two_phase
+            schedule = solve_two_phase(self)
+            if schedule is None:
+                print("Two-phase pipeline found no schedule, falling back to the full model")
+        elif self.pipeline == PLAY_FIRST_PIPELINE:
+            from .play_first import solve_play_first
+            schedule = solve_play_first(self)
+            if schedule is None:
+                print("Play-first pipeline found no schedule, falling back to the full model")
+        if schedule is None:
+            schedule = self.build_schedule()
+            if self.objective_mode == LEXICOGRAPHIC_OBJECTIVE:
+                from .lexicographic import solve_lexicographic
+                self.lexicographic_report = solve_lexicographic(schedule, self.solver_profile)
+            else:
+                schedule.solve(self.solver_profile)
+        self.finalize_schedule(schedule)
+        return schedule
+
+    def build_schedule(self) -> Schedule:
+        """Create a Schedule and apply all component constraints and optimizers.
+        
+        Each step (the core model and every constraint/optimizer) is measured and
+        the results are stored on the schedule, see Schedule.get_build_metrics_report().
         
         Returns:
             Schedule: A fully configured Schedule instance ready for solving
+
+        Raises:
+            ValueError: If capacity_check is on and the facilities cannot hold the season
         """
+        if self.capacity_check:
+            assert_capacity(self.facilities, self.components)
+        recorder = BuildMetricsRecorder(track_memory=self.track_memory)
+        
+        cache_key = None
+        if self.model_cache is not None:
+            cache_key = self.model_cache.key_for(self.facilities, self.components, self.encoding,
+                                                 self.division_aware, self.schedule_class)
+            if cache_key in self.model_cache:
+                schedule = self._load_cached_schedule(cache_key, recorder)
+                self._apply_warm_start(schedule, recorder)
+                return schedule
+        
         # Create the base schedule
-        schedule = Schedule(self.facilities, self.model)
+        with recorder.measure(self.model, 'core', 'Schedule'):
+            schedule = self.schedule_class(self.facilities, self.model, encoding=self.encoding,
+                                           division_aware=self.division_aware)
         
         # Collect all component classes for logging
         all_component_classes = []
@@ -62,12 +186,14 @@ class ScheduleCreator:
         for component in self.components:
             # Add constraints from the component
             for constraint in component._constraints:
-                constraint(schedule)
+                with recorder.measure(schedule.model, 'constraint', component.__class__.__name__):
+                    constraint(schedule)
                 constraint_classes.extend(component.get_component_classes())
             
             # Add optimizers from the component
             for optimizer in component._optimizers:
-                optimizer(schedule)
+                with recorder.measure(schedule.model, 'optimizer', component.__class__.__name__):
+                    optimizer(schedule)
                 optimizer_classes.extend(component.get_component_classes())
         
         # Log which components were applied before solving
@@ -83,12 +209,66 @@ class ScheduleCreator:
                 unique_optimizer_classes = sorted(set(optimizer_classes))
                 print(f"  - Optimizers from: {', '.join(unique_optimizer_classes)}")
         
-        # Minimize combined optimization terms if any exist
-        if hasattr(schedule, 'things_to_minimize'):
-            schedule.model.Minimize(sum(schedule.things_to_minimize))
+        # Minimize the registered objective terms if any exist
+        if len(schedule.objective):
+            with recorder.measure(schedule.model, 'objective', 'Minimize'):
+                schedule.objective.minimize(schedule.model)
+        
+        if cache_key is not None:
+            self.model_cache.store(cache_key, schedule, self.components)
+        
+        self._apply_warm_start(schedule, recorder)
+        schedule.build_metrics = recorder.rows
+        return schedule
+
+    def _load_cached_schedule(self, cache_key: str, recorder: BuildMetricsRecorder) -> Schedule:
+        """Load a built schedule from the model cache instead of applying components.
+
+        The objective terms and the components' build state are restored with
+        the model, so breakdowns, lexicographic solves and debug reports work as
+        after a fresh build.
+        
+        Args:
+            cache_key: Key of an existing cache entry
+            recorder: Build metrics recorder for this build
+            
+        Returns:
+            Schedule: The cached schedule ready for solving
+        """
+        with recorder.measure(self.model, 'cache', 'ModelCache'):
+            payload = self.model_cache.load(cache_key, self.model)
+            schedule = self.schedule_class(self.facilities, self.model, encoding=self.encoding,
+                                           division_aware=self.division_aware, var_indexes=payload['var_indexes'])
+            schedule.objective.restore_term_indexes(schedule.model, payload['objective_terms'])
+            for component, state in zip(self.components, payload['component_states']):
+                if state is not None:
+                    component.restore_build_state(schedule, state)
+        print(f"Loaded cached model {cache_key[:12]} in {recorder.rows[-1]['wall_seconds']:.2f}s")
+        schedule.build_metrics = recorder.rows
+        return schedule
+
+    def _apply_warm_start(self, schedule: Schedule, recorder: BuildMetricsRecorder):
+        """Hint the built schedule with the warm start assignment, if one was given.
         
-        schedule.solve()
+        Args:
+            schedule: The built schedule
+            recorder: Build metrics recorder for this build
+        """
+        if self.warm_start is None:
+            return
+        with recorder.measure(schedule.model, 'warm_start', 'WarmStart'):
+            assignment = assignment_from_source(self.warm_start, self.facilities)
+            if self.repair_hint:
+                assignment = repair_assignment(schedule, assignment, self.solver_profile)
+            hinted = apply_warm_start(schedule, assignment)
+        print(f"Warm start: hinted {hinted}/{len(schedule.matches)} matches")
 
+    def finalize_schedule(self, schedule: Schedule):
+        """Run component validators and post-processors on a solved schedule.
+        
+        Args:
+            schedule: The solved schedule
+        """
         # Validate that that schedule meets all constraints
         validator_classes = []
         for component in self.components:
@@ -111,8 +291,38 @@ class ScheduleCreator:
         if post_processor_classes:
             unique_post_processor_classes = sorted(set(post_processor_classes))
             print(f"  - Post-processors from: {', '.join(unique_post_processor_classes)}")
-        
-        return schedule
+
+    def diagnose_infeasibility(self, profile: Union[str, SolverProfile, None] = None,
+                               minimize_core: bool = False):
+        """Find which components, weekends and teams make this configuration infeasible.
+
+        See diagnostics.diagnose_infeasibility.
+
+        Args:
+            profile: Solver profile or preset name. Defaults to the 'diagnose' preset.
+            minimize_core: Whether to shrink the core by deletion
+
+        Returns:
+            InfeasibilityReport: The infeasible core; print it for a summary
+        """
+        # Imported here since diagnostics builds from a ScheduleCreator's settings
+        from .diagnostics import diagnose_infeasibility
+        return diagnose_infeasibility(self, profile, minimize_core=minimize_core)
+
+    def find_relaxation(self, relaxations=None, profile: Union[str, SolverProfile, None] = None):
+        """Find the least-relaxed feasible settings of this creator's components.
+
+        See relaxation.find_relaxation.
+
+        Args:
+            relaxations: Optional RelaxableParameters. Defaults to relaxation.DEFAULT_RELAXATIONS.
+            profile: Solver profile or preset name per attempt. Defaults to the 'diagnose' preset.
+
+        Returns:
+            RelaxationResult: Its components can be passed to a new ScheduleCreator
+        """
+        from .relaxation import find_relaxation, DEFAULT_RELAXATIONS
+        return find_relaxation(self, relaxations if relaxations is not None else DEFAULT_RELAXATIONS, profile)
 
     def generate_debug_reports(self, schedule: Schedule) -> str:
         """Generate all debug reports from components using the solved schedule.
@@ -0,0 +1,24 @@
+from solver.schedule_creator import ScheduleCreator
+from solver.components.total_play import TotalPlayConstraint
+
+
+def test_division_aware_matches_only_get_candidate_division_literals(small_facilities):
+    facilities = small_facilities(team_counts=[3, 3], games_per_season=2, time_slots={'13:00': [1, 1]}, num_dates=3)
+    # Court 0 hosts division 0 and court 1 division 1
+    courts = sorted({m.location for m in facilities.matches})
+    facilities = facilities.with_match_divisions({m: (courts.index(m.location),) for m in facilities.matches})
+
+    for encoding in ('intvar', 'boolean'):
+        creator = ScheduleCreator(facilities, components=[TotalPlayConstraint()], encoding=encoding,
+                                  division_aware=True, solver_profile='ci-smoke')
+        schedule = creator.build_schedule()
+        match = facilities.matches[0]
+        other_division = schedule.division_teams[1 - facilities.divisions_for(match)[0]]
+
+        assert len([key for key in schedule.is_home if key[0] == match]) == 3
+        assert all(schedule.is_home[match, t_idx].Proto().domain == [0, 0] for t_idx in other_division)
+
+        schedule.solve(creator.solver_profile)
+        creator.finalize_schedule(schedule)
+        for m, teams in schedule.get_assignment().items():
+            assert {schedule.team_div[t_idx] for t_idx in teams} == set(facilities.divisions_for(m))
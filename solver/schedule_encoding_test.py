@@ -0,0 +1,62 @@
+import itertools
+import math
+import pytest
+from solver.schedule import ENCODINGS
+from solver.schedule_creator import ScheduleCreator
+from solver.solver_profiles import SolverProfile
+from solver.component_sets.sand_volleyball_template import get_sand_volleyball_template
+
+PROFILE = SolverProfile(name='exact', max_time_in_seconds=60.0, num_workers=1, random_seed=0)
+
+
+def solve(facilities, encoding):
+    creator = ScheduleCreator(facilities, components=get_sand_volleyball_template(), encoding=encoding,
+                              solver_profile=PROFILE)
+    schedule = creator.build_schedule()
+    schedule.solve(PROFILE)
+    assert schedule.stop_reason == 'optimal'
+    creator.finalize_schedule(schedule)
+    return schedule
+
+
+def assert_valid_season(facilities, schedule):
+    assignment = schedule.get_assignment()
+    assert set(assignment) == set(facilities.matches)
+    games = {t_idx: 0 for t_idx in schedule.teams}
+    pair_games = {}
+    for home, away, ref in assignment.values():
+        assert len({home, away, ref}) == 3
+        assert schedule.team_div[home] == schedule.team_div[away] == schedule.team_div[ref]
+        games[home] += 1
+        games[away] += 1
+        pair = tuple(sorted((home, away)))
+        pair_games[pair] = pair_games.get(pair, 0) + 1
+    assert set(games.values()) == {facilities.games_per_season}
+    for match in facilities.matches:
+        busy = [t_idx for other in facilities.matches_by_weekend_time[match.weekend_idx, match.time_idx]
+                for t_idx in assignment[other]]
+        assert len(busy) == len(set(busy))
+    teams_in_division = facilities.team_counts[0]
+    max_pair_games = math.ceil(facilities.games_per_season / (teams_in_division - 1))
+    for pair in itertools.combinations(schedule.teams, 2):
+        assert pair_games.get(pair, 0) <= max_pair_games
+
+
+@pytest.mark.parametrize('facilities_settings', [
+    dict(team_counts=[6], games_per_season=2),
+    dict(team_counts=[6], games_per_season=4, num_dates=4),
+])
+def test_encodings_find_the_same_optimum(small_facilities, facilities_settings):
+    facilities = small_facilities(**facilities_settings)
+
+    schedules = {encoding: solve(facilities, encoding) for encoding in ENCODINGS}
+
+    for schedule in schedules.values():
+        assert_valid_season(facilities, schedule)
+    objectives = {schedule.solver.ObjectiveValue() for schedule in schedules.values()}
+    assert len(objectives) == 1
+
+
+def test_unknown_encoding_raises(small_facilities):
+    with pytest.raises(ValueError, match="Unknown encoding 'onehot'"):
+        ScheduleCreator(small_facilities(), components=[], encoding='onehot').build_schedule()
@@ -0,0 +1,45 @@
+import itertools
+import pytest
+from ortools.sat.python import cp_model
+from solver.schedule_creator import ScheduleCreator
+
+
+def is_feasible(schedule, *constraints):
+    """Check whether the schedule's model stays feasible with extra constraints added to a copy."""
+    model = schedule.model.Clone()
+    for constraint in constraints:
+        constraint(model)
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = 1
+    return solver.Solve(model) in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+
+
+@pytest.mark.parametrize('encoding', ['intvar', 'boolean'])
+@pytest.mark.parametrize('division_aware', [False, True])
+def test_pair_literal_is_both_teams_playing(small_facilities, encoding, division_aware):
+    facilities = small_facilities(team_counts=[3, 3], games_per_season=1, time_slots={'13:00': [1]}, num_dates=3)
+    # No components and no capacity check: only the core model defines the literals
+    schedule = ScheduleCreator(facilities, components=[], encoding=encoding, division_aware=division_aware,
+                               capacity_check=False).build_schedule()
+    match = facilities.matches[0]
+
+    for division in schedule.division_teams:
+        for t1, t2 in itertools.combinations(division, 2):
+            pair = schedule.get_pair_literal(match, t1, t2)
+            plays_1, plays_2 = schedule.is_playing[match, t1], schedule.is_playing[match, t2]
+            assert pair is schedule.get_pair_literal(match, t2, t1)
+            assert is_feasible(schedule, lambda model: model.Add(pair == 1))
+            assert not is_feasible(schedule, lambda model: model.Add(pair == 1),
+                                   lambda model: model.AddBoolOr([plays_1.Not(), plays_2.Not()]))
+            assert not is_feasible(schedule, lambda model: model.Add(pair == 0),
+                                   lambda model: model.AddBoolAnd([plays_1, plays_2]))
+
+
+def test_pair_literal_rejects_teams_of_different_divisions(small_facilities):
+    facilities = small_facilities(team_counts=[3, 3], games_per_season=1, time_slots={'13:00': [1]}, num_dates=3)
+    schedule = ScheduleCreator(facilities, components=[], capacity_check=False).build_schedule()
+
+    with pytest.raises(ValueError):
+        schedule.get_pair_literal(facilities.matches[0], 0, 3)
+    with pytest.raises(ValueError):
+        schedule.get_pair_literal(facilities.matches[0], 1, 1)
@@ -0,0 +1,81 @@
+import threading
+import time
+import pytest
+from solver.schedule import SolutionStatusCallback
+from solver.schedule_creator import ScheduleCreator
+from solver.solver_profiles import SolverProfile
+from solver.components.total_play import TotalPlayConstraint
+from solver.components.time_variety_optimization import TimeVarietyOptimization
+
+
+def solve(facilities, **profile_settings):
+    profile = SolverProfile(**{'name': 'stop', 'max_time_in_seconds': 20.0, 'num_workers': 1, 'random_seed': 0,
+                               **profile_settings})
+    creator = ScheduleCreator(facilities, components=[TotalPlayConstraint(), TimeVarietyOptimization()],
+                              solver_profile=profile)
+    schedule = creator.build_schedule()
+    schedule.solve(profile)
+    return schedule
+
+
+@pytest.mark.parametrize('profile_settings, stop_reason, status', [
+    ({}, 'optimal', 'OPTIMAL'),
+    ({'objective_target': 1e9}, 'objective_target', 'FEASIBLE'),
+    ({'absolute_gap_limit': 1e9}, 'gap', 'OPTIMAL'),
+    ({'extra_parameters': {'stop_after_first_solution': True}}, 'stopped', 'FEASIBLE'),
+    ({'max_time_in_seconds': 0.001}, 'time_limit', 'UNKNOWN'),
+])
+def test_solve_reports_why_the_search_stopped(small_facilities, profile_settings, stop_reason, status):
+    # Several improving solutions, so the first one is not optimal
+    facilities = small_facilities(team_counts=[8], games_per_season=2, time_slots={'13:00': [1, 1], '14:00': [1, 1]})
+
+    schedule = solve(facilities, **profile_settings)
+
+    assert schedule.stop_reason == stop_reason
+    assert schedule.solver.StatusName(schedule._last_solve_status) == status
+
+
+def test_solve_stops_the_plateau_watchdog(small_facilities):
+    facilities = small_facilities()
+    threads_before = set(threading.enumerate())
+
+    schedule = solve(facilities, plateau_seconds=60.0)
+
+    assert schedule.stop_reason == 'optimal'
+    assert set(threading.enumerate()) <= threads_before
+
+
+class FakeSolver:
+    def __init__(self):
+        self.stopped = threading.Event()
+
+    def StopSearch(self):
+        self.stopped.set()
+
+
+def test_plateau_watchdog_stops_the_search_after_a_plateau():
+    callback = SolutionStatusCallback(schedule=None, plateau_seconds=0.05)
+    solver = FakeSolver()
+    callback._solution_count = 1
+    callback._last_improvement_time = time.time() - 1.0
+
+    callback.start_plateau_watchdog(solver)
+    assert solver.stopped.wait(5.0)
+    callback.stop_plateau_watchdog()
+
+    assert callback.stop_reason == 'plateau'
+    assert not callback._watchdog.is_alive()
+
+
+def test_plateau_watchdog_waits_for_a_first_solution():
+    callback = SolutionStatusCallback(schedule=None, plateau_seconds=0.05)
+    solver = FakeSolver()
+    callback._last_improvement_time = time.time() - 1.0
+
+    callback.start_plateau_watchdog(solver)
+    time.sleep(0.2)
+    callback.stop_plateau_watchdog()
+
+    assert not solver.stopped.is_set()
+    assert callback.stop_reason is None
+    assert not callback._watchdog.is_alive()
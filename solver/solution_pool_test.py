@@ -0,0 +1,32 @@
+import collections
+
+from solver.schedule_creator import ScheduleCreator
+from solver.solver_profiles import SolverProfile
+from solver.components.total_play import TotalPlayConstraint
+from solver.components.time_variety_optimization import TimeVarietyOptimization
+
+
+def test_solution_pool_keeps_the_best_solutions_best_first(small_facilities):
+    facilities = small_facilities(team_counts=[8], games_per_season=2, time_slots={'13:00': [1, 1], '14:00': [1, 1]})
+    profile = SolverProfile(name='pool', max_time_in_seconds=20.0, num_workers=1, random_seed=0,
+                            solution_pool_size=3)
+    schedule = ScheduleCreator(facilities, components=[TotalPlayConstraint(), TimeVarietyOptimization()],
+                               solver_profile=profile).create_schedule()
+
+    pool = schedule.solution_pool
+    objectives = [solution.objective for solution in pool]
+    assert 2 <= len(pool) <= 3
+    assert objectives == sorted(objectives)
+    assert objectives[0] == schedule.solver.ObjectiveValue()
+    assert list(schedule.get_solution_pool_report()['objective']) == objectives
+
+    # Every pooled solution is a complete schedule of the model
+    for solution in pool:
+        games = collections.Counter(t_idx for home, away, _ in solution.assignment for t_idx in (home, away))
+        assert all(games[t_idx] == facilities.games_per_season for t_idx in schedule.teams)
+
+    final = schedule.get_assignment()
+    schedule.select_solution(len(pool) - 1)
+    assert schedule.get_assignment() == dict(zip(schedule.matches, pool[-1].assignment))
+    schedule.select_solution(None)
+    assert schedule.get_assignment() == final
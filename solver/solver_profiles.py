@@ -0,0 +1,105 @@
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Union
+from ortools.sat.python import cp_model
+
+
+@dataclass
+class SolverProfile:
+    """A named set of CP-SAT parameters used by Schedule.solve.
+
+    Attributes:
+        name: Profile name, used in logs
+        max_time_in_seconds: Solver time limit
+        num_workers: CP-SAT search workers. 0 lets CP-SAT use every core.
+        random_seed: Optional seed for reproducible runs
+        linearization_level: CP-SAT linearization level (0 disables it for speed)
+        presolve: Whether CP-SAT presolve is enabled
+        relative_gap_limit: Optional relative optimality gap at which to stop
+        absolute_gap_limit: Optional absolute optimality gap at which to stop
+        objective_target: Optional objective value; stop at the first solution at or below it
+        plateau_seconds: Optional; stop after this many seconds without an improving solution
+        log_interval: Seconds between solution progress prints
+        solution_pool_size: How many of the best improving solutions to keep on
+            Schedule.solution_pool (0 keeps none)
+        extra_parameters: Any other SatParameters fields, by name
+    """
+    name: str = 'default'
+    max_time_in_seconds: float = 240.0
+    num_workers: int = 8
+    random_seed: Optional[int] = None
+    linearization_level: int = 0
+    presolve: bool = True
+    relative_gap_limit: Optional[float] = None
+    absolute_gap_limit: Optional[float] = None
+    objective_target: Optional[float] = None
+    plateau_seconds: Optional[float] = None
+    log_interval: float = 10.0
+    solution_pool_size: int = 0
+    extra_parameters: Dict[str, Any] = field(default_factory=dict)
+
+    def apply(self, solver: cp_model.CpSolver):
+        """Set this profile's parameters on a solver.
+
+        Args:
+            solver: The CP-SAT solver to configure
+
+        Raises:
+            ValueError: If extra_parameters names an unknown or mistyped SatParameters field
+        """
+        params = solver.parameters
+        params.max_time_in_seconds = self.max_time_in_seconds
+        params.num_workers = self.num_workers
+        params.linearization_level = self.linearization_level
+        params.cp_model_presolve = self.presolve
+        if self.random_seed is not None:
+            params.random_seed = self.random_seed
+        if self.relative_gap_limit is not None:
+            params.relative_gap_limit = self.relative_gap_limit
+        if self.absolute_gap_limit is not None:
+            params.absolute_gap_limit = self.absolute_gap_limit
+        for key, value in self.extra_parameters.items():
+            try:
+                setattr(params, key, value)
+            except (AttributeError, TypeError, ValueError) as e:
+                raise ValueError(f"Invalid CP-SAT parameter {key}={value!r} in solver profile '{self.name}': {e}")
+
+
+SOLVER_PROFILES: Dict[str, SolverProfile] = {
+    # The parameters Schedule.solve has always used
+    'default': SolverProfile(),
+    # Any valid schedule, fast, on every core
+    'quick-feasibility': SolverProfile(name='quick-feasibility', max_time_in_seconds=60.0, num_workers=0,
+                                       extra_parameters={'stop_after_first_solution': True}),
+    # Long unattended runs on every core, with linearization for stronger bounds
+    'overnight': SolverProfile(name='overnight', max_time_in_seconds=8 * 60 * 60.0, num_workers=0,
+                               linearization_level=1, log_interval=300.0, solution_pool_size=10),
+    # Same-day corrections after mid-season changes, see repair.repair_schedule
+    'repair': SolverProfile(name='repair', max_time_in_seconds=30.0, num_workers=0, plateau_seconds=10.0),
+    # Small deterministic runs for CI on tiny configs
+    'ci-smoke': SolverProfile(name='ci-smoke', max_time_in_seconds=20.0, num_workers=1, random_seed=0,
+                              extra_parameters={'stop_after_first_solution': True}),
+    # Infeasibility cores, see diagnostics.diagnose_infeasibility. Full linearization
+    # proves counting conflicts (e.g. too many teams for the slots) in seconds.
+    'diagnose': SolverProfile(name='diagnose', max_time_in_seconds=60.0, num_workers=1, linearization_level=2),
+}
+
+
+def get_solver_profile(profile: Union[str, SolverProfile, None] = None) -> SolverProfile:
+    """Resolve a profile name or instance to a SolverProfile.
+
+    Args:
+        profile: A preset name from SOLVER_PROFILES, a SolverProfile, or None for 'default'
+
+    Returns:
+        SolverProfile: The resolved profile
+
+    Raises:
+        ValueError: If the name is not a known preset
+    """
+    if profile is None:
+        return SOLVER_PROFILES['default']
+    if isinstance(profile, SolverProfile):
+        return profile
+    if profile not in SOLVER_PROFILES:
+        raise ValueError(f"Unknown solver profile '{profile}'. Expected one of: {', '.join(SOLVER_PROFILES)}")
+    return SOLVER_PROFILES[profile]
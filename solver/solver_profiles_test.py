@@ -0,0 +1,56 @@
+import pytest
+from ortools.sat.python import cp_model
+from solver.solver_profiles import SOLVER_PROFILES, SolverProfile, get_solver_profile
+
+
+@pytest.mark.parametrize('name', list(SOLVER_PROFILES))
+def test_every_preset_applies_to_a_solver(name):
+    profile = get_solver_profile(name)
+    solver = cp_model.CpSolver()
+
+    profile.apply(solver)
+
+    params = solver.parameters
+    assert params.max_time_in_seconds == profile.max_time_in_seconds
+    assert params.num_workers == profile.num_workers
+    assert params.linearization_level == profile.linearization_level
+    assert params.cp_model_presolve == profile.presolve
+    for key, value in profile.extra_parameters.items():
+        assert getattr(params, key) == value
+
+
+def test_extra_parameters_reach_the_solver():
+    profile = SolverProfile(name='extra', random_seed=7, relative_gap_limit=0.05,
+                            extra_parameters={'stop_after_first_solution': True, 'log_search_progress': True})
+    solver = cp_model.CpSolver()
+
+    profile.apply(solver)
+
+    assert solver.parameters.random_seed == 7
+    assert solver.parameters.relative_gap_limit == 0.05
+    assert solver.parameters.stop_after_first_solution
+    assert solver.parameters.log_search_progress
+
+
+def test_get_solver_profile_resolves_names_and_instances():
+    profile = SolverProfile(name='custom')
+
+    assert get_solver_profile(None) is SOLVER_PROFILES['default']
+    assert get_solver_profile('ci-smoke') is SOLVER_PROFILES['ci-smoke']
+    assert get_solver_profile(profile) is profile
+
+
+def test_unknown_preset_raises():
+    with pytest.raises(ValueError, match="Unknown solver profile 'no-such-profile'"):
+        get_solver_profile('no-such-profile')
+
+
+@pytest.mark.parametrize('extra_parameters', [
+    {'no_such_parameter': 1},
+    {'num_workers': 'eight'},
+])
+def test_invalid_extra_parameter_raises(extra_parameters):
+    profile = SolverProfile(name='broken', extra_parameters=extra_parameters)
+
+    with pytest.raises(ValueError, match="in solver profile 'broken'"):
+        profile.apply(cp_model.CpSolver())
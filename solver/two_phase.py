@@ -0,0 +1,232 @@
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Tuple, Union, TYPE_CHECKING
+import collections
+import itertools
+from ortools.sat.python import cp_model
+from .facilities.facility import Facilities, Match
+from .schedule import Schedule
+from .schedule_component import SchedulerComponent
+from .solver_profiles import SolverProfile, get_solver_profile
+from .warm_start import apply_warm_start
+from .decomposition import SlotAllocation, allocate_division_slots
+from .components.vs_play_balance import VsPlayBalanceConstraint
+from .components.balance_reffing import BalanceReffingConstraint
+from .components.bye_week_optimization import ByeWeekOptimization
+from .components.minimize_bye_weeks import MinimizeByeWeeks
+
+if TYPE_CHECKING:
+    from .schedule_creator import ScheduleCreator
+
+# Components whose rules phase 1 decides, dropped from the phase 2 model
+PAIRING_COMPONENTS = (VsPlayBalanceConstraint,)
+
+
+@dataclass(frozen=True)
+class PairingPlan:
+    """Which teams meet and which teams ref in each weekend, from phase 1.
+
+    Attributes:
+        games: weekend_idx -> list of (team, team) pairs that meet that weekend
+        refs: weekend_idx -> list of teams that ref once that weekend
+        slotting: One placement of the plan into matches, as (home, away, ref)
+            per match, used to hint phase 2
+    """
+    games: Dict[int, List[Tuple[int, int]]]
+    refs: Dict[int, List[int]]
+    slotting: Dict[Match, Tuple[int, int, int]]
+
+
+def solve_pairing(facilities: Facilities, components: List[SchedulerComponent],
+                  allocation: Optional[SlotAllocation] = None, time_limit: float = 30.0,
+                  profile: Union[str, SolverProfile, None] = None) -> Optional[PairingPlan]:
+    """Phase 1: decide which pairs meet and which teams ref in each weekend.
+
+    Mirrors the sand volleyball template on a model without courts or home/away
+    roles: teams only meet within their division, each team plays
+    games_per_season games, each pair meets as often as VsPlayBalanceConstraint
+    allows, and bye weeks are minimized when a bye week component
+    (ByeWeekOptimization or MinimizeByeWeeks) is present. Refs come from the same division and ref at most once a
+    weekend; with BalanceReffingConstraint each team refs weekends // 2 times
+    (within its season_ref_slack).
+
+    Pairings alone often cannot be placed in a weekend's time slots (refs must
+    play in an adjacent time and teams are busy at most two consecutive times),
+    so games and refs are placed at (weekend, time) granularity, with each time
+    holding as many games as it has courts. Courts within a time are
+    interchangeable, so every plan can be slotted by phase 2. An allocation from
+    decomposition.allocate_division_slots fixes each division's share of every
+    time, which splits the model by division and makes it far easier to solve.
+
+    Args:
+        facilities: The season facilities
+        components: The season's components, used for the bye objective and ref rule
+        allocation: Optional matches per (weekend, time, division)
+        time_limit: Solver time limit in seconds, overriding the profile's
+        profile: Solver profile or preset name whose CP-SAT parameters (workers,
+            seed, gap limits, extra parameters) the solve uses. Its objective
+            target and plateau stops are for the season objective and do not apply.
+
+    Returns:
+        PairingPlan, or None if phase 1 found no plan in time
+    """
+    model = cp_model.CpModel()
+    weekend_idxs = facilities.weekend_idxs
+    slots = sorted(facilities.matches_by_weekend_time)
+    team_div = [div_idx for div_idx, count in enumerate(facilities.team_counts) for _ in range(count)]
+    teams = range(len(team_div))
+    pairs = [(t1, t2) for t1, t2 in itertools.combinations(teams, 2) if team_div[t1] == team_div[t2]]
+
+    meets_at = {(slot, pair): model.NewBoolVar(f"meet_{slot[0]}_{slot[1]}_{pair[0]}_{pair[1]}")
+                for slot in slots for pair in pairs}
+    ref_at = {(slot, t_idx): model.NewBoolVar(f"ref_{slot[0]}_{slot[1]}_{t_idx}") for slot in slots for t_idx in teams}
+    playing_at = {(slot, t_idx): sum(meets_at[slot, pair] for pair in pairs if t_idx in pair)
+                  for slot in slots for t_idx in teams}
+    busy_at = {}
+    for slot in slots:
+        model.Add(sum(meets_at[slot, pair] for pair in pairs) == len(facilities.matches_by_weekend_time[slot]))
+        for div_idx in range(len(facilities.team_counts)):
+            if allocation is not None:
+                model.Add(sum(meets_at[slot, pair] for pair in pairs if team_div[pair[0]] == div_idx) ==
+                          allocation[slot + (div_idx,)])
+            model.Add(sum(ref_at[slot, t_idx] for t_idx in teams if team_div[t_idx] == div_idx) ==
+                      sum(meets_at[slot, pair] for pair in pairs if team_div[pair[0]] == div_idx))
+        w_idx, ti_idx = slot
+        for t_idx in teams:
+            busy_at[slot, t_idx] = model.NewBoolVar(f"busy_{w_idx}_{ti_idx}_{t_idx}")
+            model.Add(playing_at[slot, t_idx] + ref_at[slot, t_idx] == busy_at[slot, t_idx])
+            adjacent = [playing_at[other, t_idx] for other in ((w_idx, ti_idx - 1), (w_idx, ti_idx + 1))
+                        if other in facilities.matches_by_weekend_time]
+            model.Add(sum(adjacent) >= 1).OnlyEnforceIf(ref_at[slot, t_idx])
+
+    bye_terms = []
+    for w_idx in weekend_idxs:
+        weekend_slots = [slot for slot in slots if slot[0] == w_idx]
+        for t_idx in teams:
+            for slot, other in itertools.combinations(weekend_slots, 2):
+                if other[1] - slot[1] > 1:
+                    model.AddBoolOr([busy_at[slot, t_idx].Not(), busy_at[other, t_idx].Not()])
+            model.Add(sum(ref_at[slot, t_idx] for slot in weekend_slots) <= 1)
+            bye = model.NewBoolVar(f"bye_{w_idx}_{t_idx}")
+            model.Add(sum(playing_at[slot, t_idx] for slot in weekend_slots) >= 1).OnlyEnforceIf(bye.Not())
+            bye_terms.append(bye)
+
+    for pair in pairs:
+        teams_in_division = facilities.team_counts[team_div[pair[0]]]
+        model.AddLinearConstraint(sum(meets_at[slot, pair] for slot in slots),
+                                  facilities.games_per_season // teams_in_division,
+                                  -(-facilities.games_per_season // teams_in_division))
+    balance_reffing = next((component for component in components
+                            if isinstance(component, BalanceReffingConstraint)), None)
+    for t_idx in teams:
+        model.Add(sum(playing_at[slot, t_idx] for slot in slots) == facilities.games_per_season)
+        if balance_reffing is not None:
+            model.AddLinearConstraint(sum(ref_at[slot, t_idx] for slot in slots),
+                                      *balance_reffing.season_ref_range(facilities))
+
+    if any(isinstance(component, (ByeWeekOptimization, MinimizeByeWeeks)) for component in components):
+        model.Minimize(sum(bye_terms))
+
+    solver = cp_model.CpSolver()
+    replace(get_solver_profile(profile), max_time_in_seconds=time_limit).apply(solver)
+    status = solver.Solve(model)
+    print(f"Pairing phase: {solver.StatusName(status)} in {solver.WallTime():.2f}s")
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return None
+
+    games: Dict[int, List[Tuple[int, int]]] = {w_idx: [] for w_idx in weekend_idxs}
+    refs: Dict[int, List[int]] = {w_idx: [] for w_idx in weekend_idxs}
+    slotting = {}
+    for slot in slots:
+        slot_games = [pair for pair in pairs if solver.Value(meets_at[slot, pair])]
+        slot_refs = [t_idx for t_idx in teams if solver.Value(ref_at[slot, t_idx])]
+        games[slot[0]].extend(slot_games)
+        refs[slot[0]].extend(slot_refs)
+        for match, (home, away) in zip(facilities.matches_by_weekend_time[slot], slot_games):
+            ref = next(t_idx for t_idx in slot_refs if team_div[t_idx] == team_div[home])
+            slot_refs.remove(ref)
+            slotting[match] = (home, away, ref)
+    return PairingPlan(games=games, refs={w_idx: sorted(refs[w_idx]) for w_idx in weekend_idxs}, slotting=slotting)
+
+
+def add_pairing_constraints(schedule: Schedule, plan: PairingPlan):
+    """Phase 2: restrict a built schedule to the weekend pairings and refs of a plan.
+
+    Each planned pair meets exactly as many times in its weekend as planned (a
+    pair may meet twice, at adjacent times), no match is played across
+    divisions, every team plays exactly its planned number of games that
+    weekend, and refs exactly when planned. Courts, times and home/away stay open.
+
+    Args:
+        schedule: A built (not yet solved) schedule
+        plan: The phase 1 plan
+    """
+    model = schedule.model
+    schedule.forbid_cross_division_play()
+    for w_idx, weekend_pairs in plan.games.items():
+        weekend_matches = schedule.facilities.matches_by_weekend[w_idx]
+        planned_games = {t_idx: 0 for t_idx in schedule.teams}
+        for (t1, t2), meetings in collections.Counter(weekend_pairs).items():
+            planned_games[t1] += meetings
+            planned_games[t2] += meetings
+            model.Add(schedule.get_pair_count(t1, t2, w_idx) == meetings)
+        planned_refs = set(plan.refs[w_idx])
+        for t_idx in schedule.teams:
+            model.Add(schedule.games_per_weekend[w_idx, t_idx] == planned_games[t_idx])
+            model.Add(sum(schedule.is_ref[match, t_idx] for match in weekend_matches) ==
+                      int(t_idx in planned_refs))
+
+
+def solve_two_phase(creator: 'ScheduleCreator') -> Optional[Schedule]:
+    """Solve with the pairing-then-slotting pipeline.
+
+    Phase 1 (solve_pairing) gets up to a fifth of the profile's time limit:
+    half for the full model, then, if that finds no plan, a quarter each for a
+    decomposition.allocate_division_slots allocation and the model split by it.
+    Its solves use the creator's profile with those time limits.
+    Phase 2 builds the creator's model without PAIRING_COMPONENTS, fixes the
+    plan with add_pairing_constraints, hints it with the plan's slotting (in
+    place of the creator's warm start) and solves it with the remaining time.
+    The solved schedule is then checked with the validators of the
+    PAIRING_COMPONENTS, which the phase 2 model does not contain.
+
+    Args:
+        creator: The creator to take facilities, components and settings from
+
+    Returns:
+        The solved (not yet finalized) schedule, or None if either phase found no solution
+
+    Raises:
+        ValueError: If the phase 2 schedule breaks a pairing component's rule
+    """
+    profile = creator.solver_profile
+    pairing_time = min(60.0, profile.max_time_in_seconds / 5)
+    plan = solve_pairing(creator.facilities, creator.components, time_limit=pairing_time / 2, profile=profile)
+    if plan is None:
+        try:
+            allocation = allocate_division_slots(creator.facilities, creator.components,
+                                                 time_limit=pairing_time / 4)
+        except ValueError as e:
+            print(f"Pairing phase: {e}")
+            return None
+        plan = solve_pairing(creator.facilities, creator.components, allocation=allocation,
+                             time_limit=pairing_time / 4, profile=profile)
+        if plan is None:
+            return None
+
+    slotting_creator = creator.__class__(
+        creator.facilities,
+        components=[component for component in creator.components if not isinstance(component, PAIRING_COMPONENTS)],
+        encoding=creator.encoding, division_aware=creator.division_aware, track_memory=creator.track_memory,
+        model_cache=creator.model_cache, solver_profile=profile)
+    schedule = slotting_creator.build_schedule()
+    add_pairing_constraints(schedule, plan)
+    apply_warm_start(schedule, plan.slotting)
+    schedule.solve(replace(profile, max_time_in_seconds=profile.max_time_in_seconds - pairing_time))
+    if schedule._last_solve_status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return None
+    # The pairing components are not in the phase 2 model, so check their rules held
+    for component in creator.components:
+        if isinstance(component, PAIRING_COMPONENTS):
+            for validator in component._validators:
+                validator(schedule)
+    return schedule
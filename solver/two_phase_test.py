@@ -0,0 +1,44 @@
+from solver.schedule_creator import ScheduleCreator
+from solver.two_phase import solve_pairing, solve_two_phase
+from solver.solver_profiles import SolverProfile
+from solver.component_sets.sand_volleyball_template import get_sand_volleyball_template
+
+
+def test_pairing_plan_covers_every_match(small_facilities):
+    facilities = small_facilities(team_counts=[6], games_per_season=2)
+
+    plan = solve_pairing(facilities, get_sand_volleyball_template())
+
+    assert plan is not None
+    assert sum(len(games) for games in plan.games.values()) == len(facilities.matches)
+    assert set(plan.slotting) == set(facilities.matches)
+    pairs = [frozenset(pair) for games in plan.games.values() for pair in games]
+    assert len(pairs) == len(set(pairs))
+
+
+def test_two_phase_produces_a_validated_schedule(small_facilities):
+    facilities = small_facilities(team_counts=[6], games_per_season=2)
+    creator = ScheduleCreator(facilities, components=get_sand_volleyball_template(), solver_profile='ci-smoke')
+
+    # Called directly so a failed pipeline cannot fall back to the full model
+    schedule = solve_two_phase(creator)
+    assert schedule is not None
+    creator.finalize_schedule(schedule)
+
+    assignment = schedule.get_assignment()
+    assert set(assignment) == set(facilities.matches)
+    games = {t_idx: 0 for t_idx in schedule.teams}
+    for home, away, _ in assignment.values():
+        games[home] += 1
+        games[away] += 1
+    assert set(games.values()) == {facilities.games_per_season}
+
+
+def test_pairing_phase_applies_the_solver_profile(small_facilities, monkeypatch):
+    facilities = small_facilities(team_counts=[6], games_per_season=2)
+    applied = []
+    monkeypatch.setattr(SolverProfile, 'apply', lambda profile, solver: applied.append(profile))
+
+    solve_pairing(facilities, get_sand_volleyball_template(), time_limit=5.0, profile='ci-smoke')
+
+    assert [(profile.name, profile.max_time_in_seconds) for profile in applied] == [('ci-smoke', 5.0)]
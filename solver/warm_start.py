@@ -0,0 +1,237 @@
+from typing import Dict, Tuple, Any, Union, Optional
+import dataclasses
+import pathlib
+import pandas as pd
+from ortools.sat.python import cp_model
+from .facilities.facility import Facilities, Match
+from .schedule import Schedule
+from .solver_profiles import SolverProfile, get_solver_profile
+
+# A prior schedule to seed the search with: a solved Schedule, a game report
+# DataFrame (e.g. from the best-run 'schedule' tab), a canned schedule file path,
+# or any object with get_game_report() such as Schedule.parse_canned_schedule's result.
+WarmStartSource = Union[Schedule, pd.DataFrame, str, pathlib.Path, Any]
+
+
+def _time_key(value) -> str:
+    """Normalize a time object or 'H:MM[:SS]' string to 'HH:MM'."""
+    if hasattr(value, 'strftime'):
+        return value.strftime('%H:%M')
+    hours, minutes = str(value).split(':')[:2]
+    return f"{int(hours):02d}:{int(minutes):02d}"
+
+
+def assignment_from_game_report(game_report: pd.DataFrame,
+                                facilities: Facilities) -> Dict[Match, Tuple[int, int, int]]:
+    """Map game report rows onto the facilities' matches.
+
+    Rows are matched to slots by weekend and time of day. Within a slot they fill
+    courts in location order when the report has numeric locations, otherwise in
+    report order. Rows that do not fit (unknown slot, more games than courts,
+    team indices out of range) are skipped with a warning.
+
+    Args:
+        game_report: DataFrame with weekend_idx, time, location, team1, team2 and ref columns
+        facilities: The facilities of the schedule being warm started
+
+    Returns:
+        Dict mapping each covered match to a (home, away, ref) tuple
+    """
+    total_teams = facilities.total_teams
+    slot_matches: Dict[Tuple[int, str], list] = {}
+    for match in facilities.matches:
+        slot_matches.setdefault((match.weekend_idx, _time_key(match.time)), []).append(match)
+    for matches in slot_matches.values():
+        matches.sort(key=lambda m: m.location)
+
+    assignment = {}
+    skipped = 0
+    slot_rows: Dict[Tuple[int, str], list] = {}
+    for _, row in game_report.iterrows():
+        slot_rows.setdefault((int(row['weekend_idx']), _time_key(row['time'])), []).append(row)
+
+    for slot, rows in slot_rows.items():
+        if all(str(row['location']).isdigit() for row in rows):
+            rows = sorted(rows, key=lambda row: int(row['location']))
+        matches = slot_matches.get(slot, [])
+        skipped += max(0, len(rows) - len(matches))
+        for match, row in zip(matches, rows):
+            teams = (int(row['team1']), int(row['team2']), int(row['ref']))
+            if not all(0 <= t_idx < total_teams for t_idx in teams):
+                skipped += 1
+                continue
+            assignment[match] = teams
+
+    if skipped:
+        print(f"Warning: {skipped} warm start games did not fit the facilities and were skipped.")
+    return assignment
+
+
+def assignment_from_source(source: WarmStartSource, facilities: Facilities) -> Dict[Match, Tuple[int, int, int]]:
+    """Get a per-match (home, away, ref) assignment from any warm start source.
+
+    Args:
+        source: A solved Schedule, game report DataFrame, canned schedule file path,
+            or an object with get_game_report()
+        facilities: The facilities of the schedule being warm started
+
+    Returns:
+        Dict mapping each covered match to a (home, away, ref) tuple
+    """
+    if isinstance(source, Schedule) and source.facilities.content_hash() == facilities.content_hash():
+        return source.get_assignment()
+    if isinstance(source, (str, pathlib.Path)):
+        source = Schedule.parse_canned_schedule(str(source))
+    if hasattr(source, 'get_game_report'):
+        source = source.get_game_report()
+    return assignment_from_game_report(source, facilities)
+
+
+def apply_warm_start(schedule: Schedule, assignment: Dict[Match, Tuple[int, int, int]]) -> int:
+    """Add solution hints for the core variables from a (home, away, ref) assignment.
+
+    Hints the per-team role literals, the team/division IntVars that exist in the
+    active encoding, the pair literals of Schedule.get_pair_literal, and the
+    per-time and per-weekend aggregates. Component helper variables are left
+    for the solver to complete.
+
+    Args:
+        schedule: A built (not yet solved) schedule
+        assignment: Dict mapping matches to (home, away, ref) team indices
+
+    Returns:
+        int: Number of matches hinted
+    """
+    hints: Dict[int, Tuple[Any, int]] = {}
+
+    def hint(var, value):
+        # A variable may sit in several dictionaries (e.g. home_div is match_div)
+        hints[var.Index()] = (var, int(value))
+
+    playing = {}
+    reffing = {}
+    for match, (home, away, ref) in assignment.items():
+        for t_idx in schedule.teams:
+            hint(schedule.is_home[match, t_idx], t_idx == home)
+            hint(schedule.is_away[match, t_idx], t_idx == away)
+            hint(schedule.is_ref[match, t_idx], t_idx == ref)
+            hint(schedule.is_playing[match, t_idx], t_idx in (home, away))
+            hint(schedule.is_busy[match, t_idx], t_idx in (home, away, ref))
+        for t_idx in (home, away):
+            key = (match.weekend_idx, match.time_idx, t_idx)
+            playing[key] = playing.get(key, 0) + 1
+        key = (match.weekend_idx, match.time_idx, ref)
+        reffing[key] = reffing.get(key, 0) + 1
+
+        match_div = schedule.team_div[home]
+        for name, value in (('home_team', home), ('away_team', away), ('ref', ref), ('match_div', match_div),
+                            ('home_div', match_div), ('ref_div', schedule.team_div[ref])):
+            # Only hint IntVars that already exist; the boolean encoding derives them lazily
+            if match in getattr(schedule, name):
+                hint(getattr(schedule, name)[match], value)
+        for div_idx in range(len(schedule.facilities.team_counts)):
+            if (match, div_idx) in schedule.in_division:
+                hint(schedule.in_division[match, div_idx], div_idx == match_div)
+
+    for (match, t1, t2), pair in schedule.pair_in_match.items():
+        if match in assignment:
+            hint(pair, {t1, t2} == set(assignment[match][:2]))
+
+    if len(assignment) == len(schedule.matches):
+        # With every match covered the aggregates are fully determined too
+        for (w_idx, ti_idx, t_idx), busy_count in schedule.busy_count_at_time.items():
+            key = (w_idx, ti_idx, t_idx)
+            hint(busy_count, playing.get(key, 0) + reffing.get(key, 0))
+            hint(schedule.busy_at_time[key], playing.get(key, 0) + reffing.get(key, 0) > 0)
+            hint(schedule.playing_at_time[key], playing.get(key, 0) > 0)
+            hint(schedule.reffing_at_time[key], reffing.get(key, 0) > 0)
+            hint(schedule.playing_around_time[key],
+                 any(playing.get((w_idx, ti_idx + offset, t_idx), 0) > 0 for offset in (-1, 1)))
+        for (w_idx, t_idx), games in schedule.games_per_weekend.items():
+            weekend_playing = sum(playing.get((w_idx, ti_idx, t_idx), 0) for ti_idx in schedule.facilities.time_idxs)
+            weekend_reffing = sum(reffing.get((w_idx, ti_idx, t_idx), 0) for ti_idx in schedule.facilities.time_idxs)
+            hint(games, weekend_playing)
+            hint(schedule.busy_count_per_weekend[w_idx, t_idx], weekend_playing + weekend_reffing)
+        role_teams = {match: {'home': (home,), 'away': (away,), 'ref': (ref,), 'playing': (home, away),
+                              'busy': (home, away, ref)} for match, (home, away, ref) in assignment.items()}
+        for (role, t_idx, w_idx, ti_idx), count in schedule.counts.items():
+            hint(count, sum(t_idx in role_teams[match][role] for match in schedule.matches_in(w_idx, ti_idx)))
+        for (w_idx, t_idx), bye in schedule.byes.items():
+            hint(bye, not any(t_idx in role_teams[match]['playing']
+                              for match in schedule.facilities.matches_by_weekend[w_idx]))
+
+    schedule.model.ClearHints()
+    for var, value in hints.values():
+        schedule.model.AddHint(var, value)
+    return len(assignment)
+
+
+def repair_assignment(schedule: Schedule, assignment: Dict[Match, Tuple[int, int, int]],
+                      profile: Optional[SolverProfile] = None,
+                      time_limit: float = 30.0) -> Dict[Match, Tuple[int, int, int]]:
+    """Find the feasible assignment closest to a warm start that may violate the constraints.
+
+    Solves a copy of the built model (all constraints, no objective) that
+    maximizes the number of (match, role, team) choices kept from the warm start.
+    CP-SAT's own repair_hint parameter is not used because it aborts the
+    process for most worker/presolve settings in the pinned OR-Tools version.
+
+    Args:
+        schedule: A built (not yet solved) schedule
+        assignment: The warm start (home, away, ref) assignment
+        profile: Solver profile for the repair solve. Its time limit is capped at time_limit.
+        time_limit: Maximum seconds to spend on the repair
+
+    Returns:
+        The repaired assignment, or the original one if no feasible assignment was found
+    """
+    profile = get_solver_profile(profile)
+    repair_model = schedule.model.Clone()
+    repair_model.ClearObjective()
+    kept = [role_literals[match, t_idx]
+            for match, teams in assignment.items()
+            for role_literals, t_idx in zip((schedule.is_home, schedule.is_away, schedule.is_ref), teams)]
+    # The clone keeps variable indexes, so the schedule's variables address it directly
+    repair_model.Maximize(sum(kept))
+    repair_model.ClearHints()
+    for literal in kept:
+        repair_model.AddHint(literal, 1)
+
+    solver = cp_model.CpSolver()
+    dataclasses.replace(profile, max_time_in_seconds=min(profile.max_time_in_seconds, time_limit)).apply(solver)
+    status = solver.Solve(repair_model)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        print(f"Warning: warm start repair found no feasible assignment ({solver.StatusName(status)}); "
+              f"using the warm start as is.")
+        return assignment
+
+    repaired = {match: schedule._read_match_assignment(match, solver.Value) for match in schedule.matches}
+    changed = sum(1 for match, teams in assignment.items() if repaired.get(match) != teams)
+    print(f"Warm start repair: kept {int(solver.ObjectiveValue())}/{len(kept)} role choices, "
+          f"changed {changed} matches")
+    return repaired
+
+
+def solve_with_fixed_assignment(schedule: Schedule, assignment: Dict[Match, Tuple[int, int, int]],
+                                profile: Optional[SolverProfile] = None) -> int:
+    """Solve a built schedule with its core variables fixed to an assignment.
+
+    Used to turn an assignment found elsewhere (another process, a neighborhood
+    model) back into a solved Schedule; the solve only completes the component
+    helper variables.
+
+    Args:
+        schedule: A built schedule
+        assignment: Dict mapping every match to (home, away, ref) team indices
+        profile: Solver profile to solve with. Its target and plateau stops are dropped.
+
+    Returns:
+        int: The CP-SAT status of the solve
+    """
+    profile = get_solver_profile(profile)
+    profile = dataclasses.replace(profile, objective_target=None, plateau_seconds=None,
+                                  extra_parameters={**profile.extra_parameters,
+                                                    'fix_variables_to_their_hinted_value': True})
+    apply_warm_start(schedule, assignment)
+    schedule.solve(profile)
+    return schedule._last_solve_status
@@ -0,0 +1,31 @@
+from solver.schedule_creator import ScheduleCreator
+from solver.warm_start import assignment_from_source, solve_with_fixed_assignment
+from solver.components.total_play import TotalPlayConstraint
+from solver.components.time_variety_optimization import TimeVarietyOptimization
+
+
+def create(facilities, **kwargs):
+    return ScheduleCreator(facilities, components=[TotalPlayConstraint(), TimeVarietyOptimization()],
+                           solver_profile='ci-smoke', **kwargs)
+
+
+def test_game_report_maps_back_onto_the_matches(small_facilities):
+    facilities = small_facilities()
+    previous = create(facilities).create_schedule()
+
+    assert assignment_from_source(previous.get_game_report(), facilities) == previous.get_assignment()
+
+
+def test_warm_start_hints_every_match_and_reproduces_the_schedule(small_facilities):
+    facilities = small_facilities()
+    previous = create(facilities).create_schedule()
+
+    schedule = create(facilities, warm_start=previous.get_game_report()).build_schedule()
+    assert schedule.build_metrics[-1]['stage'] == 'warm_start'
+    hinted = set(schedule.model.Proto().solution_hint.vars)
+    assert all(schedule.is_home[match, t_idx].Index() in hinted
+               for match in facilities.matches for t_idx in schedule.teams)
+
+    solve_with_fixed_assignment(schedule, previous.get_assignment(), 'ci-smoke')
+    assert schedule.get_assignment() == previous.get_assignment()
+    assert schedule.solver.ObjectiveValue() == previous.solver.ObjectiveValue()